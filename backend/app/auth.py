@@ -2,17 +2,338 @@
 Authentication module for user registration and login.
 Uses persistent database sessions (survives Cloud Run restarts).
 Token-based session management with SHA-256 password hashing.
+Validated sessions are cached in-process so authenticated requests
+usually skip the database.
+
+Optional signed token mode (SESSION_TOKEN_MODE=signed): tokens are
+HMAC-signed and carry the user id, email and expiry, so logins write
+nothing and validation needs no lookup. Logouts go into a revocation
+table, mirrored in memory by a Bloom filter so the common case (token
+not revoked) is answered without touching the database.
 """
 
+import os
+import json
+import math
+import base64
+import hmac
 import secrets
 import hashlib
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from typing import Optional, Dict
+from typing import Optional, Dict, Any
 
-from . import db
+from . import db, db_async
 
 SESSION_EXPIRY_HOURS = 24 * 7  # 1 week
 
+# Session cache: bounds how long a logout on another instance can go unnoticed
+SESSION_CACHE_SIZE = int(os.environ.get("SESSION_CACHE_SIZE", "10000"))
+SESSION_CACHE_TTL_SECONDS = float(os.environ.get("SESSION_CACHE_TTL_SECONDS", "60"))
+
+# Signed tokens: "db" (default) or "signed"
+SIGNED_TOKEN_PREFIX = "v1."
+REVOCATION_FILTER_CAPACITY = int(os.environ.get("REVOCATION_FILTER_CAPACITY", "100000"))
+REVOCATION_FILTER_ERROR_RATE = 0.01
+
+
+class SessionCache:
+    """
+    Bounded TTL/LRU cache of validated sessions, keyed by token.
+
+    Entries are dropped after `ttl_seconds`, when the session itself expires,
+    or when evicted as least recently used. Only valid sessions are cached,
+    so unknown tokens always fall through to the database.
+    """
+
+    def __init__(self, max_size: int = SESSION_CACHE_SIZE, ttl_seconds: float = SESSION_CACHE_TTL_SECONDS):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        # token -> (user, session expiry epoch, cache expiry monotonic)
+        self._entries: "OrderedDict[str, tuple[Dict[str, str], float, float]]" = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(self, token: str) -> Optional[Dict[str, str]]:
+        """Return the cached user for a token, or None on a miss."""
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None:
+                self._misses += 1
+                return None
+            user, session_expires, cached_until = entry
+            if time.time() >= session_expires or time.monotonic() >= cached_until:
+                del self._entries[token]
+                self._evictions += 1
+                self._misses += 1
+                return None
+            self._entries.move_to_end(token)
+            self._hits += 1
+            return user
+
+    def put(self, token: str, user: Dict[str, str], session_expires: float):
+        """Cache a validated session until the TTL or the session expiry."""
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[token] = (user, session_expires, time.monotonic() + self.ttl_seconds)
+            self._entries.move_to_end(token)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def evict(self, token: str):
+        """Drop one token."""
+        with self._lock:
+            self._entries.pop(token, None)
+
+    def evict_user(self, user_id: str):
+        """Drop every cached token belonging to a user."""
+        with self._lock:
+            for token in [t for t, entry in self._entries.items() if entry[0]["user_id"] == user_id]:
+                del self._entries[token]
+
+    def clear(self):
+        """Drop every entry and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self._hits = self._misses = self._evictions = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for /api/metrics."""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "hit_rate": round(self._hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+_session_cache = SessionCache()
+
+
+# =============================================================================
+# SIGNED TOKENS
+# =============================================================================
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings (no false negatives)."""
+
+    def __init__(self, capacity: int, error_rate: float = REVOCATION_FILTER_ERROR_RATE):
+        self.capacity = max(capacity, 1)
+        self.num_bits = max(8, int(-self.capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.num_hashes = max(1, round(self.num_bits / self.capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.num_bits + 7) // 8)
+
+    def _positions(self, item: str):
+        # Double hashing: k positions from one 128-bit digest
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.num_bits for i in range(self.num_hashes))
+
+    def add(self, item: str):
+        for pos in self._positions(item):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(self._bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+
+class RevocationSet:
+    """
+    Revoked signed tokens.
+
+    The revoked_tokens table is the source of truth. Token-id revocations are
+    mirrored in a Bloom filter built at startup, which answers "definitely not
+    revoked" in O(1); only filter hits (real revocations or ~1% false
+    positives) read the table. User-wide revocations ("user:<id>", everything
+    issued before a moment) are rare and kept exactly in memory.
+    """
+
+    def __init__(self, capacity: int = REVOCATION_FILTER_CAPACITY):
+        self.capacity = capacity
+        self._lock = threading.Lock()
+        self._filter: Optional[BloomFilter] = None
+        self._users: Dict[str, float] = {}  # user_id -> revoked_at
+        self._checks = 0
+        self._table_lookups = 0
+        self._confirmed = 0
+
+    def load(self):
+        """(Re)build the in-memory view from unexpired revocations."""
+        revocations = db.get_active_revocations()
+        users = {key[5:]: at for key, at in revocations.items() if key.startswith("user:")}
+        token_ids = [key for key in revocations if not key.startswith("user:")]
+        bloom = BloomFilter(max(self.capacity, len(token_ids) * 2))
+        for token_id in token_ids:
+            bloom.add(token_id)
+        with self._lock:
+            self._filter = bloom
+            self._users = users
+        print(f"🔐 Loaded {len(revocations)} token revocations")
+
+    def _get_filter(self) -> BloomFilter:
+        if self._filter is None:
+            self.load()
+        return self._filter
+
+    def remember(self, token_id: str) -> bool:
+        """
+        Add an already persisted revocation to the filter.
+
+        Returns:
+            True if the filter must be (re)built with load(): it is not built
+            yet, or past capacity, where the false-positive rate climbs
+        """
+        bloom = self._filter
+        if bloom is None:
+            return True
+        with self._lock:
+            bloom.add(token_id)
+        return bloom.count > bloom.capacity
+
+    def revoke(self, token_id: str, expires_at: float):
+        """Persist a single-token revocation and add it to the filter."""
+        db.revoke_token(token_id, expires_at)
+        if self.remember(token_id):
+            self.load()
+
+    def revoke_user(self, user_id: str, expires_at: float):
+        """Revoke every token issued to a user up to now."""
+        self._get_filter()
+        db.revoke_token(f"user:{user_id}", expires_at)
+        with self._lock:
+            self._users[user_id] = time.time()
+
+    def check(self, token_id: str, user_id: str, issued_at: float) -> Optional[bool]:
+        """
+        In-memory revocation check.
+
+        Returns:
+            True/False when memory is enough, None when the table must be read
+            (a filter hit, or the filter is not built yet) - see confirm()
+        """
+        bloom = self._filter
+        with self._lock:
+            self._checks += 1
+            revoked_at = self._users.get(user_id)
+        if revoked_at is not None and issued_at <= revoked_at:
+            return True
+        if bloom is None or token_id in bloom:
+            return None
+        return False
+
+    def confirm(self, token_id: str, user_id: str, issued_at: float) -> bool:
+        """Answer a check() that returned None, reading the table (blocking)."""
+        bloom = self._get_filter()
+        with self._lock:
+            revoked_at = self._users.get(user_id)
+        if revoked_at is not None and issued_at <= revoked_at:
+            return True
+        if token_id not in bloom:
+            return False
+
+        revoked = db.is_token_revoked(token_id)
+        with self._lock:
+            self._table_lookups += 1
+            self._confirmed += revoked
+        return revoked
+
+    def is_revoked(self, token_id: str, user_id: str, issued_at: float) -> bool:
+        revoked = self.check(token_id, user_id, issued_at)
+        if revoked is None:
+            revoked = self.confirm(token_id, user_id, issued_at)
+        return revoked
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            bloom = self._filter
+            return {
+                "token_entries": bloom.count if bloom else 0,
+                "user_entries": len(self._users),
+                "filter_bits": bloom.num_bits if bloom else 0,
+                "checks": self._checks,
+                "table_lookups": self._table_lookups,
+                "revoked": self._confirmed,
+            }
+
+
+_revocations = RevocationSet()
+
+
+def _token_mode() -> str:
+    return os.environ.get("SESSION_TOKEN_MODE", "db").lower()
+
+
+def _signing_key() -> Optional[bytes]:
+    key = os.environ.get("SESSION_SIGNING_KEY") or os.environ.get("SECRET_KEY")
+    return key.encode() if key else None
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+def _sign(payload: str, key: bytes) -> str:
+    return _b64encode(hmac.new(key, payload.encode(), hashlib.sha256).digest())
+
+
+def _create_signed_token(user_id: str, email: str, key: bytes) -> str:
+    """Issue "v1.<payload>.<signature>" carrying the session claims."""
+    now = time.time()
+    claims = {
+        "uid": user_id,
+        "email": email,
+        "iat": now,
+        "exp": now + SESSION_EXPIRY_HOURS * 3600,
+        "jti": secrets.token_urlsafe(12),
+    }
+    payload = _b64encode(json.dumps(claims, separators=(",", ":")).encode())
+    return f"{SIGNED_TOKEN_PREFIX}{payload}.{_sign(payload, key)}"
+
+
+def _verify_signed_token(token: str) -> Optional[Dict[str, Any]]:
+    """Return the claims of a valid, unexpired signed token, else None."""
+    key = _signing_key()
+    if key is None:
+        return None
+    try:
+        payload, signature = token[len(SIGNED_TOKEN_PREFIX):].split(".")
+        if not hmac.compare_digest(signature, _sign(payload, key)):
+            return None
+        claims = json.loads(_b64decode(payload))
+    except Exception:
+        return None
+    if time.time() >= claims["exp"]:
+        return None
+    return claims
+
+
+def load_revocations():
+    """Build the revocation filter (app startup)."""
+    _revocations.load()
+
+
+def get_revocation_stats() -> Dict[str, Any]:
+    """Revocation filter size and hit counters."""
+    return _revocations.stats()
+
 
 def hash_password(password: str) -> str:
     """Hash a password using SHA-256 with salt (simple approach for MVP)."""
@@ -31,8 +352,22 @@ def verify_password(password: str, password_hash: str) -> bool:
         return False
 
 
+def _signed_session(user_id: str, email: str) -> Optional[str]:
+    """A signed token in signed mode (nothing to store or upload), else None."""
+    if _token_mode() == "signed":
+        key = _signing_key()
+        if key:
+            return _create_signed_token(user_id, email, key)
+        print("⚠️ SESSION_TOKEN_MODE=signed but no signing key set, using database sessions")
+    return None
+
+
 def create_session(user_id: str, email: str) -> str:
-    """Create a new persistent session token for a user."""
+    """Create a new session token for a user."""
+    token = _signed_session(user_id, email)
+    if token:
+        return token
+
     token = secrets.token_urlsafe(32)
     expires_at = datetime.now() + timedelta(hours=SESSION_EXPIRY_HOURS)
     
@@ -42,22 +377,127 @@ def create_session(user_id: str, email: str) -> str:
     return token
 
 
+async def acreate_session(user_id: str, email: str) -> str:
+    """create_session for async routes: the insert is queued on the writer and awaited, not run on the executor."""
+    token = _signed_session(user_id, email)
+    if token:
+        return token
+
+    token = secrets.token_urlsafe(32)
+    expires_at = datetime.now() + timedelta(hours=SESSION_EXPIRY_HOURS)
+    await db_async.create_session(token, user_id, email, expires_at)
+    return token
+
+
 def get_session(token: str) -> Optional[Dict[str, str]]:
     """Get session data from token. Returns None if invalid/expired."""
+    if token.startswith(SIGNED_TOKEN_PREFIX):
+        claims = _verify_signed_token(token)
+        if not claims or _revocations.is_revoked(claims["jti"], claims["uid"], claims["iat"]):
+            return None
+        return {
+            "token": token,
+            "user_id": claims["uid"],
+            "email": claims["email"],
+            "created_at": datetime.fromtimestamp(claims["iat"]).isoformat(),
+            "expires_at": datetime.fromtimestamp(claims["exp"]).isoformat(),
+        }
     return db.get_session(token)
 
 
 def invalidate_session(token: str) -> bool:
     """Invalidate a session (logout)."""
+    if token.startswith(SIGNED_TOKEN_PREFIX):
+        claims = _verify_signed_token(token)
+        if not claims:
+            return False
+        _revocations.revoke(claims["jti"], claims["exp"])
+        return True
+
+    _session_cache.evict(token)
     return db.delete_session(token)
 
 
+async def ainvalidate_session(token: str) -> bool:
+    """invalidate_session for async routes: writes are awaited on the writer, not run on the executor."""
+    if token.startswith(SIGNED_TOKEN_PREFIX):
+        claims = _verify_signed_token(token)
+        if not claims:
+            return False
+        await db_async.revoke_token(claims["jti"], claims["exp"])
+        if _revocations.remember(claims["jti"]):
+            await db_async.run(_revocations.load)
+        return True
+
+    _session_cache.evict(token)
+    return await db_async.delete_session(token)
+
+
+def delete_user_sessions(user_id: str) -> int:
+    """Invalidate every session for a user. Returns count of deleted database sessions."""
+    if _token_mode() == "signed":
+        # Revokes every signed token issued to the user up to now
+        _revocations.revoke_user(user_id, time.time() + SESSION_EXPIRY_HOURS * 3600)
+    _session_cache.evict_user(user_id)
+    return db.delete_user_sessions(user_id)
+
+
 def get_user_from_token(token: str) -> Optional[Dict[str, str]]:
     """Get user info from session token."""
+    if token.startswith(SIGNED_TOKEN_PREFIX):
+        claims = _verify_signed_token(token)
+        if claims and not _revocations.is_revoked(claims["jti"], claims["uid"], claims["iat"]):
+            return {
+                "user_id": claims["uid"],
+                "email": claims["email"]
+            }
+        return None
+
+    user = _session_cache.get(token)
+    if user is not None:
+        return user
+    return _lookup_session(token)
+
+
+def _lookup_session(token: str) -> Optional[Dict[str, str]]:
+    """Database half of a session lookup (after a cache miss); caches what it finds."""
     session = db.get_session(token)
     if session:
-        return {
+        user = {
             "user_id": session["user_id"],
             "email": session["email"]
         }
+        expires_at = datetime.fromisoformat(session["expires_at"])
+        _session_cache.put(token, user, expires_at.timestamp())
+        return user
     return None
+
+
+async def aget_user_from_token(token: str) -> Optional[Dict[str, str]]:
+    """
+    get_user_from_token for async routes. Signed tokens and cache hits are
+    answered inline; anything that needs the database runs on the db executor.
+    """
+    if token.startswith(SIGNED_TOKEN_PREFIX):
+        # Signature and filter are in-memory; only a filter hit reads the table
+        claims = _verify_signed_token(token)
+        if not claims:
+            return None
+        revoked = _revocations.check(claims["jti"], claims["uid"], claims["iat"])
+        if revoked is None:
+            revoked = await db_async.run(_revocations.confirm, claims["jti"], claims["uid"], claims["iat"])
+        if revoked:
+            return None
+        return {
+            "user_id": claims["uid"],
+            "email": claims["email"]
+        }
+    user = _session_cache.get(token)
+    if user is not None:
+        return user
+    return await db_async.run(_lookup_session, token)
+
+
+def get_session_cache_stats() -> Dict[str, Any]:
+    """Session cache size and hit/miss counters."""
+    return _session_cache.stats()
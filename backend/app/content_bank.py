@@ -0,0 +1,326 @@
+"""
+In-Memory Content Bank
+Read-optimized copy of the approved question and flashcard bank.
+
+Architecture:
+- BankSnapshot is built from content.db in one pass and never mutated:
+  rows live in plain lists with options already decoded, subjects and card
+  types are interned to small integer codes, and NumPy arrays hold the row
+  positions for each subject (and subject + card type)
+- ContentBank serves from the current snapshot and, when
+  db.get_content_version() moves, builds a new one on a background thread
+  and swaps it in with a single reference assignment
+- RecentQuestions remembers what each user was just served, so mixed
+  quizzes (assemble_quiz) can avoid repeats
+"""
+
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Iterable, List, Optional, Dict, Any, Set, Tuple
+
+from app import db
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+CONTENT_BANK_ENABLED = NUMPY_AVAILABLE and os.environ.get("CONTENT_BANK_ENABLED", "true").lower() != "false"
+
+# Cached index arrays for subject combinations (e.g. "math + mechanical-aptitude")
+POOL_CACHE_SIZE = 256
+
+# Question IDs remembered per user (and users remembered) to avoid repeats
+RECENT_QUESTIONS_PER_USER = int(os.environ.get("RECENT_QUESTIONS_PER_USER", "200"))
+RECENT_QUESTIONS_MAX_USERS = int(os.environ.get("RECENT_QUESTIONS_MAX_USERS", "10000"))
+
+
+def prefer_fresh(candidates: List[Any], count: int, taken: Set[Any], stale: Set[Any]) -> List[Any]:
+    """
+    First `count` candidates not already taken, preferring ones not in `stale`
+    (stale ones are only used when there are not enough fresh ones).
+    """
+    fresh = [c for c in candidates if c not in taken and c not in stale]
+    if len(fresh) < count:
+        fresh += [c for c in candidates if c in stale and c not in taken]
+    return fresh[:count]
+
+
+class BankSnapshot:
+    """Immutable, array-indexed view of the approved content at one version."""
+
+    def __init__(self, version: int, questions: List[Dict[str, Any]], flashcards: List[Dict[str, Any]]):
+        self.version = version
+        self.loaded_at = time.time()
+        self.questions = questions
+        self.flashcards = flashcards
+        self.question_positions = {q["id"]: i for i, q in enumerate(questions)}
+        self.flashcard_positions = {c["id"]: i for i, c in enumerate(flashcards)}
+
+        # Interned subject / card type codes
+        self.subject_codes: Dict[str, int] = {}
+        self.card_type_codes: Dict[str, int] = {}
+
+        question_subjects = np.fromiter(
+            (self._code(self.subject_codes, q, "subject") for q in questions), dtype=np.int16, count=len(questions)
+        )
+        flashcard_subjects = np.fromiter(
+            (self._code(self.subject_codes, c, "subject") for c in flashcards), dtype=np.int16, count=len(flashcards)
+        )
+        flashcard_types = np.fromiter(
+            (self._code(self.card_type_codes, c, "card_type") for c in flashcards), dtype=np.int16, count=len(flashcards)
+        )
+
+        # Row positions per subject, and per (subject, card type) for flashcards
+        self._question_index = self._group(question_subjects)
+        self._flashcard_index = self._group(
+            flashcard_subjects.astype(np.int32) * len(self.card_type_codes) + flashcard_types
+        )
+
+        self._pools: Dict[tuple, "np.ndarray"] = {}
+        self._pools_lock = threading.Lock()
+
+    @staticmethod
+    def _code(codes: Dict[str, int], row: Dict[str, Any], field: str) -> int:
+        value = sys.intern(row[field])
+        row[field] = value
+        return codes.setdefault(value, len(codes))
+
+    @staticmethod
+    def _group(keys: "np.ndarray") -> Dict[int, "np.ndarray"]:
+        """Split row positions by key: {key: int32 positions in row order}."""
+        if len(keys) == 0:
+            return {}
+        order = np.argsort(keys, kind="stable").astype(np.int32)
+        unique, starts = np.unique(keys[order], return_index=True)
+        bounds = list(starts[1:]) + [len(order)]
+        return {int(key): order[start:end] for key, start, end in zip(unique, starts, bounds)}
+
+    def _pool(self, cache_key: tuple, index: Dict[int, "np.ndarray"], keys: List[int]) -> "np.ndarray":
+        """Row positions for several index keys, concatenated once and cached."""
+        pool = self._pools.get(cache_key)
+        if pool is None:
+            parts = [index[k] for k in keys if k in index]
+            pool = np.concatenate(parts) if parts else np.empty(0, dtype=np.int32)
+            with self._pools_lock:
+                if len(self._pools) >= POOL_CACHE_SIZE:
+                    self._pools.clear()
+                self._pools[cache_key] = pool
+        return pool
+
+    def question_pool(self, subjects: List[str]) -> "np.ndarray":
+        codes = sorted({self.subject_codes[s] for s in subjects if s in self.subject_codes})
+        return self._pool(("q", *codes), self._question_index, codes)
+
+    def flashcard_pool(self, subjects: List[str], card_types: Optional[List[str]] = None) -> "np.ndarray":
+        subject_codes = sorted({self.subject_codes[s] for s in subjects if s in self.subject_codes})
+        if card_types:
+            type_codes = sorted({self.card_type_codes[t] for t in card_types if t in self.card_type_codes})
+        else:
+            type_codes = list(range(len(self.card_type_codes)))
+        width = len(self.card_type_codes)
+        keys = [s * width + t for s in subject_codes for t in type_codes]
+        return self._pool(("f", *keys), self._flashcard_index, keys)
+
+
+class ContentBank:
+    """Serves random questions and flashcards from the latest BankSnapshot."""
+
+    def __init__(self):
+        self._snapshot: Optional[BankSnapshot] = None
+        self._load_lock = threading.Lock()
+        self._reloading = False
+        self._local = threading.local()
+        self._reloads = 0
+        self._last_load_seconds: Optional[float] = None
+
+    def _rng(self) -> "np.random.Generator":
+        # numpy Generators are not thread-safe; one per thread
+        rng = getattr(self._local, "rng", None)
+        if rng is None:
+            rng = self._local.rng = np.random.default_rng()
+        return rng
+
+    def load(self) -> BankSnapshot:
+        """Build a snapshot of the current content and swap it in."""
+        with self._load_lock:
+            started = time.perf_counter()
+            version = db.get_content_version()
+            snapshot = BankSnapshot(version, db.get_all_questions(), db.get_all_flashcards())
+            self._snapshot = snapshot
+            self._reloads += 1
+            self._last_load_seconds = time.perf_counter() - started
+        print(f"📚 Content bank loaded: {len(snapshot.questions)} questions, "
+              f"{len(snapshot.flashcards)} flashcards in {self._last_load_seconds * 1000:.0f}ms")
+        return snapshot
+
+    def _reload_in_background(self):
+        try:
+            self.load()
+        except Exception as e:
+            print(f"⚠️ Content bank reload failed: {e}")
+        finally:
+            self._reloading = False
+
+    def snapshot(self) -> BankSnapshot:
+        """Current snapshot; a stale one keeps serving while its replacement builds."""
+        snapshot = self._snapshot
+        if snapshot is None:
+            return self.load()
+        if snapshot.version != db.get_content_version() and not self._reloading:
+            self._reloading = True
+            threading.Thread(target=self._reload_in_background, name="content-bank-reload", daemon=True).start()
+        return snapshot
+
+    def _sample(self, pool: "np.ndarray", count: int) -> List[int]:
+        k = min(max(count, 0), len(pool))
+        if k == 0:
+            return []
+        return pool[self._rng().choice(len(pool), size=k, replace=False)].tolist()
+
+    def get_random_questions(self, subjects: List[str], count: int = 10) -> List[Dict[str, Any]]:
+        """Random approved questions (same shape as db.get_random_questions, plus image_path)."""
+        snapshot = self.snapshot()
+        rows = snapshot.questions
+        return [dict(rows[i]) for i in self._sample(snapshot.question_pool(subjects), count)]
+
+    def sample_questions(self, subjects: List[str], count: int = 10) -> Tuple[int, List[Dict[str, Any]]]:
+        """
+        Random approved questions without copying them.
+
+        Returns:
+            (snapshot version, rows) - the rows are shared with the snapshot
+            and must be treated as read-only
+        """
+        snapshot = self.snapshot()
+        rows = snapshot.questions
+        return snapshot.version, [rows[i] for i in self._sample(snapshot.question_pool(subjects), count)]
+
+    def assemble_quiz(
+        self,
+        subjects: List[str],
+        count: int,
+        deck_ids: Iterable[str] = (),
+        deck_count: int = 0,
+        exclude: Iterable[str] = ()
+    ) -> Tuple[int, List[Dict[str, Any]]]:
+        """
+        Draw a mixed quiz in one pass: up to `deck_count` questions from the
+        user's deck, then bank questions for the rest. Both honor `subjects`,
+        no question appears twice, and IDs in `exclude` (recently served) are
+        only used when there is nothing else to fill the quiz with.
+
+        Args:
+            subjects: Subjects to draw from
+            count: Total questions
+            deck_ids: Question IDs in the user's study deck
+            deck_count: How many of `count` should come from the deck
+            exclude: Question IDs to avoid
+
+        Returns:
+            (snapshot version, rows) - deck questions first; rows are shared
+            with the snapshot and must be treated as read-only
+        """
+        snapshot = self.snapshot()
+        rng = self._rng()
+        rows = snapshot.questions
+        positions = snapshot.question_positions
+        wanted = set(subjects)
+        stale = {positions[i] for i in exclude if i in positions}
+
+        deck = [
+            positions[i] for i in dict.fromkeys(deck_ids)
+            if i in positions and rows[positions[i]]["subject"] in wanted
+        ]
+        shuffled = [deck[i] for i in rng.permutation(len(deck))]
+        chosen = prefer_fresh(shuffled, min(max(deck_count, 0), count), set(), stale)
+
+        need = count - len(chosen)
+        pool = snapshot.question_pool(subjects)
+        if need > 0 and len(pool):
+            # Oversample by the number of positions that may be skipped, so
+            # a single draw always holds enough usable candidates
+            skip = set(chosen) | stale
+            draw = min(len(pool), need + len(skip))
+            candidates = pool[rng.choice(len(pool), size=draw, replace=False)].tolist()
+            chosen += prefer_fresh(candidates, need, set(chosen), stale)
+
+        return snapshot.version, [rows[i] for i in chosen]
+
+    def get_random_flashcards(
+        self,
+        subjects: List[str],
+        count: int = 10,
+        card_types: Optional[List[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """Random approved flashcards (same shape as db.get_random_flashcards)."""
+        snapshot = self.snapshot()
+        rows = snapshot.flashcards
+        return [dict(rows[i]) for i in self._sample(snapshot.flashcard_pool(subjects, card_types), count)]
+
+    def get_questions_by_id(self, ids: List[str]) -> List[Dict[str, Any]]:
+        """Approved questions for the given IDs, in order (unknown IDs skipped)."""
+        snapshot = self.snapshot()
+        positions = snapshot.question_positions
+        return [dict(snapshot.questions[positions[i]]) for i in ids if i in positions]
+
+    def stats(self) -> Dict[str, Any]:
+        snapshot = self._snapshot
+        return {
+            "enabled": CONTENT_BANK_ENABLED,
+            "version": snapshot.version if snapshot else None,
+            "questions": len(snapshot.questions) if snapshot else 0,
+            "flashcards": len(snapshot.flashcards) if snapshot else 0,
+            "loaded_at": snapshot.loaded_at if snapshot else None,
+            "last_load_seconds": self._last_load_seconds,
+            "reloads": self._reloads,
+        }
+
+
+class RecentQuestions:
+    """Bounded LRU of the question IDs most recently served to each user."""
+
+    def __init__(self, per_user: int = RECENT_QUESTIONS_PER_USER, max_users: int = RECENT_QUESTIONS_MAX_USERS):
+        self.per_user = per_user
+        self.max_users = max_users
+        self._lock = threading.Lock()
+        self._users: "OrderedDict[str, deque]" = OrderedDict()
+
+    def get(self, user_id: str) -> Set[str]:
+        """IDs recently served to a user."""
+        with self._lock:
+            served = self._users.get(user_id)
+            return set(served) if served else set()
+
+    def add(self, user_id: str, question_ids: Iterable[str]):
+        """Remember IDs just served to a user (oldest ones fall off)."""
+        if self.per_user <= 0 or self.max_users <= 0:
+            return
+        with self._lock:
+            served = self._users.get(user_id)
+            if served is None:
+                served = self._users[user_id] = deque(maxlen=self.per_user)
+            served.extend(question_ids)
+            self._users.move_to_end(user_id)
+            while len(self._users) > self.max_users:
+                self._users.popitem(last=False)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"users": len(self._users), "per_user": self.per_user, "max_users": self.max_users}
+
+
+# Global content bank
+content_bank = ContentBank()
+
+# Global recently-served tracker (per process; a repeat across instances is harmless)
+recent_questions = RecentQuestions()
+
+
+def get_content_bank_stats() -> Dict[str, Any]:
+    """Snapshot version, size and reload timing for /api/metrics."""
+    return {**content_bank.stats(), "recent_questions": recent_questions.stats()}
@@ -2,83 +2,405 @@
 Database module for Question Bank & Study Deck.
 Uses SQLite for storage of pre-generated questions, user accounts, and study decks.
 Syncs with Cloud Storage for persistence across Cloud Run deployments.
+
+Data lives in two files:
+- content.db: the read-mostly question and flashcard bank. The API opens it
+  read-only (immutable, memory-mapped); only generator/import scripts write it.
+  Each upload is a new immutable generation in the object store; a watcher
+  picks up new generations and swaps readers onto them without a restart.
+- user.db: small, hot user state (accounts, sessions, decks, reports, feedback,
+  leads). It is the only file synced on request-path writes. User connections
+  ATTACH the content bank, so joins such as study deck -> questions still work.
 """
 
 import os
+import re
 import json
+import base64
+import zlib
 import sqlite3
 import uuid
+import time
+import atexit
+import queue
+import random
 import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextvars import ContextVar
 from datetime import datetime
 from pathlib import Path
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Iterator, Callable
 from contextlib import contextmanager
 
+from app.storage import (
+    create_object_store, BackgroundSyncer, GenerationWatcher, snapshot_sqlite,
+    file_checksum, read_generation_marker, write_generation_marker,
+)
+
 # Cloud Storage configuration
 GCS_BUCKET = os.environ.get("GCS_DB_BUCKET", "firefighter-exam-prep-db")
-GCS_DB_BLOB = "questions.db"
-DB_PATH = Path(__file__).parent.parent / "data" / "questions.db"
+DATA_DIR = Path(os.environ.get("DB_DATA_DIR", Path(__file__).parent.parent / "data"))
+
+# Content bank (questions, flashcards)
+CONTENT_DB_BLOB = "content.db"
+CONTENT_DB_PATH = DATA_DIR / "content.db"
+CONTENT_TABLES = ("questions", "flashcards")
+
+# User state (everything written by API requests)
+USER_DB_BLOB = "user.db"
+USER_DB_PATH = DATA_DIR / "user.db"
+USER_TABLES = (
+    "users", "sessions", "revoked_tokens", "study_deck", "flashcard_study_deck",
+    "reported_questions", "user_feedback", "email_leads",
+)
+
+# Pre-split single-file database, migrated on first start (see migrate_legacy_db)
+LEGACY_DB_BLOB = "questions.db"
+LEGACY_DB_PATH = DATA_DIR / "questions.db"
+
+# Connection pool configuration
+DB_POOL_SIZE = int(os.environ.get("DB_POOL_SIZE", "8"))
+DB_BUSY_TIMEOUT_MS = int(os.environ.get("DB_BUSY_TIMEOUT_MS", "5000"))
+CONTENT_DB_MMAP_BYTES = int(os.environ.get("CONTENT_DB_MMAP_BYTES", str(256 * 1024 * 1024)))
+
+# How often to check the object store for a new content bank generation (0 = never)
+CONTENT_WATCH_INTERVAL_SECONDS = float(os.environ.get("CONTENT_WATCH_INTERVAL_SECONDS", "30"))
+
+# Background maintenance (see app.maintenance): rows per expired-row delete,
+# planner analysis budget, pages returned per incremental vacuum
+MAINTENANCE_DELETE_BATCH = int(os.environ.get("MAINTENANCE_DELETE_BATCH", "500"))
+DB_ANALYSIS_LIMIT = int(os.environ.get("DB_ANALYSIS_LIMIT", "1000"))
+DB_VACUUM_MAX_PAGES = int(os.environ.get("DB_VACUUM_MAX_PAGES", "1000"))
+
+# Write-behind sync: upload once writes go quiet, or after the max delay
+DB_SYNC_IDLE_SECONDS = float(os.environ.get("DB_SYNC_IDLE_SECONDS", "2"))
+DB_SYNC_MAX_DELAY_SECONDS = float(os.environ.get("DB_SYNC_MAX_DELAY_SECONDS", "15"))
+
+_store = create_object_store(GCS_BUCKET)
+_user_syncer = BackgroundSyncer(
+    USER_DB_PATH,
+    _store,
+    USER_DB_BLOB,
+    idle_seconds=DB_SYNC_IDLE_SECONDS,
+    max_delay_seconds=DB_SYNC_MAX_DELAY_SECONDS,
+)
+_content_syncer = BackgroundSyncer(
+    CONTENT_DB_PATH,
+    _store,
+    CONTENT_DB_BLOB,
+    idle_seconds=DB_SYNC_IDLE_SECONDS,
+    max_delay_seconds=DB_SYNC_MAX_DELAY_SECONDS,
+)
+
+
+# Object-store generation of the content bank this process serves (None = local only)
+_content_generation: Optional[int] = None
+_content_loaded_at: Optional[float] = None
+_content_swap_lock = threading.Lock()
+
+# Seconds spent in each startup phase (see execution/benchmark_cold_start.py)
+_startup_timings: Dict[str, float] = {}
+
+
+@contextmanager
+def _startup_phase(name: str):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        _startup_timings[name] = _startup_timings.get(name, 0.0) + time.perf_counter() - started
 
-# Track if we need to sync
-_db_modified = False
-_sync_lock = threading.Lock()
 
+def get_startup_timings() -> Dict[str, float]:
+    """Seconds spent in each phase of importing this module."""
+    return dict(_startup_timings)
 
-def _download_db_from_gcs():
-    """Download database from Cloud Storage on startup."""
+
+def _local_copy_is_current(blob_name: str, local_path: Path, generation: int) -> bool:
+    """True if the local file already holds this generation (by marker, else by checksum)."""
+    if not local_path.exists():
+        return False
+    local_generation = read_generation_marker(local_path)
+    if local_generation is not None:
+        return local_generation == generation
+    # No marker (e.g. a file baked into the image): compare contents instead
+    remote_checksum = _store.checksum(blob_name)
+    return remote_checksum is not None and remote_checksum == file_checksum(local_path)
+
+
+def _download_db_from_gcs(blob_name: str, local_path: Path) -> bool:
+    """
+    Download one database file from Cloud Storage on startup, unless the
+    local copy already matches the latest generation.
+    """
     try:
-        from google.cloud import storage
-        client = storage.Client()
-        bucket = client.bucket(GCS_BUCKET)
-        blob = bucket.blob(GCS_DB_BLOB)
-        
-        if blob.exists():
-            DB_PATH.parent.mkdir(parents=True, exist_ok=True)
-            blob.download_to_filename(str(DB_PATH))
-            print(f"📥 Downloaded database from gs://{GCS_BUCKET}/{GCS_DB_BLOB}")
+        generation = _store.generation(blob_name)
+        if generation is None:
+            print(f"⚠️ No {blob_name} found in Cloud Storage")
+            return False
+        if _local_copy_is_current(blob_name, local_path, generation):
+            write_generation_marker(local_path, generation)
+            print(f"✅ {local_path.name} is current (generation {generation}), skipping download")
+            return True
+
+        downloaded = local_path.with_name(local_path.name + ".download")
+        if _store.download(blob_name, downloaded, generation=generation):
+            # A stale WAL from a previous run would be replayed over the fresh copy
+            for suffix in ("-wal", "-shm"):
+                Path(str(local_path) + suffix).unlink(missing_ok=True)
+            os.replace(downloaded, local_path)
+            write_generation_marker(local_path, generation)
+            print(f"📥 Downloaded database from {_store.describe()}/{blob_name}")
             return True
         else:
-            print(f"⚠️ No database found in Cloud Storage, starting fresh")
+            print(f"⚠️ No {blob_name} found in Cloud Storage")
             return False
     except Exception as e:
-        print(f"⚠️ Could not download from GCS: {e}")
+        print(f"⚠️ Could not download {blob_name} from GCS: {e}")
         return False
 
 
-def _upload_db_to_gcs():
-    """Upload database to Cloud Storage after modifications."""
-    global _db_modified
-    with _sync_lock:
-        if not _db_modified:
+def migrate_legacy_db(legacy_path: Path = LEGACY_DB_PATH):
+    """
+    Split a pre-split questions.db into content.db and user.db.
+
+    Each new file starts as an online-backup copy of the legacy database with
+    the other side's tables dropped, so schemas, indexes and rows carry over
+    unchanged. The legacy file is left in place (locally and in Cloud Storage)
+    as a rollback path. Both new files are scheduled for upload.
+    """
+    for target, drop_tables in ((CONTENT_DB_PATH, USER_TABLES), (USER_DB_PATH, CONTENT_TABLES)):
+        partial = target.with_name(target.name + ".partial")
+        snapshot_sqlite(legacy_path, partial)
+        conn = sqlite3.connect(str(partial))
+        try:
+            for table in drop_tables:
+                conn.execute(f"DROP TABLE IF EXISTS {table}")
+            conn.commit()
+            # Immutable readers cannot see a WAL, so files start in rollback mode
+            conn.execute("PRAGMA journal_mode=DELETE")
+            conn.execute("VACUUM")
+        finally:
+            conn.close()
+        os.replace(partial, target)
+
+    print(f"🔀 Split {legacy_path.name} into {CONTENT_DB_PATH.name} + {USER_DB_PATH.name}")
+    _content_syncer.mark_dirty()
+    _user_syncer.mark_dirty()
+
+
+def _timed_download(blob_name: str, local_path: Path) -> bool:
+    with _startup_phase(f"download:{blob_name}"):
+        return _download_db_from_gcs(blob_name, local_path)
+
+
+def _prepare_databases():
+    """Fetch both databases, falling back to migrating the legacy single file."""
+    global _content_generation, _content_loaded_at
+    # The two files are independent, so fetch them side by side
+    with ThreadPoolExecutor(max_workers=2, thread_name_prefix="db-download") as pool:
+        content = pool.submit(_timed_download, CONTENT_DB_BLOB, CONTENT_DB_PATH)
+        user = pool.submit(_timed_download, USER_DB_BLOB, USER_DB_PATH)
+        downloaded = content.result()
+        has_user = user.result() or USER_DB_PATH.exists()
+    if downloaded:
+        _content_generation = read_generation_marker(CONTENT_DB_PATH)
+        _content_loaded_at = time.time()
+    has_content = downloaded or CONTENT_DB_PATH.exists()
+    if has_content or has_user:
+        return
+
+    if _timed_download(LEGACY_DB_BLOB, LEGACY_DB_PATH) or LEGACY_DB_PATH.exists():
+        with _startup_phase("migrate_legacy"):
+            migrate_legacy_db(LEGACY_DB_PATH)
+    else:
+        print("⚠️ No database found in Cloud Storage, starting fresh")
+
+
+# Download databases on module import (startup)
+DATA_DIR.mkdir(parents=True, exist_ok=True)
+with _startup_phase("prepare_databases"):
+    _prepare_databases()
+
+
+# =============================================================================
+# CONNECTION POOLS
+# =============================================================================
+
+class _PooledConnection(sqlite3.Connection):
+    """sqlite3 connection tagged with the pool generation it was opened in."""
+    generation = 0
+
+
+class _ConnectionPool:
+    """
+    Small pool of long-lived SQLite connections.
+
+    Up to ``max_idle`` connections are kept warm; bursts beyond that open
+    extra connections which are closed on release. reset() retires every
+    connection (idle ones immediately, borrowed ones when returned) so the
+    next checkout reopens the file - used after the content bank changes.
+    """
+
+    def __init__(self, connect: Callable[[], sqlite3.Connection], max_idle: int = DB_POOL_SIZE):
+        self._connect = connect
+        self._generation = 0
+        self._idle: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue(maxsize=max_idle)
+
+    def acquire(self) -> sqlite3.Connection:
+        """Take an idle connection, or open a new one if none are idle."""
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            if conn.generation == self._generation:
+                return conn
+            conn.close()
+        conn = self._connect()
+        conn.generation = self._generation
+        return conn
+
+    def release(self, conn: sqlite3.Connection):
+        """Return a connection to the pool (closed if retired or the pool is full)."""
+        if conn.in_transaction:
+            conn.rollback()
+        if conn.generation != self._generation:
+            conn.close()
             return
         try:
-            from google.cloud import storage
-            client = storage.Client()
-            bucket = client.bucket(GCS_BUCKET)
-            blob = bucket.blob(GCS_DB_BLOB)
-            blob.upload_from_filename(str(DB_PATH))
-            _db_modified = False
-            print(f"📤 Uploaded database to gs://{GCS_BUCKET}/{GCS_DB_BLOB}")
-        except Exception as e:
-            print(f"⚠️ Could not upload to GCS: {e}")
+            self._idle.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a connection for the duration of a block."""
+        conn = self.acquire()
+        try:
+            yield conn
+        finally:
+            self.release(conn)
 
+    @property
+    def generation(self) -> int:
+        return self._generation
 
-def _mark_modified():
-    """Mark database as modified to trigger sync."""
-    global _db_modified
-    _db_modified = True
+    def reset(self):
+        """Retire all current connections."""
+        self._generation += 1
+        self.close_all()
 
+    def close_all(self):
+        """Close every idle connection (used on shutdown)."""
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
 
-# Download database on module import (startup)
-_download_db_from_gcs()
+
+def _content_uri() -> str:
+    return CONTENT_DB_PATH.resolve().as_uri() + "?mode=ro&immutable=1"
+
+
+def _connect_content() -> sqlite3.Connection:
+    """
+    Read-only connection to the content bank. immutable=1 skips file locking
+    and change detection entirely, and the file is memory-mapped.
+    """
+    conn = sqlite3.connect(_content_uri(), uri=True, check_same_thread=False, factory=_PooledConnection)
+    conn.row_factory = sqlite3.Row
+    conn.execute(f"PRAGMA mmap_size={CONTENT_DB_MMAP_BYTES}")
+    return conn
+
+
+def _connect_user() -> sqlite3.Connection:
+    """
+    Connection to the user-state database in WAL mode so readers never block
+    behind the writer, with synchronous=NORMAL (safe under WAL) and a busy
+    timeout so concurrent writers wait instead of failing immediately.
+    The content bank is attached read-only as `content`.
+    """
+    conn = sqlite3.connect(
+        str(USER_DB_PATH),
+        timeout=DB_BUSY_TIMEOUT_MS / 1000,
+        check_same_thread=False,
+        uri=True,
+        factory=_PooledConnection,
+    )
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA main.journal_mode=WAL")
+    conn.execute("PRAGMA main.synchronous=NORMAL")
+    conn.execute(f"PRAGMA busy_timeout={DB_BUSY_TIMEOUT_MS}")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("ATTACH DATABASE ? AS content", (_content_uri(),))
+    conn.execute(f"PRAGMA content.mmap_size={CONTENT_DB_MMAP_BYTES}")
+    return conn
+
+
+_pool = _ConnectionPool(_connect_user)
+_content_pool = _ConnectionPool(_connect_content)
+
+# User-state connection bound to the current request by the request_connection dependency
+_request_conn: ContextVar[Optional[sqlite3.Connection]] = ContextVar("_request_conn", default=None)
+
+
+@contextmanager
+def _checkout() -> Iterator[sqlite3.Connection]:
+    """Use the request-scoped connection if one is bound, else borrow from the pool."""
+    conn = _request_conn.get()
+    if conn is not None:
+        yield conn
+        return
+    with _pool.connection() as conn:
+        yield conn
+
+
+async def request_connection():
+    """
+    FastAPI dependency that hands a route one pooled connection for the whole request.
+    Every db helper called while handling the request reuses it.
+    """
+    conn = _pool.acquire()
+    _request_conn.set(conn)
+    try:
+        yield conn
+    finally:
+        _request_conn.set(None)
+        _pool.release(conn)
 
 
 @contextmanager
 def get_db():
-    """Context manager for database connections."""
-    DB_PATH.parent.mkdir(parents=True, exist_ok=True)
-    conn = sqlite3.connect(str(DB_PATH))
+    """Context manager for database connections (user state, with content attached)."""
+    with _checkout() as conn:
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+
+@contextmanager
+def get_content_db():
+    """Context manager for read-only content bank connections."""
+    with _content_pool.connection() as conn:
+        yield conn
+
+
+@contextmanager
+def get_content_db_write():
+    """
+    Writable connection to the content bank, for generator/import scripts.
+
+    API connections treat the file as immutable, so once the write commits
+    every pooled connection is retired and the file is scheduled for upload.
+    """
+    conn = sqlite3.connect(str(CONTENT_DB_PATH), timeout=DB_BUSY_TIMEOUT_MS / 1000)
     conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=DELETE")
     try:
         yield conn
         conn.commit()
@@ -87,139 +409,778 @@ def get_db():
         raise
     finally:
         conn.close()
+    _content_pool.reset()
+    _pool.reset()
+    _invalidate_sample_counts()
+    _content_syncer.mark_dirty()
 
 
-@contextmanager
-def get_db_write():
-    """Context manager for write operations - triggers Cloud Storage sync."""
-    DB_PATH.parent.mkdir(parents=True, exist_ok=True)
-    conn = sqlite3.connect(str(DB_PATH))
-    conn.row_factory = sqlite3.Row
+# =============================================================================
+# GROUP COMMIT WRITER
+# =============================================================================
+
+DB_WRITE_BATCH_MAX = int(os.environ.get("DB_WRITE_BATCH_MAX", "256"))
+
+WriteOp = Callable[[sqlite3.Connection], Any]
+
+
+class _GroupCommitWriter:
+    """
+    Single writer thread for user-state writes.
+
+    Callers enqueue a function of a connection and get a Future back. The
+    writer drains whatever is queued (up to `max_batch`), runs each operation
+    in its own savepoint inside one transaction, commits once and then
+    resolves every future. A failing operation is rolled back to its
+    savepoint and only its own future gets the exception. With one writer
+    there is no lock contention, so bursts never hit "database is locked".
+
+    stop() drains the queue and ends the thread; a later submit() starts a
+    new one, so writes after shutdown (atexit, scripts) still complete.
+    """
+
+    def __init__(self, max_batch: int = DB_WRITE_BATCH_MAX):
+        self.max_batch = max_batch
+        self._queue: "queue.SimpleQueue" = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._conn: Optional[sqlite3.Connection] = None
+
+        # Metrics
+        self._writes = 0
+        self._batches = 0
+        self._failures = 0
+        self._largest_batch = 0
+
+    def submit(self, op: WriteOp) -> Future:
+        """Queue a write; the future resolves once its batch has committed."""
+        future: Future = Future()
+        # Enqueued under the lock so it is never stranded behind a stopping writer
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="db-writer", daemon=True)
+                self._thread.start()
+            self._queue.put((op, future))
+        return future
+
+    def _connection(self) -> sqlite3.Connection:
+        # Reopen after the content bank changed (it is attached read-only)
+        if self._conn is None or self._conn.generation != _pool.generation:
+            if self._conn is not None:
+                self._conn.close()
+            self._conn = _connect_user()
+            self._conn.generation = _pool.generation
+            self._conn.isolation_level = None  # explicit BEGIN/COMMIT
+        return self._conn
+
+    def _run(self):
+        stopping = False
+        while True:
+            if stopping:
+                # Exit only once nothing is queued; submit() restarts a writer after this
+                with self._lock:
+                    if self._queue.empty():
+                        if self._conn is not None:
+                            self._conn.close()
+                            self._conn = None
+                        self._thread = None
+                        return
+            item = self._queue.get()
+            if item is None:
+                stopping = True
+                continue
+            batch = [item]
+            while len(batch) < self.max_batch:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+            self._commit_batch(batch)
+
+    def _commit_batch(self, batch: List[tuple]):
+        results = []
+        try:
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            for op, future in batch:
+                conn.execute("SAVEPOINT op")
+                try:
+                    results.append((future, op(conn), None))
+                    conn.execute("RELEASE op")
+                except Exception as e:
+                    conn.execute("ROLLBACK TO op")
+                    conn.execute("RELEASE op")
+                    results.append((future, None, e))
+            conn.execute("COMMIT")
+        except Exception as e:
+            print(f"⚠️ Write batch of {len(batch)} failed: {e}")
+            if self._conn is not None and self._conn.in_transaction:
+                self._conn.execute("ROLLBACK")
+            with self._lock:
+                self._failures += len(batch)
+            for _, future in batch:
+                future.set_exception(e)
+            return
+
+        _user_syncer.mark_dirty()
+        with self._lock:
+            self._writes += len(batch)
+            self._batches += 1
+            self._largest_batch = max(self._largest_batch, len(batch))
+        for future, result, error in results:
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+
+    def stop(self):
+        """Commit everything queued so far and stop the writer thread."""
+        with self._lock:
+            thread = self._thread
+            if thread is not None:
+                self._queue.put(None)
+        if thread is not None:
+            thread.join(timeout=10)
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "writes": self._writes,
+                "batches": self._batches,
+                "avg_batch": round(self._writes / self._batches, 2) if self._batches else 0.0,
+                "largest_batch": self._largest_batch,
+                "failures": self._failures,
+                "queued": self._queue.qsize(),
+            }
+
+
+_writer = _GroupCommitWriter()
+
+# Set by db_async while it calls a write helper, so the helper hands back its future
+_defer_writes: ContextVar[bool] = ContextVar("_defer_writes", default=False)
+
+
+def _write(op: WriteOp):
+    """
+    Run `op(conn)` through the group-commit writer and return its result.
+
+    Write helpers must `return _write(...)` as their last step: async callers
+    (see db_async) get the pending Future back instead of blocking on it.
+    """
+    future = _writer.submit(op)
+    if _defer_writes.get():
+        return future
+    return future.result()
+
+
+def get_write_metrics() -> Dict[str, Any]:
+    """Group-commit batch sizes and throughput counters."""
+    return _writer.metrics()
+
+
+def get_content_version() -> int:
+    """Changes whenever this process sees new content (bumped by content writes and swaps)."""
+    return _content_pool.generation
+
+
+# =============================================================================
+# CONTENT SNAPSHOTS
+# =============================================================================
+
+def reload_content_snapshot(generation: Optional[int] = None) -> bool:
+    """
+    Download a new content bank generation and swap readers onto it.
+
+    The snapshot is downloaded next to the live file, checked, and renamed
+    over it. Connections already open keep reading the old file (they hold
+    the replaced inode) until they are returned to the pool; every checkout
+    after the swap opens the new one.
+
+    Args:
+        generation: Generation to load (default: the latest in the store)
+
+    Returns:
+        True if this process now serves the generation (swapped, our own
+        upload, or already current); False if it should be retried later
+        (download failed or local content writes are still pending)
+    """
+    global _content_generation, _content_loaded_at
+    with _content_swap_lock:
+        if generation is None:
+            generation = _store.generation(CONTENT_DB_BLOB)
+        if generation is None:
+            return False
+        if generation == _content_generation:
+            return True
+        if _content_syncer.pending:
+            # Local content writes are waiting to upload and will become the next generation
+            return False
+        if generation == _content_syncer.last_generation:
+            # Our own upload: the local file already holds this version
+            _content_generation = generation
+            return True
+
+        downloaded = CONTENT_DB_PATH.with_name(CONTENT_DB_PATH.name + ".download")
+        if not _store.download(CONTENT_DB_BLOB, downloaded, generation=generation):
+            return False
+        try:
+            conn = sqlite3.connect(str(downloaded))
+            try:
+                result = conn.execute("PRAGMA quick_check").fetchone()[0]
+            finally:
+                conn.close()
+            if result != "ok":
+                raise sqlite3.DatabaseError(f"content snapshot failed quick_check: {result}")
+            # Older snapshots may predate tables or counters this build expects
+            _init_content_schema(downloaded)
+            os.replace(downloaded, CONTENT_DB_PATH)
+            write_generation_marker(CONTENT_DB_PATH, generation)
+        finally:
+            downloaded.unlink(missing_ok=True)
+
+        _content_generation = generation
+        _content_loaded_at = time.time()
+        _content_pool.reset()
+        _pool.reset()
+        _invalidate_sample_counts()
+    print(f"🔄 Content bank swapped to generation {generation}")
+    return True
+
+
+_content_watcher = GenerationWatcher(
+    _store,
+    CONTENT_DB_BLOB,
+    reload_content_snapshot,
+    interval_seconds=CONTENT_WATCH_INTERVAL_SECONDS,
+    initial_generation=_content_generation,
+)
+
+
+def start_content_watcher():
+    """Poll the object store for new content bank generations (app startup hook)."""
+    if CONTENT_WATCH_INTERVAL_SECONDS > 0:
+        _content_watcher.start()
+
+
+def get_content_snapshot_info() -> Dict[str, Any]:
+    """Which content bank version this process serves, for /api/health and /api/metrics."""
+    return {
+        "generation": _content_generation,
+        "local_version": _content_pool.generation,
+        "loaded_at": _content_loaded_at,
+        "watcher": _content_watcher.metrics(),
+    }
+
+
+def flush_db_sync() -> bool:
+    """Upload pending writes now instead of waiting for the background syncers."""
+    user_ok = _user_syncer.flush()
+    content_ok = _content_syncer.flush()
+    return user_ok and content_ok
+
+
+def get_sync_metrics() -> Dict[str, Any]:
+    """Background sync state per file (pending writes, last upload, last-sync lag)."""
+    return {
+        "user": _user_syncer.metrics(),
+        "content": _content_syncer.metrics(),
+    }
+
+
+def close_db():
+    """Flush pending writes and close pooled connections (app shutdown hook)."""
+    _content_watcher.stop()
+    _writer.stop()
+    _user_syncer.stop()
+    _content_syncer.stop()
+    _pool.close_all()
+    _content_pool.close_all()
+
+
+# Scripts that never reach the lifespan hook still get their writes uploaded
+atexit.register(close_db)
+
+
+CONTENT_SCHEMA = """
+    -- Pre-generated question bank
+    CREATE TABLE IF NOT EXISTS questions (
+        id TEXT PRIMARY KEY,
+        subject TEXT NOT NULL,
+        question TEXT NOT NULL,
+        options TEXT NOT NULL,
+        correct_answer TEXT NOT NULL,
+        explanation TEXT NOT NULL,
+        image_path TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        quality_score REAL DEFAULT 1.0,
+        reported_count INTEGER DEFAULT 0,
+        is_approved BOOLEAN DEFAULT TRUE
+    );
+
+    -- Pre-generated flashcard bank
+    CREATE TABLE IF NOT EXISTS flashcards (
+        id TEXT PRIMARY KEY,
+        subject TEXT NOT NULL,
+        card_type TEXT NOT NULL,
+        front_content TEXT NOT NULL,
+        back_content TEXT NOT NULL,
+        hint TEXT,
+        source TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        reported_count INTEGER DEFAULT 0,
+        is_approved BOOLEAN DEFAULT TRUE
+    );
+
+    -- Indexes
+    CREATE INDEX IF NOT EXISTS idx_questions_subject ON questions(subject);
+    CREATE INDEX IF NOT EXISTS idx_questions_approved ON questions(is_approved);
+    CREATE INDEX IF NOT EXISTS idx_flashcards_subject ON flashcards(subject);
+    CREATE INDEX IF NOT EXISTS idx_flashcards_type ON flashcards(card_type);
+    CREATE INDEX IF NOT EXISTS idx_flashcards_approved ON flashcards(is_approved);
+    -- Covering indexes for random sampling (see _sample_rowids)
+    CREATE INDEX IF NOT EXISTS idx_questions_sample ON questions(subject, is_approved);
+    CREATE INDEX IF NOT EXISTS idx_flashcards_sample ON flashcards(subject, card_type, is_approved);
+"""
+
+# Full-text search indexes over the bank (see search_questions). External-content
+# FTS5 tables store only the index; the text is read back from the base table.
+# Porter stemming matches "gears" to "gear"; prefix indexes keep "hal*" fast.
+FTS_TABLES = {
+    "questions_fts": ("questions", ("question", "options", "explanation")),
+    "flashcards_fts": ("flashcards", ("front_content", "back_content", "hint")),
+}
+
+
+def _fts_schema() -> str:
+    parts = []
+    for fts, (table, columns) in FTS_TABLES.items():
+        cols = ", ".join(columns)
+        new = ", ".join(f"new.{c}" for c in columns)
+        old = ", ".join(f"old.{c}" for c in columns)
+        parts.append(f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5(
+        {cols}, content='{table}', content_rowid='rowid',
+        tokenize='porter unicode61 remove_diacritics 2', prefix='2 3'
+    );
+    CREATE TRIGGER IF NOT EXISTS {fts}_insert AFTER INSERT ON {table} BEGIN
+        INSERT INTO {fts}(rowid, {cols}) VALUES (new.rowid, {new});
+    END;
+    CREATE TRIGGER IF NOT EXISTS {fts}_delete AFTER DELETE ON {table} BEGIN
+        INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.rowid, {old});
+    END;
+    CREATE TRIGGER IF NOT EXISTS {fts}_update AFTER UPDATE OF {cols} ON {table} BEGIN
+        INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.rowid, {old});
+        INSERT INTO {fts}(rowid, {cols}) VALUES (new.rowid, {new});
+    END;""")
+    return "".join(parts)
+
+
+CONTENT_SEARCH_SCHEMA = _fts_schema()
+
+# question_id/flashcard_id point into content.db, so they carry no FOREIGN KEY
+USER_SCHEMA = """
+    -- User accounts
+    CREATE TABLE IF NOT EXISTS users (
+        id TEXT PRIMARY KEY,
+        email TEXT UNIQUE NOT NULL,
+        password_hash TEXT NOT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+
+    -- User study deck
+    CREATE TABLE IF NOT EXISTS study_deck (
+        id TEXT PRIMARY KEY,
+        user_id TEXT NOT NULL,
+        question_id TEXT NOT NULL,
+        added_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (user_id) REFERENCES users(id)
+    );
+
+    -- Question reports
+    CREATE TABLE IF NOT EXISTS reported_questions (
+        id TEXT PRIMARY KEY,
+        question_id TEXT NOT NULL,
+        user_id TEXT,
+        reason TEXT,
+        reported_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        reviewed BOOLEAN DEFAULT FALSE
+    );
+
+    -- User feedback (general ideas/suggestions)
+    CREATE TABLE IF NOT EXISTS user_feedback (
+        id TEXT PRIMARY KEY,
+        study_mode TEXT NOT NULL,
+        message TEXT NOT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        reviewed BOOLEAN DEFAULT FALSE
+    );
+
+    -- Email leads (pre-registration email capture)
+    CREATE TABLE IF NOT EXISTS email_leads (
+        id TEXT PRIMARY KEY,
+        email TEXT UNIQUE NOT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        converted BOOLEAN DEFAULT FALSE
+    );
+
+    -- User flashcard study deck
+    CREATE TABLE IF NOT EXISTS flashcard_study_deck (
+        id TEXT PRIMARY KEY,
+        user_id TEXT NOT NULL,
+        flashcard_id TEXT NOT NULL,
+        added_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (user_id) REFERENCES users(id)
+    );
+
+    -- Persistent sessions (survives Cloud Run restarts)
+    CREATE TABLE IF NOT EXISTS sessions (
+        token TEXT PRIMARY KEY,
+        user_id TEXT NOT NULL,
+        email TEXT NOT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        expires_at TIMESTAMP NOT NULL,
+        FOREIGN KEY (user_id) REFERENCES users(id)
+    );
+
+    -- Revoked signed session tokens (key is a token id or "user:<id>")
+    CREATE TABLE IF NOT EXISTS revoked_tokens (
+        key TEXT PRIMARY KEY,
+        revoked_at REAL NOT NULL,
+        expires_at REAL NOT NULL
+    );
+
+    -- Indexes
+    CREATE INDEX IF NOT EXISTS idx_sessions_user ON sessions(user_id);
+    CREATE INDEX IF NOT EXISTS idx_sessions_expires ON sessions(expires_at);
+    -- Keyset pagination for admin listings (newest first, see list_admin_page)
+    CREATE INDEX IF NOT EXISTS idx_users_created ON users(created_at, id);
+    CREATE INDEX IF NOT EXISTS idx_email_leads_created ON email_leads(created_at, id);
+    CREATE INDEX IF NOT EXISTS idx_reports_pending ON reported_questions(reviewed, reported_at, id);
+    CREATE INDEX IF NOT EXISTS idx_feedback_pending ON user_feedback(reviewed, created_at, id);
+    -- Superseded by the listing indexes above (same leading column)
+    DROP INDEX IF EXISTS idx_reports_reviewed;
+    DROP INDEX IF EXISTS idx_feedback_reviewed;
+
+    -- One deck entry per (user, item). Drop duplicates left by the old
+    -- check-then-insert adds (keeping the first) before enforcing it.
+    DELETE FROM study_deck WHERE rowid NOT IN (
+        SELECT MIN(rowid) FROM study_deck GROUP BY user_id, question_id
+    );
+    DELETE FROM flashcard_study_deck WHERE rowid NOT IN (
+        SELECT MIN(rowid) FROM flashcard_study_deck GROUP BY user_id, flashcard_id
+    );
+    CREATE UNIQUE INDEX IF NOT EXISTS idx_study_deck_user_question ON study_deck(user_id, question_id);
+    CREATE UNIQUE INDEX IF NOT EXISTS idx_flashcard_study_deck_user_card ON flashcard_study_deck(user_id, flashcard_id);
+    -- Superseded by the unique indexes above (same leading column)
+    DROP INDEX IF EXISTS idx_study_deck_user;
+    DROP INDEX IF EXISTS idx_flashcard_study_deck_user;
+"""
+
+
+# =============================================================================
+# STATS COUNTERS
+# =============================================================================
+
+# Materialized COUNT(*)s for the stats endpoints, kept current by triggers.
+# table -> (columns whose updates can move a row between counters,
+#           [(counter key expression, row weight expression)])
+# Expressions use {row} for the NEW/OLD row.
+CONTENT_COUNTERS = {
+    "questions": (("subject", "is_approved"), [
+        ("'questions'", "(IFNULL({row}.is_approved, 0) != 0)"),
+        ("'questions/subject/' || {row}.subject", "(IFNULL({row}.is_approved, 0) != 0)"),
+    ]),
+    "flashcards": (("subject", "card_type", "is_approved"), [
+        ("'flashcards'", "(IFNULL({row}.is_approved, 0) != 0)"),
+        ("'flashcards/subject/' || {row}.subject", "(IFNULL({row}.is_approved, 0) != 0)"),
+        ("'flashcards/type/' || {row}.card_type", "(IFNULL({row}.is_approved, 0) != 0)"),
+    ]),
+}
+
+USER_COUNTERS = {
+    "users": ((), [("'users'", "1")]),
+    "email_leads": ((), [("'email_leads'", "1")]),
+    "reported_questions": (("reviewed",), [("'reports/pending'", "(IFNULL({row}.reviewed, 0) = 0)")]),
+    "user_feedback": (("reviewed",), [("'feedback/pending'", "(IFNULL({row}.reviewed, 0) = 0)")]),
+}
+
+STATS_COUNTERS_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS stats_counters (
+        key TEXT PRIMARY KEY,
+        value INTEGER NOT NULL DEFAULT 0
+    ) WITHOUT ROWID;
+"""
+
+
+def _counter_upserts(counters: List[tuple], row: str, sign: str) -> str:
+    return "".join(
+        f"""
+            INSERT INTO stats_counters (key, value) VALUES ({key.format(row=row)}, {sign}{weight.format(row=row)})
+            ON CONFLICT(key) DO UPDATE SET value = value + excluded.value;"""
+        for key, weight in counters
+    )
+
+
+def _install_counters(conn: sqlite3.Connection, spec: Dict[str, tuple]) -> bool:
+    """
+    Create the counter table and triggers. If any trigger was missing the
+    counters can't be trusted, so they are recomputed from the tables.
+    Returns True if anything was created.
+    """
+    conn.executescript(STATS_COUNTERS_SCHEMA)
+    existing = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'trigger'")}
+
+    created = False
+    for table, (columns, counters) in spec.items():
+        triggers = {
+            f"{table}_counters_insert": f"AFTER INSERT ON {table} BEGIN{_counter_upserts(counters, 'NEW', '')}\n    END",
+            f"{table}_counters_delete": f"AFTER DELETE ON {table} BEGIN{_counter_upserts(counters, 'OLD', '-')}\n    END",
+        }
+        if columns:
+            triggers[f"{table}_counters_update"] = (
+                f"AFTER UPDATE OF {', '.join(columns)} ON {table} BEGIN"
+                f"{_counter_upserts(counters, 'OLD', '-')}{_counter_upserts(counters, 'NEW', '')}\n    END"
+            )
+        for name, body in triggers.items():
+            if name not in existing:
+                conn.execute(f"CREATE TRIGGER {name} {body}")
+                created = True
+
+    if created:
+        conn.execute("DELETE FROM stats_counters")
+        for table, (_, counters) in spec.items():
+            for key, weight in counters:
+                conn.execute(
+                    f"""INSERT INTO stats_counters (key, value)
+                        SELECT {key.format(row=table)}, SUM({weight.format(row=table)})
+                        FROM {table} GROUP BY 1"""
+                )
+    return created
+
+
+def get_stats_counters() -> Dict[str, int]:
+    """Every materialized counter (content and user state) from one read."""
+    with get_db() as conn:
+        rows = conn.execute(
+            """SELECT key, value FROM content.stats_counters
+               UNION ALL
+               SELECT key, value FROM main.stats_counters"""
+        ).fetchall()
+        return {row["key"]: row["value"] for row in rows}
+
+
+def _schema_version(*parts: str) -> int:
+    """Fingerprint of the schema definitions, stored in PRAGMA user_version."""
+    return zlib.crc32("\n".join(parts).encode()) & 0x7FFFFFFF
+
+
+# Any edit to a schema or counter spec changes the fingerprint and re-runs init
+CONTENT_SCHEMA_VERSION = _schema_version(
+    CONTENT_SCHEMA, CONTENT_SEARCH_SCHEMA, STATS_COUNTERS_SCHEMA, repr(CONTENT_COUNTERS)
+)
+USER_SCHEMA_VERSION = _schema_version(USER_SCHEMA, STATS_COUNTERS_SCHEMA, repr(USER_COUNTERS))
+
+
+def _init_content_schema(path: Path) -> bool:
+    """
+    Create missing content tables, indexes and counters, unless the file's
+    user_version says it is already current. Returns True if the file changed.
+    """
+    conn = sqlite3.connect(str(path))
     try:
-        yield conn
+        if conn.execute("PRAGMA user_version").fetchone()[0] == CONTENT_SCHEMA_VERSION:
+            return False
+        conn.execute("PRAGMA journal_mode=DELETE")
+        conn.executescript(CONTENT_SCHEMA)
+        existing = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        conn.executescript(CONTENT_SEARCH_SCHEMA)
+        for fts in FTS_TABLES:
+            if fts not in existing:
+                # Index rows that predate the search tables
+                conn.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+        _install_counters(conn, CONTENT_COUNTERS)
+        conn.execute(f"PRAGMA user_version={CONTENT_SCHEMA_VERSION}")
         conn.commit()
-        _mark_modified()
-        # Sync to Cloud Storage after successful write
-        _upload_db_to_gcs()
-    except Exception:
-        conn.rollback()
-        raise
+        return True
     finally:
         conn.close()
 
 
 def init_db():
-    """Initialize database schema."""
+    """Initialize both database schemas (each skipped while its user_version is current)."""
+    # Content first: user connections attach it, so the file must exist
+    if _init_content_schema(CONTENT_DB_PATH):
+        _content_syncer.mark_dirty()
+        # Connections opened before the schema change would not see it (immutable)
+        _content_pool.reset()
+        _pool.reset()
+
     with get_db() as conn:
-        conn.executescript("""
-            -- Pre-generated question bank
-            CREATE TABLE IF NOT EXISTS questions (
-                id TEXT PRIMARY KEY,
-                subject TEXT NOT NULL,
-                question TEXT NOT NULL,
-                options TEXT NOT NULL,
-                correct_answer TEXT NOT NULL,
-                explanation TEXT NOT NULL,
-                image_path TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                quality_score REAL DEFAULT 1.0,
-                reported_count INTEGER DEFAULT 0,
-                is_approved BOOLEAN DEFAULT TRUE
-            );
-
-            -- User accounts
-            CREATE TABLE IF NOT EXISTS users (
-                id TEXT PRIMARY KEY,
-                email TEXT UNIQUE NOT NULL,
-                password_hash TEXT NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            );
-
-            -- User study deck
-            CREATE TABLE IF NOT EXISTS study_deck (
-                id TEXT PRIMARY KEY,
-                user_id TEXT NOT NULL,
-                question_id TEXT NOT NULL,
-                added_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (user_id) REFERENCES users(id),
-                FOREIGN KEY (question_id) REFERENCES questions(id)
-            );
-
-            -- Question reports
-            CREATE TABLE IF NOT EXISTS reported_questions (
-                id TEXT PRIMARY KEY,
-                question_id TEXT NOT NULL,
-                user_id TEXT,
-                reason TEXT,
-                reported_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                reviewed BOOLEAN DEFAULT FALSE,
-                FOREIGN KEY (question_id) REFERENCES questions(id)
-            );
-
-            -- User feedback (general ideas/suggestions)
-            CREATE TABLE IF NOT EXISTS user_feedback (
-                id TEXT PRIMARY KEY,
-                study_mode TEXT NOT NULL,
-                message TEXT NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                reviewed BOOLEAN DEFAULT FALSE
-            );
-
-            -- Email leads (pre-registration email capture)
-            CREATE TABLE IF NOT EXISTS email_leads (
-                id TEXT PRIMARY KEY,
-                email TEXT UNIQUE NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                converted BOOLEAN DEFAULT FALSE
-            );
-
-            -- Pre-generated flashcard bank
-            CREATE TABLE IF NOT EXISTS flashcards (
-                id TEXT PRIMARY KEY,
-                subject TEXT NOT NULL,
-                card_type TEXT NOT NULL,
-                front_content TEXT NOT NULL,
-                back_content TEXT NOT NULL,
-                hint TEXT,
-                source TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                reported_count INTEGER DEFAULT 0,
-                is_approved BOOLEAN DEFAULT TRUE
-            );
-
-            -- User flashcard study deck
-            CREATE TABLE IF NOT EXISTS flashcard_study_deck (
-                id TEXT PRIMARY KEY,
-                user_id TEXT NOT NULL,
-                flashcard_id TEXT NOT NULL,
-                added_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (user_id) REFERENCES users(id),
-                FOREIGN KEY (flashcard_id) REFERENCES flashcards(id)
-            );
-
-            -- Persistent sessions (survives Cloud Run restarts)
-            CREATE TABLE IF NOT EXISTS sessions (
-                token TEXT PRIMARY KEY,
-                user_id TEXT NOT NULL,
-                email TEXT NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                expires_at TIMESTAMP NOT NULL,
-                FOREIGN KEY (user_id) REFERENCES users(id)
-            );
-
-            -- Indexes
-            CREATE INDEX IF NOT EXISTS idx_sessions_user ON sessions(user_id);
-            CREATE INDEX IF NOT EXISTS idx_sessions_expires ON sessions(expires_at);
-            CREATE INDEX IF NOT EXISTS idx_questions_subject ON questions(subject);
-            CREATE INDEX IF NOT EXISTS idx_questions_approved ON questions(is_approved);
-            CREATE INDEX IF NOT EXISTS idx_study_deck_user ON study_deck(user_id);
-            CREATE INDEX IF NOT EXISTS idx_reports_reviewed ON reported_questions(reviewed);
-            CREATE INDEX IF NOT EXISTS idx_feedback_reviewed ON user_feedback(reviewed);
-            CREATE INDEX IF NOT EXISTS idx_flashcards_subject ON flashcards(subject);
-            CREATE INDEX IF NOT EXISTS idx_flashcards_type ON flashcards(card_type);
-            CREATE INDEX IF NOT EXISTS idx_flashcards_approved ON flashcards(is_approved);
-            CREATE INDEX IF NOT EXISTS idx_flashcard_study_deck_user ON flashcard_study_deck(user_id);
-        """)
+        if conn.execute("PRAGMA main.auto_vacuum").fetchone()[0] != 2:
+            # Incremental auto-vacuum lets the maintenance job shrink the file;
+            # an existing file only switches modes on a full VACUUM (once)
+            conn.execute("PRAGMA main.auto_vacuum=INCREMENTAL")
+            conn.execute("VACUUM main")
+            _user_syncer.mark_dirty()
+        if conn.execute("PRAGMA main.user_version").fetchone()[0] != USER_SCHEMA_VERSION:
+            conn.executescript(USER_SCHEMA)
+            _install_counters(conn, USER_COUNTERS)
+            conn.execute(f"PRAGMA main.user_version={USER_SCHEMA_VERSION}")
+
+
+# =============================================================================
+# RANDOM SAMPLING
+# =============================================================================
+
+# Rowid probes cost roughly this many times more than reading one index entry.
+# Used to decide between probing and reading every matching rowid.
+PROBE_COST_RATIO = 16
+
+# Match counts only steer the strategy, so they can be slightly stale.
+# Counting is the one step that scales with the table, so it is cached.
+SAMPLE_COUNTS_TTL_SECONDS = 60
+_match_counts: Dict[tuple, tuple] = {}
+
+
+def _invalidate_sample_counts():
+    """Forget cached match counts after the content tables change."""
+    _match_counts.clear()
+
+
+def _build_filter(filters: List[tuple]) -> tuple:
+    """Turn [(column, allowed_values or None), ...] into a WHERE clause and params."""
+    clauses = []
+    params: List[Any] = []
+    for column, values in filters:
+        if values is not None:
+            clauses.append(f"{column} IN ({','.join('?' * len(values))})")
+            params.extend(values)
+    return " AND ".join(clauses) or "1", tuple(params)
+
+
+def _sample_rowids(
+    conn: sqlite3.Connection,
+    table: str,
+    filters: List[tuple],
+    count: int
+) -> List[int]:
+    """
+    Draw up to `count` distinct random rowids matching `filters`, uniformly,
+    without ORDER BY RANDOM().
+
+    Picks random rowids between MIN(rowid) and MAX(rowid) and keeps the ones
+    that exist and match (rejection sampling), so each probe is a primary-key
+    lookup and the cost scales with `count`, not the table size. When matches
+    are sparse relative to the rowid span, reading the matching rowids from
+    the covering index and sampling in Python is cheaper, so that is used
+    instead. Returns every match (shuffled) if there are no more than `count`.
+    """
+    if count <= 0:
+        return []
+
+    where, params = _build_filter(filters)
+    cache_key = (table, where, params)
+    cached = _match_counts.get(cache_key)
+    if cached and cached[0] > time.monotonic():
+        total = cached[1]
+    else:
+        total = conn.execute(f"SELECT COUNT(*) FROM {table} WHERE {where}", params).fetchone()[0]
+        _match_counts[cache_key] = (time.monotonic() + SAMPLE_COUNTS_TTL_SECONDS, total)
+    if total == 0:
+        return []
+
+    # Separate subqueries so SQLite answers each from the end of the rowid b-tree
+    low, high = conn.execute(
+        f"SELECT (SELECT MIN(rowid) FROM {table}), (SELECT MAX(rowid) FROM {table})"
+    ).fetchone()
+    expected_probes = count * (high - low + 1) / total
+
+    if total <= count or expected_probes * PROBE_COST_RATIO > total:
+        rowids = [row[0] for row in conn.execute(f"SELECT rowid FROM {table} WHERE {where}", params)]
+        return random.sample(rowids, min(count, len(rowids)))
+
+    probe_sql = f"SELECT 1 FROM {table} WHERE rowid = ? AND {where}"
+    picked: Dict[int, None] = {}
+    attempts = int(expected_probes * 4) + 32
+    while len(picked) < count and attempts > 0:
+        attempts -= 1
+        rowid = random.randint(low, high)
+        if rowid not in picked and conn.execute(probe_sql, (rowid, *params)).fetchone():
+            picked[rowid] = None
+
+    if len(picked) < count:
+        # Stale count or an unlucky run - finish from the full match list
+        rest = [
+            row[0] for row in conn.execute(f"SELECT rowid FROM {table} WHERE {where}", params)
+            if row[0] not in picked
+        ]
+        picked.update(dict.fromkeys(random.sample(rest, min(count - len(picked), len(rest)))))
+    return list(picked)
+
+
+def _fetch_in_order(conn: sqlite3.Connection, sql: str, key: str, keys: List[Any]) -> List[sqlite3.Row]:
+    """Run `sql` (which must filter on `{key} IN ({keys})`) and return rows in `keys` order."""
+    if not keys:
+        return []
+    rows = conn.execute(sql.format(keys=",".join("?" * len(keys))), tuple(keys)).fetchall()
+    by_key = {row[key]: row for row in rows}
+    return [by_key[k] for k in keys if k in by_key]
+
+
+# =============================================================================
+# BULK WRITES
+# =============================================================================
+
+# executemany batch size for bulk content writes (all chunks share one transaction)
+BULK_CHUNK_SIZE = int(os.environ.get("DB_BULK_CHUNK_SIZE", "1000"))
+
+# Columns bulk updates may set
+QUESTION_COLUMNS = (
+    "subject", "question", "options", "correct_answer", "explanation",
+    "image_path", "quality_score", "is_approved",
+)
+FLASHCARD_COLUMNS = (
+    "subject", "card_type", "front_content", "back_content", "hint", "source", "is_approved",
+)
+
+
+def _chunks(items: List[Any], size: int) -> Iterator[List[Any]]:
+    size = max(size, 1)
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _bulk_update(
+    conn: sqlite3.Connection,
+    table: str,
+    columns: tuple,
+    updates: List[Dict[str, Any]],
+    chunk_size: int
+) -> int:
+    """Apply per-row updates, one executemany per distinct set of columns."""
+    groups: Dict[tuple, List[Dict[str, Any]]] = {}
+    for update in updates:
+        fields = tuple(sorted(key for key in update if key != "id"))
+        unknown = set(fields) - set(columns)
+        if unknown:
+            raise ValueError(f"Cannot bulk update {table} columns: {', '.join(sorted(unknown))}")
+        if fields:
+            groups.setdefault(fields, []).append(update)
+
+    updated = 0
+    for fields, rows in groups.items():
+        sql = f"UPDATE {table} SET {', '.join(f'{field} = ?' for field in fields)} WHERE id = ?"
+        params = [
+            tuple(json.dumps(row[f]) if f == "options" else row[f] for f in fields) + (row["id"],)
+            for row in rows
+        ]
+        for chunk in _chunks(params, chunk_size):
+            updated += conn.executemany(sql, chunk).rowcount
+    return updated
 
 
 # =============================================================================
@@ -237,15 +1198,74 @@ def add_question(
     image_path: Optional[str] = None
 ) -> str:
     """Add a question to the bank. Returns the question ID."""
-    question_id = str(uuid.uuid4())
-    with get_db() as conn:
-        conn.execute(
+    return add_questions_bulk([{
+        "subject": subject,
+        "question": question,
+        "options": options,
+        "correct_answer": correct_answer,
+        "explanation": explanation,
+        "quality_score": quality_score,
+        "is_approved": is_approved,
+        "image_path": image_path,
+    }])[0]
+
+
+def add_questions_bulk(questions: List[Dict[str, Any]], chunk_size: int = BULK_CHUNK_SIZE) -> List[str]:
+    """
+    Add many questions in one transaction.
+
+    Args:
+        questions: Dicts with add_question's arguments (defaults apply)
+        chunk_size: Rows per executemany call
+
+    Returns:
+        The new question IDs, in input order
+    """
+    ids = [str(uuid.uuid4()) for _ in questions]
+    with get_content_db_write() as conn:
+        _insert_questions(conn, ids, questions, chunk_size)
+    return ids
+
+
+def update_questions_bulk(updates: List[Dict[str, Any]], chunk_size: int = BULK_CHUNK_SIZE) -> int:
+    """
+    Update many questions in one transaction.
+
+    Args:
+        updates: Dicts with an "id" plus the columns to set
+        chunk_size: Rows per executemany call
+
+    Returns:
+        Number of rows updated
+    """
+    with get_content_db_write() as conn:
+        return _bulk_update(conn, "questions", QUESTION_COLUMNS, updates, chunk_size)
+
+
+def replace_questions(subjects: List[str], questions: List[Dict[str, Any]], chunk_size: int = BULK_CHUNK_SIZE) -> List[str]:
+    """Delete every question in `subjects` and insert `questions`, atomically. Returns the new IDs."""
+    ids = [str(uuid.uuid4()) for _ in questions]
+    with get_content_db_write() as conn:
+        conn.execute(f"DELETE FROM questions WHERE subject IN ({','.join('?' * len(subjects))})", tuple(subjects))
+        _insert_questions(conn, ids, questions, chunk_size)
+    return ids
+
+
+def _insert_questions(conn: sqlite3.Connection, ids: List[str], questions: List[Dict[str, Any]], chunk_size: int):
+    rows = [
+        (
+            question_id, q["subject"], q["question"], json.dumps(q["options"]), q["correct_answer"],
+            q["explanation"], q.get("quality_score", 1.0), q.get("is_approved", True), q.get("image_path")
+        )
+        for question_id, q in zip(ids, questions)
+    ]
+    for chunk in _chunks(rows, chunk_size):
+        conn.executemany(
             """INSERT INTO questions 
                (id, subject, question, options, correct_answer, explanation, quality_score, is_approved, image_path)
                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-            (question_id, subject, question, json.dumps(options), correct_answer, explanation, quality_score, is_approved, image_path)
+            chunk
         )
-    return question_id
 
 
 def get_random_questions(
@@ -254,19 +1274,45 @@ def get_random_questions(
     approved_only: bool = True
 ) -> List[Dict[str, Any]]:
     """Get random questions from the bank."""
-    with get_db() as conn:
-        placeholders = ",".join("?" * len(subjects))
-        approved_clause = "AND is_approved = TRUE" if approved_only else ""
+    if not subjects:
+        return []
+    with get_content_db() as conn:
+        rowids = _sample_rowids(
+            conn,
+            "questions",
+            [("subject", subjects), ("is_approved", [True] if approved_only else None)],
+            count
+        )
+        rows = _fetch_in_order(
+            conn,
+            """SELECT rowid, id, subject, question, options, correct_answer, explanation, image_path
+               FROM questions WHERE rowid IN ({keys})""",
+            "rowid",
+            rowids
+        )
         
+        return [
+            {
+                "id": row["id"],
+                "subject": row["subject"],
+                "question": row["question"],
+                "options": json.loads(row["options"]),
+                "correct_answer": row["correct_answer"],
+                "explanation": row["explanation"],
+                "image_path": row["image_path"]
+            }
+            for row in rows
+        ]
+
+
+def get_all_questions(approved_only: bool = True) -> List[Dict[str, Any]]:
+    """Every question in the bank in insertion order, options decoded (used to build content_bank)."""
+    with get_content_db() as conn:
         rows = conn.execute(
-            f"""SELECT id, subject, question, options, correct_answer, explanation
-                FROM questions
-                WHERE subject IN ({placeholders}) {approved_clause}
-                ORDER BY RANDOM()
-                LIMIT ?""",
-            (*subjects, count)
+            f"""SELECT id, subject, question, options, correct_answer, explanation, image_path
+                FROM questions {"WHERE is_approved = TRUE" if approved_only else ""}
+                ORDER BY rowid"""
         ).fetchall()
-        
         return [
             {
                 "id": row["id"],
@@ -274,7 +1320,8 @@ def get_random_questions(
                 "question": row["question"],
                 "options": json.loads(row["options"]),
                 "correct_answer": row["correct_answer"],
-                "explanation": row["explanation"]
+                "explanation": row["explanation"],
+                "image_path": row["image_path"]
             }
             for row in rows
         ]
@@ -282,7 +1329,7 @@ def get_random_questions(
 
 def get_question_count(subject: Optional[str] = None) -> int:
     """Get count of questions, optionally filtered by subject."""
-    with get_db() as conn:
+    with get_content_db() as conn:
         if subject:
             row = conn.execute(
                 "SELECT COUNT(*) as cnt FROM questions WHERE subject = ? AND is_approved = TRUE",
@@ -297,87 +1344,149 @@ def get_question_count(subject: Optional[str] = None) -> int:
 
 def increment_report_count(question_id: str):
     """Increment the reported_count for a question."""
-    with get_db() as conn:
+    with get_content_db_write() as conn:
         conn.execute(
             "UPDATE questions SET reported_count = reported_count + 1 WHERE id = ?",
             (question_id,)
         )
 
 
-def find_matching_mechanical_image(query: str) -> Optional[str]:
-    """
-    Find a mechanical aptitude image that matches the user's query.
-    Uses CURATED HERO IMAGES for teaching common concepts.
-    Falls back to searching question content for keyword matches.
-    Returns image_path if found, None otherwise.
-    """
-    # CURATED HERO IMAGES - clean teaching diagrams generated with Imagen
-    # These illustrate concepts clearly with labels, not confusing quiz diagrams
-    HERO_IMAGES = {
-        # Lever concepts -> crowbar lifting rock with LOAD/EFFORT/FULCRUM labels
-        "lever": "/assets/teaching/lever.png",
-        "crowbar": "/assets/teaching/lever.png",
-        "halligan": "/assets/teaching/lever.png",
-        "fulcrum": "/assets/teaching/lever.png",
-        "pry": "/assets/teaching/lever.png",
-        "wheelbarrow": "/assets/teaching/lever.png",  # Also a lever (class 2)
-        # Pulley concepts -> single pulley with EFFORT/LOAD/GRAVITY labels
-        "pulley": "/assets/teaching/pulley.png",
-        "block and tackle": "/assets/teaching/pulley.png",
-        "hoist": "/assets/teaching/pulley.png",
-        "rope": "/assets/teaching/pulley.png",
-        # Gear concepts -> two meshing gears with DRIVER/DRIVEN labels
-        "gear": "/assets/teaching/gears.png",
-        "gears": "/assets/teaching/gears.png",
-        "teeth": "/assets/teaching/gears.png",
-        "bicycle": "/assets/teaching/gears.png",
-    }
-    
-    query_lower = query.lower()
-    
-    # First, check for exact hero image matches (prioritize teaching images)
-    for keyword, image_path in HERO_IMAGES.items():
-        if keyword in query_lower:
-            return image_path
-    
-    # Fallback: search question bank for relevant images
-    CONCEPT_KEYWORDS = {
-        "pulley": ["pulley", "block and tackle", "rope", "lift", "hoist"],
-        "lever": ["lever", "crowbar", "pry", "fulcrum", "halligan"],
-        "gear": ["gear", "teeth", "rotation", "clockwise", "counter-clockwise", "mesh"],
-        "wheel": ["wheelbarrow", "wheel", "axle"],
-        "incline": ["ramp", "incline", "slope", "wedge"],
-        "screw": ["screw", "thread", "jack"],
-        "force": ["force", "effort", "load", "mechanical advantage", "ma"],
-    }
-    
-    matched_concepts = []
-    for concept, keywords in CONCEPT_KEYWORDS.items():
-        if any(kw in query_lower for kw in keywords):
-            matched_concepts.extend(keywords)
-    
-    if not matched_concepts:
+def get_mechanical_images_by_concept(concepts: Dict[str, List[str]]) -> Dict[str, List[str]]:
+    """
+    Diagram paths of mechanical aptitude questions per concept, via the FTS index.
+
+    Args:
+        concepts: concept -> keywords; a question matches a concept if any
+            keyword appears in its text as a word or phrase
+
+    Returns:
+        concept -> distinct image paths (concepts without diagrams are omitted)
+    """
+    images: Dict[str, List[str]] = {}
+    with get_content_db() as conn:
+        for concept, keywords in concepts.items():
+            match = "question : (" + " OR ".join(f'"{kw}"' for kw in keywords) + ")"
+            rows = conn.execute(
+                """SELECT DISTINCT q.image_path FROM questions_fts
+                   JOIN questions q ON q.rowid = questions_fts.rowid
+                   WHERE questions_fts MATCH ?
+                   AND q.subject = 'mechanical-aptitude'
+                   AND q.image_path IS NOT NULL
+                   AND q.is_approved = TRUE""",
+                (match,)
+            ).fetchall()
+            if rows:
+                images[concept] = [row["image_path"] for row in rows]
+    return images
+
+
+# =============================================================================
+# FULL-TEXT SEARCH
+# =============================================================================
+
+# Words beyond this are ignored (bounds the cost of pasted paragraphs)
+SEARCH_MAX_TERMS = 16
+
+# BM25 column weights: a hit in the question/front outranks one in the explanation
+QUESTION_SEARCH_WEIGHTS = (10.0, 2.0, 1.0)   # question, options, explanation
+FLASHCARD_SEARCH_WEIGHTS = (10.0, 4.0, 1.0)  # front_content, back_content, hint
+
+_SEARCH_WORD = re.compile(r"\w+")
+
+
+def fts_query(text: str, prefix: bool = True) -> Optional[str]:
+    """
+    Turn free text into a safe FTS5 query: every word must match, and with
+    `prefix` the last one may be incomplete (search-as-you-type).
+    Returns None if the text has no searchable words.
+    """
+    words = _SEARCH_WORD.findall(text.lower())[:SEARCH_MAX_TERMS]
+    if not words:
         return None
-    
-    with get_db() as conn:
-        conditions = " OR ".join(["question LIKE ?" for _ in matched_concepts])
-        params = [f"%{kw}%" for kw in matched_concepts]
-        
-        row = conn.execute(
-            f"""SELECT image_path FROM questions 
-                WHERE subject = 'mechanical-aptitude' 
-                AND image_path IS NOT NULL 
-                AND ({conditions})
-                ORDER BY RANDOM()
-                LIMIT 1""",
-            tuple(params)
-        ).fetchone()
-        
-        if row and row["image_path"]:
-            return row["image_path"]
-    
-    return None
+    # Quoting turns FTS5 operators (AND, NEAR, column:) typed by users into plain words
+    terms = [f'"{word}"' for word in words]
+    if prefix:
+        terms[-1] += "*"
+    return " ".join(terms)
+
+
+def _search(
+    fts: str,
+    columns: str,
+    weights: tuple,
+    query: str,
+    subjects: Optional[List[str]],
+    limit: int,
+    prefix: bool
+) -> List[sqlite3.Row]:
+    match = fts_query(query, prefix)
+    if match is None:
+        return []
+    table = FTS_TABLES[fts][0]
+    sql = f"""SELECT {columns}, bm25({fts}, {', '.join(map(str, weights))}) AS score
+              FROM {fts} JOIN {table} t ON t.rowid = {fts}.rowid
+              WHERE {fts} MATCH ? AND t.is_approved = TRUE"""
+    params: List[Any] = [match]
+    if subjects:
+        sql += f" AND t.subject IN ({','.join('?' * len(subjects))})"
+        params.extend(subjects)
+    sql += " ORDER BY score LIMIT ?"
+    params.append(max(limit, 0))
+    with get_content_db() as conn:
+        return conn.execute(sql, tuple(params)).fetchall()
+
+
+def search_questions(
+    query: str,
+    subjects: Optional[List[str]] = None,
+    limit: int = 20,
+    prefix: bool = True
+) -> List[Dict[str, Any]]:
+    """
+    Search approved questions by text, best matches first (BM25).
+
+    Args:
+        query: Free text; every word must appear (stemmed)
+        subjects: Only return questions in these subjects
+        limit: Maximum results
+        prefix: Treat the last word as a prefix ("hal" matches "halligan")
 
+    Returns:
+        Question dicts with a "score" (lower is better)
+    """
+    rows = _search(
+        "questions_fts",
+        "t.id, t.subject, t.question, t.options, t.correct_answer, t.explanation, t.image_path",
+        QUESTION_SEARCH_WEIGHTS, query, subjects, limit, prefix
+    )
+    return [
+        {
+            "id": row["id"],
+            "subject": row["subject"],
+            "question": row["question"],
+            "options": json.loads(row["options"]),
+            "correct_answer": row["correct_answer"],
+            "explanation": row["explanation"],
+            "image_path": row["image_path"],
+            "score": round(row["score"], 4)
+        }
+        for row in rows
+    ]
+
+
+def search_flashcards(
+    query: str,
+    subjects: Optional[List[str]] = None,
+    limit: int = 20,
+    prefix: bool = True
+) -> List[Dict[str, Any]]:
+    """Search approved flashcards by text, best matches first (see search_questions)."""
+    rows = _search(
+        "flashcards_fts",
+        "t.id, t.subject, t.card_type, t.front_content, t.back_content, t.hint, t.source",
+        FLASHCARD_SEARCH_WEIGHTS, query, subjects, limit, prefix
+    )
+    return [dict(row, score=round(row["score"], 4)) for row in rows]
 
 
 # =============================================================================
@@ -387,12 +1496,14 @@ def find_matching_mechanical_image(query: str) -> Optional[str]:
 def create_user(email: str, password_hash: str) -> str:
     """Create a new user. Returns user ID."""
     user_id = str(uuid.uuid4())
-    with get_db_write() as conn:
+
+    def insert(conn):
         conn.execute(
             "INSERT INTO users (id, email, password_hash) VALUES (?, ?, ?)",
             (user_id, email, password_hash)
         )
-    return user_id
+        return user_id
+    return _write(insert)
 
 
 def get_user_by_email(email: str) -> Optional[Dict[str, Any]]:
@@ -443,13 +1554,14 @@ def get_users_count() -> int:
 
 def create_session(token: str, user_id: str, email: str, expires_at: datetime) -> bool:
     """Create a persistent session. Returns True on success."""
-    with get_db_write() as conn:
+    def insert(conn):
         conn.execute(
             """INSERT OR REPLACE INTO sessions (token, user_id, email, expires_at)
                VALUES (?, ?, ?, ?)""",
             (token, user_id, email, expires_at.isoformat())
         )
-    return True
+        return True
+    return _write(insert)
 
 
 def get_session(token: str) -> Optional[Dict[str, Any]]:
@@ -464,11 +1576,9 @@ def get_session(token: str) -> Optional[Dict[str, Any]]:
         if not row:
             return None
         
-        # Check expiry
+        # Expired rows are left for the maintenance scheduler (cleanup_expired_sessions)
         expires_at = datetime.fromisoformat(row["expires_at"])
         if datetime.now() > expires_at:
-            # Session expired, clean it up
-            delete_session(token)
             return None
         
         return dict(row)
@@ -476,32 +1586,139 @@ def get_session(token: str) -> Optional[Dict[str, Any]]:
 
 def delete_session(token: str) -> bool:
     """Delete a session (logout). Returns True if deleted."""
-    with get_db_write() as conn:
+    def delete(conn):
         cursor = conn.execute(
             "DELETE FROM sessions WHERE token = ?",
             (token,)
         )
         return cursor.rowcount > 0
+    return _write(delete)
 
 
 def delete_user_sessions(user_id: str) -> int:
     """Delete all sessions for a user. Returns count of deleted sessions."""
-    with get_db_write() as conn:
+    def delete(conn):
         cursor = conn.execute(
             "DELETE FROM sessions WHERE user_id = ?",
             (user_id,)
         )
         return cursor.rowcount
+    return _write(delete)
 
 
-def cleanup_expired_sessions() -> int:
-    """Clean up expired sessions. Returns count of deleted sessions."""
-    with get_db_write() as conn:
-        cursor = conn.execute(
-            "DELETE FROM sessions WHERE expires_at < ?",
-            (datetime.now().isoformat(),)
+def cleanup_expired_sessions(batch_size: int = MAINTENANCE_DELETE_BATCH) -> int:
+    """Delete expired sessions in batches. Returns count of deleted sessions."""
+    return _delete_expired("sessions", datetime.now().isoformat(), batch_size)
+
+
+# =============================================================================
+# TOKEN REVOCATION CRUD (Signed session tokens)
+# =============================================================================
+
+def revoke_token(key: str, expires_at: float) -> bool:
+    """Record a revocation until `expires_at` (epoch seconds). Returns True on success."""
+    def insert(conn):
+        conn.execute(
+            "INSERT OR REPLACE INTO revoked_tokens (key, revoked_at, expires_at) VALUES (?, ?, ?)",
+            (key, time.time(), expires_at)
         )
-        return cursor.rowcount
+        return True
+    return _write(insert)
+
+
+def is_token_revoked(key: str) -> bool:
+    """Check the revocation table for a key."""
+    with get_db() as conn:
+        row = conn.execute("SELECT 1 FROM revoked_tokens WHERE key = ?", (key,)).fetchone()
+        return row is not None
+
+
+def get_active_revocations() -> Dict[str, float]:
+    """Map every unexpired revocation key to its revoked_at time."""
+    with get_db() as conn:
+        rows = conn.execute(
+            "SELECT key, revoked_at FROM revoked_tokens WHERE expires_at > ?",
+            (time.time(),)
+        ).fetchall()
+        return {row["key"]: row["revoked_at"] for row in rows}
+
+
+def cleanup_expired_revocations(batch_size: int = MAINTENANCE_DELETE_BATCH) -> int:
+    """Drop revocations for tokens that have expired anyway. Returns count deleted."""
+    return _delete_expired("revoked_tokens", time.time(), batch_size)
+
+
+# =============================================================================
+# MAINTENANCE (scheduled by app.maintenance, never on the request path)
+# =============================================================================
+
+def _delete_expired(table: str, now: Any, batch_size: int) -> int:
+    """
+    Delete rows with expires_at < now, one write batch at a time.
+
+    Each batch is its own group-commit operation, so request writes queued
+    behind it wait for one batch, not the whole purge. Nothing is written
+    (and nothing uploaded) when there is nothing to delete.
+    """
+    deleted = 0
+    while True:
+        with get_db() as conn:
+            if conn.execute(f"SELECT 1 FROM {table} WHERE expires_at < ? LIMIT 1", (now,)).fetchone() is None:
+                return deleted
+
+        def delete(conn):
+            return conn.execute(
+                f"""DELETE FROM {table} WHERE rowid IN
+                    (SELECT rowid FROM {table} WHERE expires_at < ? LIMIT ?)""",
+                (now, batch_size)
+            ).rowcount
+        count = _write(delete)
+        deleted += count
+        if count < batch_size:
+            return deleted
+
+
+def optimize_db() -> Dict[str, Any]:
+    """
+    Refresh query planner statistics for user.db.
+
+    The first run does a full ANALYZE (bounded by analysis_limit); later runs
+    use PRAGMA optimize, which only re-analyzes tables that changed enough.
+    """
+    def optimize(conn):
+        conn.execute(f"PRAGMA analysis_limit={DB_ANALYSIS_LIMIT}")
+        analyzed = conn.execute(
+            "SELECT 1 FROM main.sqlite_master WHERE name = 'sqlite_stat1'"
+        ).fetchone() is not None
+        conn.execute("PRAGMA main.optimize" if analyzed else "ANALYZE main")
+        return {"mode": "optimize" if analyzed else "analyze"}
+    return _write(optimize)
+
+
+def incremental_vacuum(max_pages: int = DB_VACUUM_MAX_PAGES) -> int:
+    """
+    Return up to `max_pages` free pages of user.db to the filesystem, keeping
+    the file (and each upload) small. Returns the number of pages freed.
+    """
+    with get_db() as conn:
+        free_pages = conn.execute("PRAGMA main.freelist_count").fetchone()[0]
+    if free_pages == 0:
+        return 0
+
+    def vacuum(conn):
+        conn.execute(f"PRAGMA main.incremental_vacuum({max_pages})").fetchall()
+        return free_pages - conn.execute("PRAGMA main.freelist_count").fetchone()[0]
+    return _write(vacuum)
+
+
+def checkpoint_wal() -> Dict[str, int]:
+    """
+    Copy committed WAL frames back into user.db (PASSIVE: never waits for
+    readers or the writer), so the WAL stays short between auto-checkpoints.
+    """
+    with get_db() as conn:
+        busy, log_frames, checkpointed = conn.execute("PRAGMA main.wal_checkpoint(PASSIVE)").fetchone()
+    return {"busy": busy, "log_frames": log_frames, "checkpointed": checkpointed}
 
 
 # =============================================================================
@@ -509,33 +1726,94 @@ def cleanup_expired_sessions() -> int:
 # =============================================================================
 
 
-def add_to_study_deck(user_id: str, question_id: str) -> str:
-    """Add question to user's study deck. Returns deck entry ID."""
+# Most adds + removes accepted in one batch call
+DECK_BATCH_MAX = 500
+
+# table -> item column
+DECK_TABLES = {
+    "study_deck": "question_id",
+    "flashcard_study_deck": "flashcard_id",
+}
+
+
+def _add_to_deck(table: str, user_id: str, item_id: str):
+    """Idempotent add (the unique index settles concurrent adds). Returns the entry ID."""
+    column = DECK_TABLES[table]
     entry_id = str(uuid.uuid4())
-    with get_db() as conn:
-        # Check if already in deck
-        existing = conn.execute(
-            "SELECT id FROM study_deck WHERE user_id = ? AND question_id = ?",
-            (user_id, question_id)
-        ).fetchone()
-        if existing:
-            return existing["id"]
-        
-        conn.execute(
-            "INSERT INTO study_deck (id, user_id, question_id) VALUES (?, ?, ?)",
-            (entry_id, user_id, question_id)
+
+    def insert(conn):
+        cursor = conn.execute(
+            f"""INSERT INTO {table} (id, user_id, {column}) VALUES (?, ?, ?)
+                ON CONFLICT(user_id, {column}) DO NOTHING""",
+            (entry_id, user_id, item_id)
         )
-    return entry_id
+        if cursor.rowcount:
+            return entry_id
+        # Already in the deck: hand back the existing entry
+        return conn.execute(
+            f"SELECT id FROM {table} WHERE user_id = ? AND {column} = ?",
+            (user_id, item_id)
+        ).fetchone()["id"]
+    return _write(insert)
+
+
+def _apply_deck_changes(table: str, user_id: str, add: List[str], remove: List[str]):
+    """Apply many adds and removes in one transaction. Returns {"added": n, "removed": m}."""
+    column = DECK_TABLES[table]
+    add = list(dict.fromkeys(add))
+    remove = list(dict.fromkeys(remove))
+    if len(add) + len(remove) > DECK_BATCH_MAX:
+        raise ValueError(f"At most {DECK_BATCH_MAX} deck changes per batch")
+    overlap = set(add) & set(remove)
+    if overlap:
+        raise ValueError(f"Items both added and removed: {', '.join(sorted(overlap))}")
+
+    def apply(conn):
+        removed = conn.executemany(
+            f"DELETE FROM {table} WHERE user_id = ? AND {column} = ?",
+            [(user_id, item_id) for item_id in remove]
+        ).rowcount if remove else 0
+        added = conn.executemany(
+            f"""INSERT INTO {table} (id, user_id, {column}) VALUES (?, ?, ?)
+                ON CONFLICT(user_id, {column}) DO NOTHING""",
+            [(str(uuid.uuid4()), user_id, item_id) for item_id in add]
+        ).rowcount if add else 0
+        return {"added": added, "removed": removed}
+    return _write(apply)
+
+
+def add_to_study_deck(user_id: str, question_id: str) -> str:
+    """Add question to user's study deck. Returns deck entry ID (the existing one if already there)."""
+    return _add_to_deck("study_deck", user_id, question_id)
+
+
+def apply_study_deck_changes(user_id: str, add: List[str], remove: List[str]) -> Dict[str, int]:
+    """
+    Add and remove many questions in one transaction (e.g. a whole review session).
+
+    Args:
+        user_id: Deck owner
+        add: Question IDs to add (already-present ones are skipped)
+        remove: Question IDs to remove
+
+    Returns:
+        {"added": rows inserted, "removed": rows deleted}
+
+    Raises:
+        ValueError: Too many changes, or an ID in both lists
+    """
+    return _apply_deck_changes("study_deck", user_id, add, remove)
 
 
 def remove_from_study_deck(user_id: str, question_id: str) -> bool:
     """Remove question from study deck. Returns True if removed."""
-    with get_db() as conn:
+    def delete(conn):
         cursor = conn.execute(
             "DELETE FROM study_deck WHERE user_id = ? AND question_id = ?",
             (user_id, question_id)
         )
         return cursor.rowcount > 0
+    return _write(delete)
 
 
 def get_study_deck(user_id: str) -> List[Dict[str, Any]]:
@@ -567,26 +1845,71 @@ def get_study_deck(user_id: str) -> List[Dict[str, Any]]:
 def get_study_deck_questions(user_id: str, count: int) -> List[Dict[str, Any]]:
     """Get random questions from user's study deck."""
     with get_db() as conn:
-        rows = conn.execute(
-            """SELECT q.id, q.subject, q.question, q.options, q.correct_answer, q.explanation
-               FROM study_deck sd
-               JOIN questions q ON sd.question_id = q.id
-               WHERE sd.user_id = ?
-               ORDER BY RANDOM()
-               LIMIT ?""",
-            (user_id, count)
-        ).fetchall()
-        
+        # Decks are small: pick ids from the user's index range, then load just those rows.
+        # No FK across the content/user split, so skip entries whose question is gone.
+        deck_ids = [
+            row[0] for row in conn.execute(
+                """SELECT sd.question_id FROM study_deck sd
+                   WHERE sd.user_id = ?
+                   AND EXISTS (SELECT 1 FROM questions q WHERE q.id = sd.question_id)""",
+                (user_id,)
+            )
+        ]
+        ids = random.sample(deck_ids, min(max(count, 0), len(deck_ids)))
+        return _questions_in_order(conn, ids)
+
+
+def _questions_in_order(conn: sqlite3.Connection, question_ids: List[str]) -> List[Dict[str, Any]]:
+    rows = _fetch_in_order(
+        conn,
+        """SELECT id, subject, question, options, correct_answer, explanation, image_path
+           FROM questions WHERE id IN ({keys})""",
+        "id",
+        question_ids
+    )
+    return [
+        {
+            "id": row["id"],
+            "subject": row["subject"],
+            "question": row["question"],
+            "options": json.loads(row["options"]),
+            "correct_answer": row["correct_answer"],
+            "explanation": row["explanation"],
+            "image_path": row["image_path"]
+        }
+        for row in rows
+    ]
+
+
+def get_questions_by_ids(question_ids: List[str]) -> List[Dict[str, Any]]:
+    """Load questions by ID, in the given order (missing IDs are skipped)."""
+    with get_db() as conn:
+        return _questions_in_order(conn, question_ids)
+
+
+def get_study_deck_ids(user_id: str, subjects: Optional[List[str]] = None) -> List[str]:
+    """
+    Question IDs in a user's study deck.
+
+    Without `subjects` this reads the unique index alone. With `subjects`
+    it joins the content bank, so only existing questions in those
+    subjects are returned.
+    """
+    with get_db() as conn:
+        if not subjects:
+            return [
+                row[0] for row in conn.execute(
+                    "SELECT question_id FROM study_deck WHERE user_id = ?", (user_id,)
+                )
+            ]
+        placeholders = ",".join("?" * len(subjects))
         return [
-            {
-                "id": row["id"],
-                "subject": row["subject"],
-                "question": row["question"],
-                "options": json.loads(row["options"]),
-                "correct_answer": row["correct_answer"],
-                "explanation": row["explanation"]
-            }
-            for row in rows
+            row[0] for row in conn.execute(
+                f"""SELECT sd.question_id FROM study_deck sd
+                    JOIN questions q ON q.id = sd.question_id
+                    WHERE sd.user_id = ? AND q.subject IN ({placeholders})""",
+                (user_id, *subjects)
+            )
         ]
 
 
@@ -597,26 +1920,24 @@ def get_study_deck_questions(user_id: str, count: int) -> List[Dict[str, Any]]:
 def report_question(question_id: str, user_id: Optional[str] = None, reason: Optional[str] = None) -> str:
     """Report a question. Returns report ID."""
     report_id = str(uuid.uuid4())
-    with get_db_write() as conn:
+
+    def insert(conn):
+        # Report totals are counted from this table; content.db is read-only at runtime
         conn.execute(
             "INSERT INTO reported_questions (id, question_id, user_id, reason) VALUES (?, ?, ?, ?)",
             (report_id, question_id, user_id, reason)
         )
-        # Also increment the question's report count
-        conn.execute(
-            "UPDATE questions SET reported_count = reported_count + 1 WHERE id = ?",
-            (question_id,)
-        )
-    return report_id
+        return report_id
+    return _write(insert)
 
 
 def get_pending_reports() -> List[Dict[str, Any]]:
-    """Get all unreviewed question reports."""
+    """Get all unreviewed question reports (including ones whose question was since deleted)."""
     with get_db() as conn:
         rows = conn.execute(
-            """SELECT r.*, q.question, q.subject
+            """SELECT r.*, COALESCE(q.question, '(question deleted)') AS question, q.subject
                FROM reported_questions r
-               JOIN questions q ON r.question_id = q.id
+               LEFT JOIN questions q ON r.question_id = q.id
                WHERE r.reviewed = FALSE
                ORDER BY r.reported_at DESC"""
         ).fetchall()
@@ -625,11 +1946,12 @@ def get_pending_reports() -> List[Dict[str, Any]]:
 
 def mark_report_reviewed(report_id: str):
     """Mark a report as reviewed."""
-    with get_db() as conn:
+    def update(conn):
         conn.execute(
             "UPDATE reported_questions SET reviewed = TRUE WHERE id = ?",
             (report_id,)
         )
+    return _write(update)
 
 
 # =============================================================================
@@ -639,12 +1961,14 @@ def mark_report_reviewed(report_id: str):
 def submit_feedback(study_mode: str, message: str) -> str:
     """Submit user feedback. Returns feedback ID."""
     feedback_id = str(uuid.uuid4())
-    with get_db_write() as conn:
+
+    def insert(conn):
         conn.execute(
             "INSERT INTO user_feedback (id, study_mode, message) VALUES (?, ?, ?)",
             (feedback_id, study_mode, message)
         )
-    return feedback_id
+        return feedback_id
+    return _write(insert)
 
 
 def get_all_feedback(reviewed_only: bool = False) -> List[Dict[str, Any]]:
@@ -672,11 +1996,12 @@ def get_pending_feedback() -> List[Dict[str, Any]]:
 
 def mark_feedback_reviewed(feedback_id: str):
     """Mark feedback as reviewed."""
-    with get_db() as conn:
+    def update(conn):
         conn.execute(
             "UPDATE user_feedback SET reviewed = TRUE WHERE id = ?",
             (feedback_id,)
         )
+    return _write(update)
 
 
 # =============================================================================
@@ -686,7 +2011,8 @@ def mark_feedback_reviewed(feedback_id: str):
 def create_email_lead(email: str) -> str:
     """Create an email lead. Returns the lead ID."""
     lead_id = str(uuid.uuid4())
-    with get_db_write() as conn:
+
+    def insert(conn):
         # Check if email already exists
         existing = conn.execute(
             "SELECT id FROM email_leads WHERE email = ?",
@@ -699,7 +2025,8 @@ def create_email_lead(email: str) -> str:
             "INSERT INTO email_leads (id, email) VALUES (?, ?)",
             (lead_id, email)
         )
-    return lead_id
+        return lead_id
+    return _write(insert)
 
 
 def get_email_lead_by_email(email: str) -> Optional[Dict[str, Any]]:
@@ -732,6 +2059,94 @@ def get_email_leads_count() -> int:
         return row["cnt"]
 
 
+# =============================================================================
+# ADMIN LISTINGS (keyset pagination)
+# =============================================================================
+
+# listing -> (SELECT ... FROM ... [WHERE filter], sort column); rows come back
+# newest first, ordered by (sort column, id) so the order is total
+ADMIN_LISTINGS = {
+    "users": (
+        "SELECT id, email, created_at FROM users",
+        "created_at",
+    ),
+    "email_leads": (
+        "SELECT id, email, created_at, converted FROM email_leads",
+        "created_at",
+    ),
+    "pending_feedback": (
+        "SELECT * FROM user_feedback WHERE reviewed = FALSE",
+        "created_at",
+    ),
+    "pending_reports": (
+        # LEFT JOIN: reports on deleted questions still count in reports/pending, so list them too
+        """SELECT r.*, COALESCE(q.question, '(question deleted)') AS question, q.subject
+           FROM reported_questions r
+           LEFT JOIN questions q ON r.question_id = q.id
+           WHERE r.reviewed = FALSE""",
+        "r.reported_at",
+    ),
+}
+
+ADMIN_PAGE_MAX = 1000
+
+
+def _encode_cursor(sort_value: Any, row_id: str) -> str:
+    return base64.urlsafe_b64encode(json.dumps([sort_value, row_id]).encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> tuple:
+    try:
+        sort_value, row_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return sort_value, row_id
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+
+def list_admin_page(listing: str, limit: int = 100, cursor: Optional[str] = None) -> Dict[str, Any]:
+    """
+    One page of an admin listing, newest first.
+
+    Seeks straight to the cursor through the (sort column, id) index, so
+    every page costs the same no matter how deep it is.
+
+    Args:
+        listing: Key of ADMIN_LISTINGS
+        limit: Rows per page (capped at ADMIN_PAGE_MAX)
+        cursor: next_cursor from the previous page (None for the first page)
+
+    Returns:
+        {"items": [...], "columns": [...] (the listing's columns, even when
+        there are no items), "next_cursor": str or None on the last page}
+
+    Raises:
+        ValueError: Malformed cursor
+    """
+    select, sort = ADMIN_LISTINGS[listing]
+    id_column = sort.rsplit(".", 1)[0] + ".id" if "." in sort else "id"
+    limit = min(max(limit, 1), ADMIN_PAGE_MAX)
+
+    sql = select
+    params: List[Any] = []
+    if cursor:
+        sql += " AND " if " WHERE " in select else " WHERE "
+        sql += f"({sort}, {id_column}) < (?, ?)"
+        params.extend(_decode_cursor(cursor))
+    sql += f" ORDER BY {sort} DESC, {id_column} DESC LIMIT ?"
+    params.append(limit + 1)
+
+    sort_key = sort.rsplit(".", 1)[-1]
+    with get_db() as conn:
+        result = conn.execute(sql, tuple(params))
+        columns = [column[0] for column in result.description]
+        rows = [dict(row) for row in result]
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = _encode_cursor(rows[-1][sort_key], rows[-1]["id"])
+    return {"items": rows, "columns": columns, "next_cursor": next_cursor}
+
+
 # =============================================================================
 # FLASHCARD BANK CRUD
 # =============================================================================
@@ -746,15 +2161,73 @@ def add_flashcard(
     is_approved: bool = True
 ) -> str:
     """Add a flashcard to the bank. Returns the flashcard ID."""
-    flashcard_id = str(uuid.uuid4())
-    with get_db() as conn:
-        conn.execute(
+    return add_flashcards_bulk([{
+        "subject": subject,
+        "card_type": card_type,
+        "front_content": front_content,
+        "back_content": back_content,
+        "hint": hint,
+        "source": source,
+        "is_approved": is_approved,
+    }])[0]
+
+
+def add_flashcards_bulk(flashcards: List[Dict[str, Any]], chunk_size: int = BULK_CHUNK_SIZE) -> List[str]:
+    """
+    Add many flashcards in one transaction.
+
+    Args:
+        flashcards: Dicts with add_flashcard's arguments (defaults apply)
+        chunk_size: Rows per executemany call
+
+    Returns:
+        The new flashcard IDs, in input order
+    """
+    ids = [str(uuid.uuid4()) for _ in flashcards]
+    with get_content_db_write() as conn:
+        _insert_flashcards(conn, ids, flashcards, chunk_size)
+    return ids
+
+
+def update_flashcards_bulk(updates: List[Dict[str, Any]], chunk_size: int = BULK_CHUNK_SIZE) -> int:
+    """
+    Update many flashcards in one transaction.
+
+    Args:
+        updates: Dicts with an "id" plus the columns to set
+        chunk_size: Rows per executemany call
+
+    Returns:
+        Number of rows updated
+    """
+    with get_content_db_write() as conn:
+        return _bulk_update(conn, "flashcards", FLASHCARD_COLUMNS, updates, chunk_size)
+
+
+def replace_flashcards(subjects: List[str], flashcards: List[Dict[str, Any]], chunk_size: int = BULK_CHUNK_SIZE) -> List[str]:
+    """Delete every flashcard in `subjects` and insert `flashcards`, atomically. Returns the new IDs."""
+    ids = [str(uuid.uuid4()) for _ in flashcards]
+    with get_content_db_write() as conn:
+        conn.execute(f"DELETE FROM flashcards WHERE subject IN ({','.join('?' * len(subjects))})", tuple(subjects))
+        _insert_flashcards(conn, ids, flashcards, chunk_size)
+    return ids
+
+
+def _insert_flashcards(conn: sqlite3.Connection, ids: List[str], flashcards: List[Dict[str, Any]], chunk_size: int):
+    rows = [
+        (
+            flashcard_id, c["subject"], c["card_type"], c["front_content"], c["back_content"],
+            c.get("hint"), c.get("source"), c.get("is_approved", True)
+        )
+        for flashcard_id, c in zip(ids, flashcards)
+    ]
+    for chunk in _chunks(rows, chunk_size):
+        conn.executemany(
             """INSERT INTO flashcards 
                (id, subject, card_type, front_content, back_content, hint, source, is_approved)
                VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
-            (flashcard_id, subject, card_type, front_content, back_content, hint, source, is_approved)
+            chunk
         )
-    return flashcard_id
 
 
 def get_random_flashcards(
@@ -764,27 +2237,26 @@ def get_random_flashcards(
     approved_only: bool = True
 ) -> List[Dict[str, Any]]:
     """Get random flashcards from the bank."""
-    with get_db() as conn:
-        subject_placeholders = ",".join("?" * len(subjects))
-        approved_clause = "AND is_approved = TRUE" if approved_only else ""
-        
-        params = list(subjects)
-        type_clause = ""
-        if card_types:
-            type_placeholders = ",".join("?" * len(card_types))
-            type_clause = f"AND card_type IN ({type_placeholders})"
-            params.extend(card_types)
-        
-        params.append(count)
-        
-        rows = conn.execute(
-            f"""SELECT id, subject, card_type, front_content, back_content, hint, source
-                FROM flashcards
-                WHERE subject IN ({subject_placeholders}) {type_clause} {approved_clause}
-                ORDER BY RANDOM()
-                LIMIT ?""",
-            tuple(params)
-        ).fetchall()
+    if not subjects:
+        return []
+    with get_content_db() as conn:
+        rowids = _sample_rowids(
+            conn,
+            "flashcards",
+            [
+                ("subject", subjects),
+                ("card_type", card_types or None),
+                ("is_approved", [True] if approved_only else None),
+            ],
+            count
+        )
+        rows = _fetch_in_order(
+            conn,
+            """SELECT rowid, id, subject, card_type, front_content, back_content, hint, source
+               FROM flashcards WHERE rowid IN ({keys})""",
+            "rowid",
+            rowids
+        )
         
         return [
             {
@@ -800,9 +2272,20 @@ def get_random_flashcards(
         ]
 
 
+def get_all_flashcards(approved_only: bool = True) -> List[Dict[str, Any]]:
+    """Every flashcard in the bank in insertion order (used to build content_bank)."""
+    with get_content_db() as conn:
+        rows = conn.execute(
+            f"""SELECT id, subject, card_type, front_content, back_content, hint, source
+                FROM flashcards {"WHERE is_approved = TRUE" if approved_only else ""}
+                ORDER BY rowid"""
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+
 def get_flashcard_count(subject: Optional[str] = None, card_type: Optional[str] = None) -> int:
     """Get count of flashcards, optionally filtered by subject and/or card_type."""
-    with get_db() as conn:
+    with get_content_db() as conn:
         query = "SELECT COUNT(*) as cnt FROM flashcards WHERE is_approved = TRUE"
         params = []
         
@@ -822,32 +2305,24 @@ def get_flashcard_count(subject: Optional[str] = None, card_type: Optional[str]
 # =============================================================================
 
 def add_to_flashcard_study_deck(user_id: str, flashcard_id: str) -> str:
-    """Add flashcard to user's flashcard study deck. Returns deck entry ID."""
-    entry_id = str(uuid.uuid4())
-    with get_db() as conn:
-        # Check if already in deck
-        existing = conn.execute(
-            "SELECT id FROM flashcard_study_deck WHERE user_id = ? AND flashcard_id = ?",
-            (user_id, flashcard_id)
-        ).fetchone()
-        if existing:
-            return existing["id"]
-        
-        conn.execute(
-            "INSERT INTO flashcard_study_deck (id, user_id, flashcard_id) VALUES (?, ?, ?)",
-            (entry_id, user_id, flashcard_id)
-        )
-    return entry_id
+    """Add flashcard to user's flashcard study deck. Returns deck entry ID (the existing one if already there)."""
+    return _add_to_deck("flashcard_study_deck", user_id, flashcard_id)
+
+
+def apply_flashcard_study_deck_changes(user_id: str, add: List[str], remove: List[str]) -> Dict[str, int]:
+    """Add and remove many flashcards in one transaction (see apply_study_deck_changes)."""
+    return _apply_deck_changes("flashcard_study_deck", user_id, add, remove)
 
 
 def remove_from_flashcard_study_deck(user_id: str, flashcard_id: str) -> bool:
     """Remove flashcard from study deck. Returns True if removed."""
-    with get_db() as conn:
+    def delete(conn):
         cursor = conn.execute(
             "DELETE FROM flashcard_study_deck WHERE user_id = ? AND flashcard_id = ?",
             (user_id, flashcard_id)
         )
         return cursor.rowcount > 0
+    return _write(delete)
 
 
 def get_flashcard_study_deck(user_id: str) -> List[Dict[str, Any]]:
@@ -880,15 +2355,23 @@ def get_flashcard_study_deck(user_id: str) -> List[Dict[str, Any]]:
 def get_flashcard_study_deck_cards(user_id: str, count: int) -> List[Dict[str, Any]]:
     """Get random flashcards from user's study deck."""
     with get_db() as conn:
-        rows = conn.execute(
-            """SELECT f.id, f.subject, f.card_type, f.front_content, f.back_content, f.hint, f.source
-               FROM flashcard_study_deck fsd
-               JOIN flashcards f ON fsd.flashcard_id = f.id
-               WHERE fsd.user_id = ?
-               ORDER BY RANDOM()
-               LIMIT ?""",
-            (user_id, count)
-        ).fetchall()
+        # Only entries whose flashcard still exists, so the sample is not cut short
+        deck_ids = [
+            row[0] for row in conn.execute(
+                """SELECT fsd.flashcard_id FROM flashcard_study_deck fsd
+                   WHERE fsd.user_id = ?
+                   AND EXISTS (SELECT 1 FROM flashcards f WHERE f.id = fsd.flashcard_id)""",
+                (user_id,)
+            )
+        ]
+        ids = random.sample(deck_ids, min(max(count, 0), len(deck_ids)))
+        rows = _fetch_in_order(
+            conn,
+            """SELECT id, subject, card_type, front_content, back_content, hint, source
+               FROM flashcards WHERE id IN ({keys})""",
+            "id",
+            ids
+        )
         
         return [
             {
@@ -905,6 +2388,7 @@ def get_flashcard_study_deck_cards(user_id: str, count: int) -> List[Dict[str, A
 
 
 # Initialize on import
-init_db()
+with _startup_phase("init_db"):
+    init_db()
 
 
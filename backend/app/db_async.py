@@ -0,0 +1,147 @@
+"""
+Async access to the database module.
+
+The db helpers are synchronous (sqlite3). Calling them straight from an
+async route blocks the event loop for every in-flight request, including
+LLM calls that are only awaiting a stream. These wrappers run each helper
+on a dedicated, bounded thread pool instead and await the result.
+
+The caller's context is copied into the worker, so the connection bound by
+db.request_connection is reused. One request must await its db calls one
+at a time (no gather over the same request connection).
+
+Write helpers go through db's group-commit writer and are awaited directly.
+"""
+
+import os
+import asyncio
+import functools
+import contextvars
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, TypeVar
+
+from app import db
+
+T = TypeVar("T")
+
+# Matches the connection pool by default so workers rarely open overflow connections
+DB_EXECUTOR_WORKERS = int(os.environ.get("DB_EXECUTOR_WORKERS", str(db.DB_POOL_SIZE)))
+
+_executor = ThreadPoolExecutor(max_workers=DB_EXECUTOR_WORKERS, thread_name_prefix="db")
+_lock = threading.Lock()
+_in_flight = 0
+_calls = 0
+
+
+def _call(ctx: contextvars.Context, fn: Callable[..., T], args, kwargs) -> T:
+    global _in_flight
+    try:
+        return ctx.run(fn, *args, **kwargs)
+    finally:
+        with _lock:
+            _in_flight -= 1
+
+
+async def run(fn: Callable[..., T], *args, **kwargs) -> T:
+    """Run a blocking db call on the db executor and await its result."""
+    global _in_flight, _calls
+    with _lock:
+        _in_flight += 1
+        _calls += 1
+    loop = asyncio.get_running_loop()
+    ctx = contextvars.copy_context()
+    return await loop.run_in_executor(_executor, _call, ctx, fn, args, kwargs)
+
+
+def _wrap(fn: Callable[..., T]) -> Callable[..., Awaitable[T]]:
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        return await run(fn, *args, **kwargs)
+    return wrapper
+
+
+def _wrap_write(fn: Callable[..., T]) -> Callable[..., Awaitable[T]]:
+    """
+    Write helpers only build an operation and queue it on the group-commit
+    writer, so they run inline and the route awaits the writer's future
+    without holding an executor thread.
+    """
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        token = db._defer_writes.set(True)
+        try:
+            future = fn(*args, **kwargs)
+        finally:
+            db._defer_writes.reset(token)
+        return await asyncio.wrap_future(future)
+    return wrapper
+
+
+def get_executor_metrics() -> Dict[str, Any]:
+    """Executor size and load for /api/metrics."""
+    with _lock:
+        return {"workers": DB_EXECUTOR_WORKERS, "in_flight": _in_flight, "calls": _calls}
+
+
+def shutdown():
+    """Wait for queued db calls to finish (app shutdown hook)."""
+    _executor.shutdown(wait=True)
+
+
+# =============================================================================
+# ASYNC WRAPPERS
+# =============================================================================
+
+# Questions
+get_random_questions = _wrap(db.get_random_questions)
+get_questions_by_ids = _wrap(db.get_questions_by_ids)
+get_question_count = _wrap(db.get_question_count)
+
+# Search
+search_questions = _wrap(db.search_questions)
+search_flashcards = _wrap(db.search_flashcards)
+
+# Users
+create_user = _wrap_write(db.create_user)
+
+# Sessions
+create_session = _wrap_write(db.create_session)
+delete_session = _wrap_write(db.delete_session)
+revoke_token = _wrap_write(db.revoke_token)
+get_user_by_email = _wrap(db.get_user_by_email)
+get_all_users = _wrap(db.get_all_users)
+get_users_count = _wrap(db.get_users_count)
+
+# Study decks
+add_to_study_deck = _wrap_write(db.add_to_study_deck)
+remove_from_study_deck = _wrap_write(db.remove_from_study_deck)
+apply_study_deck_changes = _wrap_write(db.apply_study_deck_changes)
+get_study_deck = _wrap(db.get_study_deck)
+get_study_deck_questions = _wrap(db.get_study_deck_questions)
+get_study_deck_ids = _wrap(db.get_study_deck_ids)
+add_to_flashcard_study_deck = _wrap_write(db.add_to_flashcard_study_deck)
+remove_from_flashcard_study_deck = _wrap_write(db.remove_from_flashcard_study_deck)
+apply_flashcard_study_deck_changes = _wrap_write(db.apply_flashcard_study_deck_changes)
+get_flashcard_study_deck = _wrap(db.get_flashcard_study_deck)
+
+# Reports & feedback
+report_question = _wrap_write(db.report_question)
+get_pending_reports = _wrap(db.get_pending_reports)
+submit_feedback = _wrap_write(db.submit_feedback)
+get_pending_feedback = _wrap(db.get_pending_feedback)
+
+# Email leads
+create_email_lead = _wrap_write(db.create_email_lead)
+get_all_email_leads = _wrap(db.get_all_email_leads)
+get_email_leads_count = _wrap(db.get_email_leads_count)
+
+# Admin listings
+list_admin_page = _wrap(db.list_admin_page)
+
+# Flashcards
+get_random_flashcards = _wrap(db.get_random_flashcards)
+get_flashcard_count = _wrap(db.get_flashcard_count)
+
+# Stats
+get_stats_counters = _wrap(db.get_stats_counters)
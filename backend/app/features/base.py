@@ -3,8 +3,10 @@ Abstract Base Classes for Quiz Engine Components
 Enables swapping retrieval and generation backends without changing application code.
 """
 
+import json
+import asyncio
 from abc import ABC, abstractmethod
-from typing import List
+from typing import Any, AsyncIterator, List
 
 
 class BaseRetriever(ABC):
@@ -41,3 +43,25 @@ class BaseGenerator(ABC):
             Dict with 'question', 'options', 'correct_answer', 'explanation'
         """
         pass
+
+    async def generate_stream(self, topic: str, context: str) -> AsyncIterator[str]:
+        """
+        Stream the generated output as text chunks (JSON text for questions).
+
+        Default for generators without a streaming API: one chunk holding
+        the whole generate() result.
+        """
+        result = await self.generate(topic, context)
+        yield result if isinstance(result, str) else json.dumps(result)
+
+    async def generate_many(self, topic: str, context: str, count: int) -> List[Any]:
+        """
+        Generate `count` questions from the same context.
+
+        Default for generators without a multi-question call: `count`
+        concurrent generate() calls; failed ones are left out.
+        """
+        results = await asyncio.gather(
+            *(self.generate(topic, context) for _ in range(count)), return_exceptions=True
+        )
+        return [r for r in results if not isinstance(r, Exception)]
@@ -4,7 +4,8 @@ AI-powered answer grading using RAG + Vertex AI.
 """
 
 import os
-from typing import List, Dict, Any
+import asyncio
+from typing import AsyncIterator, List, Dict, Any, Tuple
 
 from app.rag_engine import RAGEngine
 from app.llm.vertex_client import VertexAIClient
@@ -37,8 +38,43 @@ class CaptainsReviewFeature:
         Returns:
             Dict with grade, feedback, textbook_answer, and citations
         """
-        # Retrieve relevant context
-        context_data = self.rag_engine.build_context(
+        prompt, citations = await self._prepare(question, user_answer, document_ids)
+        
+        # Get LLM response
+        response = await self.llm.generate(prompt)
+        
+        # Parse the response
+        result = self.parse_response(response)
+        result["citations"] = citations
+        
+        return result
+    
+    async def review_stream(
+        self,
+        question: str,
+        user_answer: str,
+        document_ids: List[str],
+    ) -> Tuple[List[Dict[str, Any]], AsyncIterator[str]]:
+        """
+        Streaming variant of review.
+        
+        Returns:
+            (citations, async iterator over the grading JSON text as it is written);
+            parse the joined text with parse_response
+        """
+        prompt, citations = await self._prepare(question, user_answer, document_ids)
+        return citations, self.llm.generate_stream(prompt)
+    
+    async def _prepare(
+        self,
+        question: str,
+        user_answer: str,
+        document_ids: List[str],
+    ) -> Tuple[str, List[Dict[str, Any]]]:
+        """Retrieve context and build the grading prompt. Returns (prompt, citations)."""
+        # Retrieve relevant context (blocking vector search, so off the event loop)
+        context_data = await asyncio.to_thread(
+            self.rag_engine.build_context,
             query=f"{question} {user_answer}",
             document_ids=document_ids,
             top_k=5,
@@ -50,15 +86,7 @@ class CaptainsReviewFeature:
             user_answer=user_answer,
             context=context_data["context"],
         )
-        
-        # Get LLM response
-        response = await self.llm.generate(prompt)
-        
-        # Parse the response
-        result = self._parse_response(response)
-        result["citations"] = context_data["citations"]
-        
-        return result
+        return prompt, context_data["citations"]
     
     def _build_review_prompt(
         self,
@@ -96,7 +124,7 @@ Respond in the following JSON format exactly:
 
 Your response (JSON only):"""
     
-    def _parse_response(self, response: str) -> Dict[str, Any]:
+    def parse_response(self, response: str) -> Dict[str, Any]:
         """Parse the LLM response into structured data."""
         import json
         
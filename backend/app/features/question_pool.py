@@ -0,0 +1,298 @@
+"""
+Pre-generated Question Pool
+Per-topic buffers of freshly generated quiz questions, refilled in the background.
+
+Architecture:
+- Requests pop from a per-topic deque in O(1); an empty pool means the
+  caller generates live (and the miss wakes the refill worker)
+- Demand is tracked per topic over a sliding window; each topic's
+  watermark is the number of questions that demand would consume over
+  QUIZ_POOL_LEAD_SECONDS, clamped to [QUIZ_POOL_MIN_DEPTH, QUIZ_POOL_MAX_DEPTH]
+- Topics are free text, so only topics requested at least
+  QUIZ_POOL_MIN_DEMAND times in the window are refilled, and at most
+  QUIZ_POOL_MAX_TOPICS are tracked
+- Questions older than QUIZ_POOL_MAX_AGE_SECONDS are dropped, not served
+- A topic whose refill fails backs off exponentially, from
+  QUIZ_POOL_RETRY_SECONDS up to QUIZ_POOL_MAX_RETRY_SECONDS
+- Optionally persisted to QUIZ_POOL_PATH (JSON) across restarts
+
+All state lives on the event loop thread, so no locks are needed.
+"""
+
+import os
+import json
+import time
+import math
+import asyncio
+from collections import OrderedDict, deque
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+
+QUIZ_POOL_ENABLED = os.environ.get("QUIZ_POOL_ENABLED", "true").lower() == "true"
+QUIZ_POOL_PATH = os.environ.get("QUIZ_POOL_PATH", "")
+QUIZ_POOL_MIN_DEPTH = int(os.environ.get("QUIZ_POOL_MIN_DEPTH", "2"))
+QUIZ_POOL_MAX_DEPTH = int(os.environ.get("QUIZ_POOL_MAX_DEPTH", "20"))
+QUIZ_POOL_LEAD_SECONDS = float(os.environ.get("QUIZ_POOL_LEAD_SECONDS", "120"))
+QUIZ_POOL_DEMAND_WINDOW_SECONDS = float(os.environ.get("QUIZ_POOL_DEMAND_WINDOW_SECONDS", "600"))
+QUIZ_POOL_MIN_DEMAND = int(os.environ.get("QUIZ_POOL_MIN_DEMAND", "2"))
+QUIZ_POOL_MAX_TOPICS = int(os.environ.get("QUIZ_POOL_MAX_TOPICS", "32"))
+QUIZ_POOL_MAX_AGE_SECONDS = float(os.environ.get("QUIZ_POOL_MAX_AGE_SECONDS", "3600"))
+QUIZ_POOL_REFILL_INTERVAL_SECONDS = float(os.environ.get("QUIZ_POOL_REFILL_INTERVAL_SECONDS", "5"))
+QUIZ_POOL_CONCURRENCY = int(os.environ.get("QUIZ_POOL_CONCURRENCY", "4"))
+QUIZ_POOL_RETRY_SECONDS = float(os.environ.get("QUIZ_POOL_RETRY_SECONDS", "30"))
+QUIZ_POOL_MAX_RETRY_SECONDS = float(os.environ.get("QUIZ_POOL_MAX_RETRY_SECONDS", "600"))
+
+
+def pool_key(topic: str) -> str:
+    """Normalized topic key ("Human Relations " and "human relations" share a pool)."""
+    return " ".join(topic.lower().split())
+
+
+class _TopicPool:
+    def __init__(self):
+        self.questions: Deque[Tuple[float, Dict[str, Any]]] = deque()
+        self.demand: Deque[float] = deque()
+        self.inflight = 0
+        self.hits = 0
+        self.misses = 0
+        self.failures = 0  # consecutive refill failures
+        self.retry_at = 0.0
+
+
+class QuestionPool:
+    """
+    Per-topic question buffers with a background refill worker.
+
+    `produce(topic)` must return a validated question dict or raise; the
+    pool never stores anything else.
+    """
+
+    def __init__(self, produce: Callable[[str], Awaitable[Dict[str, Any]]], path: str = QUIZ_POOL_PATH):
+        self.produce = produce
+        self.path = Path(path) if path else None
+        self._topics: "OrderedDict[str, _TopicPool]" = OrderedDict()
+        self._wake: Optional[asyncio.Event] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._refills: set = set()
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+        # Pool-wide counters (per-topic ones go when a topic is evicted)
+        self._hits = 0
+        self._misses = 0
+
+        # Refill metrics
+        self._refilled = 0
+        self._refill_failures = 0
+        self._refill_seconds = 0.0
+        self._last_refill_seconds: Optional[float] = None
+        self._expired = 0
+
+    def _topic(self, key: str) -> _TopicPool:
+        pool = self._topics.get(key)
+        if pool is None:
+            pool = self._topics[key] = _TopicPool()
+            while len(self._topics) > QUIZ_POOL_MAX_TOPICS:
+                self._topics.popitem(last=False)
+        self._topics.move_to_end(key)
+        return pool
+
+    def _trim_demand(self, pool: _TopicPool, now: float):
+        while pool.demand and pool.demand[0] < now - QUIZ_POOL_DEMAND_WINDOW_SECONDS:
+            pool.demand.popleft()
+
+    def watermark(self, key: str) -> int:
+        """Target depth for a topic from its recent demand (0 = not worth pre-generating)."""
+        pool = self._topics.get(key)
+        if pool is None:
+            return 0
+        self._trim_demand(pool, time.time())
+        if len(pool.demand) < QUIZ_POOL_MIN_DEMAND:
+            return 0
+        rate = len(pool.demand) / QUIZ_POOL_DEMAND_WINDOW_SECONDS
+        return min(max(math.ceil(rate * QUIZ_POOL_LEAD_SECONDS), QUIZ_POOL_MIN_DEPTH), QUIZ_POOL_MAX_DEPTH)
+
+    def pop(self, topic: str) -> Optional[Dict[str, Any]]:
+        """
+        Take a pre-generated question for the topic, recording the demand.
+
+        Returns:
+            A question dict, or None if the pool for the topic is empty
+        """
+        now = time.time()
+        pool = self._topic(pool_key(topic))
+        pool.demand.append(now)
+        while pool.questions:
+            created_at, question = pool.questions.popleft()
+            if now - created_at <= QUIZ_POOL_MAX_AGE_SECONDS:
+                pool.hits += 1
+                self._hits += 1
+                self._signal()
+                return question
+            self._expired += 1
+        pool.misses += 1
+        self._misses += 1
+        self._signal()
+        return None
+
+    def push(self, topic: str, question: Dict[str, Any], created_at: Optional[float] = None):
+        """Add a validated question to the topic's pool."""
+        self._topic(pool_key(topic)).questions.append((created_at or time.time(), question))
+
+    # -------------------------------------------------------------------------
+    # Refill worker
+    # -------------------------------------------------------------------------
+
+    def _signal(self):
+        if self._wake is not None:
+            self._wake.set()
+
+    def shortfall(self) -> List[Tuple[str, int]]:
+        """(topic, questions to start generating) for every topic below its watermark and not backing off."""
+        missing = []
+        now = time.time()
+        for key, pool in self._topics.items():
+            if pool.retry_at > now:
+                continue
+            needed = self.watermark(key) - len(pool.questions) - pool.inflight
+            if needed > 0:
+                missing.append((key, needed))
+        return missing
+
+    async def _refill_one(self, key: str):
+        pool = self._topics.get(key)
+        try:
+            async with self._semaphore:
+                if pool is not None and pool.retry_at > time.time():
+                    # A sibling refill failed while this one waited for a slot
+                    return
+                started = time.perf_counter()
+                try:
+                    question = await self.produce(key)
+                except Exception as e:
+                    self._refill_failures += 1
+                    if pool is not None and pool.retry_at <= time.time():
+                        # Back off so a failing topic does not call the model back to back
+                        delay = min(QUIZ_POOL_RETRY_SECONDS * 2 ** pool.failures, QUIZ_POOL_MAX_RETRY_SECONDS)
+                        pool.failures += 1
+                        pool.retry_at = time.time() + delay
+                        print(f"⚠️ Question pool refill failed for {key}, retrying in {delay:.0f}s: {e}")
+                    return
+                elapsed = time.perf_counter() - started
+                self._refilled += 1
+                self._refill_seconds += elapsed
+                self._last_refill_seconds = elapsed
+                if pool is not None:
+                    pool.failures = 0
+                    pool.retry_at = 0.0
+                if key in self._topics:
+                    self._topics[key].questions.append((time.time(), question))
+        finally:
+            if pool is not None:
+                pool.inflight -= 1
+
+    def refill(self):
+        """Start generations for every topic below its watermark."""
+        for key, needed in self.shortfall():
+            pool = self._topics[key]
+            for _ in range(needed):
+                pool.inflight += 1
+                task = asyncio.create_task(self._refill_one(key))
+                self._refills.add(task)
+                task.add_done_callback(self._refills.discard)
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=QUIZ_POOL_REFILL_INTERVAL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            self.refill()
+
+    def start(self):
+        """Load any persisted pool and start the refill worker (call from the event loop)."""
+        if self._worker is not None:
+            return
+        self.load()
+        self._wake = asyncio.Event()
+        self._semaphore = asyncio.Semaphore(QUIZ_POOL_CONCURRENCY)
+        self._worker = asyncio.create_task(self._run())
+        print(f"🧺 Question pool refill worker started ({sum(len(p.questions) for p in self._topics.values())} questions loaded)")
+
+    async def stop(self):
+        """Stop the worker, cancel in-flight refills and persist what is pooled."""
+        for task in [self._worker, *self._refills]:
+            if task is not None:
+                task.cancel()
+        await asyncio.gather(*[t for t in [self._worker, *self._refills] if t is not None], return_exceptions=True)
+        self._worker = None
+        self.save()
+
+    # -------------------------------------------------------------------------
+    # Persistence
+    # -------------------------------------------------------------------------
+
+    def save(self):
+        """Write pooled questions (and demand) to QUIZ_POOL_PATH, if set."""
+        if self.path is None:
+            return
+        data = {
+            key: {"questions": list(pool.questions), "demand": list(pool.demand)}
+            for key, pool in self._topics.items()
+        }
+        try:
+            tmp = self.path.with_suffix(".tmp")
+            tmp.write_text(json.dumps(data))
+            tmp.replace(self.path)
+        except OSError as e:
+            print(f"⚠️ Could not save question pool: {e}")
+
+    def load(self):
+        """Restore pooled questions from QUIZ_POOL_PATH, dropping expired ones."""
+        if self.path is None or not self.path.exists():
+            return
+        try:
+            data = json.loads(self.path.read_text())
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Could not load question pool: {e}")
+            return
+        now = time.time()
+        for key, saved in data.items():
+            pool = self._topic(key)
+            pool.questions.extend(
+                (created_at, question) for created_at, question in saved["questions"]
+                if now - created_at <= QUIZ_POOL_MAX_AGE_SECONDS
+            )
+            pool.demand.extend(saved["demand"])
+
+    # -------------------------------------------------------------------------
+    # Metrics
+    # -------------------------------------------------------------------------
+
+    def stats(self) -> Dict[str, Any]:
+        """Pool depth, hit rate and refill latency for /api/metrics."""
+        hits, misses = self._hits, self._misses
+        now = time.time()
+        return {
+            "running": self._worker is not None,
+            "depth": sum(len(pool.questions) for pool in self._topics.values()),
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / (hits + misses), 4) if hits + misses else 0.0,
+            "expired": self._expired,
+            "refilled": self._refilled,
+            "refill_failures": self._refill_failures,
+            "refill_avg_seconds": round(self._refill_seconds / self._refilled, 3) if self._refilled else None,
+            "refill_last_seconds": round(self._last_refill_seconds, 3) if self._last_refill_seconds is not None else None,
+            "topics": {
+                key: {
+                    "depth": len(pool.questions),
+                    "watermark": self.watermark(key),
+                    "inflight": pool.inflight,
+                    "hits": pool.hits,
+                    "misses": pool.misses,
+                    "retry_in_seconds": round(max(pool.retry_at - now, 0.0), 1),
+                }
+                for key, pool in self._topics.items()
+            },
+        }
@@ -7,13 +7,18 @@ Architecture:
 - DiscoveryEngineRetriever implements BaseRetriever
 - VertexAIGenerator implements BaseGenerator
 - FireCaptainQuizEngine orchestrates both via interfaces (swappable)
+- QuestionPool (optional) serves pre-generated questions per topic
 """
 
 import os
+import re
 import json
-from typing import List, Optional
+import time
+import asyncio
+from typing import Any, AsyncIterator, Dict, List, Optional
 
 from app.features.base import BaseRetriever, BaseGenerator
+from app.features.question_pool import QuestionPool, QUIZ_POOL_ENABLED
 
 # Import HR training data for Human Relations questions
 try:
@@ -72,6 +77,26 @@ HUMAN RELATIONS SPECIFIC RULES:
 """
 
 
+# Response schema for multi-question calls (Vertex AI structured output)
+QUESTION_LIST_SCHEMA = {
+    "type": "array",
+    "items": {
+        "type": "object",
+        "properties": {
+            "question": {"type": "string"},
+            "options": {"type": "array", "items": {"type": "string"}, "minItems": 4, "maxItems": 4},
+            "correct_answer": {"type": "string"},
+            "explanation": {"type": "string"},
+        },
+        "required": ["question", "options", "correct_answer", "explanation"],
+    },
+}
+
+# Output tokens budgeted per question in a multi-question call
+TOKENS_PER_QUESTION = 512
+MAX_OUTPUT_TOKENS = 8192
+
+
 # =============================================================================
 # RETRIEVER IMPLEMENTATIONS
 # =============================================================================
@@ -166,10 +191,10 @@ class VertexAIGenerator(BaseGenerator):
         # HR-specific model with enhanced training
         self._hr_model = GenerativeModel(model_name, system_instruction=[HR_SYSTEM_INSTRUCTION])
         self._GenerationConfig = GenerationConfig
+        self._usage = GenerationUsage()
 
-    async def generate(self, topic: str, context: str) -> dict:
-        import re
-        
+    def _request(self, topic: str, context: str, count: int = 1) -> tuple:
+        """Pick the model and build the prompt for `count` questions. Returns (model, prompt)."""
         # Check if this is a Human Relations question
         is_hr = "human" in topic.lower() or "relation" in topic.lower()
         
@@ -188,6 +213,20 @@ HERE ARE EXAMPLE HUMAN RELATIONS QUESTIONS FOR REFERENCE:
 Now create a NEW, ORIGINAL question following these patterns.
 """
 
+        if count > 1:
+            prompt = f"""
+Based on the following Fire Service manual text, generate {count} challenging multiple-choice questions about '{topic}'.
+Each question must test a DIFFERENT point, scenario or calculation.
+
+MANUAL TEXT:
+{context}
+{hr_examples}
+
+CRITICAL: Return ONLY a JSON array of {count} objects, each with keys
+"question", "options" (list of 4), "correct_answer" (one of the options) and "explanation".
+"""
+            return (self._hr_model if is_hr else self._model), prompt
+
         prompt = f"""
 Based on the following Fire Service manual text, generate a challenging multiple-choice question about '{topic}'.
 
@@ -198,56 +237,187 @@ MANUAL TEXT:
 CRITICAL: Return ONLY valid JSON. No markdown, no explanation, just JSON:
 {{"question": "...", "options": ["A", "B", "C", "D"], "correct_answer": "...", "explanation": "..."}}
 """
+        # Use HR-specific model for Human Relations questions
+        return (self._hr_model if is_hr else self._model), prompt
+
+    async def generate_stream(self, topic: str, context: str) -> AsyncIterator[str]:
+        """
+        Stream the raw model output (JSON text) chunk by chunk.
+        Uses the async Vertex API, so concurrent generations overlap
+        instead of blocking the event loop one after another.
+        """
+        model, prompt = self._request(topic, context)
         config = self._GenerationConfig(
             temperature=0.4, 
             max_output_tokens=1024
         )
+        started = time.perf_counter()
+        response = await model.generate_content_async(
+            prompt, 
+            generation_config=config,
+            stream=True
+        )
+        usage = None
+        async for chunk in response:
+            usage = getattr(chunk, "usage_metadata", None) or usage
+            yield chunk.text
+        self._usage.record("single", 1, usage, time.perf_counter() - started)
+
+    async def generate_many(self, topic: str, context: str, count: int) -> List[Any]:
+        """
+        Generate `count` questions in one call with a JSON response schema,
+        so the system instruction, manual text and examples are sent once.
+
+        Returns:
+            Every complete item of the returned array (unvalidated); items
+            after a malformed or truncated one are lost
+        """
+        model, prompt = self._request(topic, context, count)
+        config = self._GenerationConfig(
+            temperature=0.4,
+            max_output_tokens=min(TOKENS_PER_QUESTION * (count + 1), MAX_OUTPUT_TOKENS),
+            response_mime_type="application/json",
+            response_schema=QUESTION_LIST_SCHEMA,
+        )
+        started = time.perf_counter()
+        response = await model.generate_content_async(prompt, generation_config=config)
+        items = parse_question_list(response.text)
+        self._usage.record("multi", len(items), getattr(response, "usage_metadata", None), time.perf_counter() - started)
+        return items
+
+    def usage_stats(self) -> Dict[str, Any]:
+        """Tokens and latency per question for single- and multi-question calls."""
+        return self._usage.stats()
+
+    async def generate(self, topic: str, context: str) -> dict:
         try:
-            # Use HR-specific model for Human Relations questions
-            model = self._hr_model if is_hr else self._model
-            
-            # Use streaming for faster response
-            response_text = ""
-            response = model.generate_content(
-                prompt, 
-                generation_config=config,
-                stream=True
-            )
-            for chunk in response:
-                response_text += chunk.text
-            response_text = response_text.strip()
+            response_text = "".join([chunk async for chunk in self.generate_stream(topic, context)])
+            return parse_question_json(response_text)
+        except Exception as e:
+            print(f"⚠️ Generator error: {e}")
+            raise e
+
+
+def parse_question_json(response_text: str) -> dict:
+    """
+    Parse a generated question from model output, tolerating markdown
+    fences and surrounding chatter.
+
+    Raises:
+        ValueError: No JSON object could be parsed
+    """
+    response_text = response_text.strip()
+
+    # Robust JSON extraction
+    # Try 1: Direct parse
+    try:
+        return json.loads(response_text)
+    except json.JSONDecodeError:
+        pass
     
-            # Robust JSON extraction
-            # Try 1: Direct parse
+    # Try 2: Extract from markdown code block
+    if "```" in response_text:
+        match = re.search(r'```(?:json)?\s*([\s\S]*?)\s*```', response_text)
+        if match:
             try:
-                return json.loads(response_text)
+                return json.loads(match.group(1))
             except json.JSONDecodeError:
                 pass
-            
-            # Try 2: Extract from markdown code block
-            if "```" in response_text:
-                match = re.search(r'```(?:json)?\s*([\s\S]*?)\s*```', response_text)
-                if match:
-                    try:
-                        return json.loads(match.group(1))
-                    except json.JSONDecodeError:
-                        pass
-            
-            # Try 3: Find JSON object pattern
-            match = re.search(r'\{[\s\S]*"question"[\s\S]*"options"[\s\S]*\}', response_text)
-            if match:
-                try:
-                    return json.loads(match.group(0))
-                except json.JSONDecodeError:
-                    pass
-            
-            # All parsing failed
-            print(f"⚠️ RAW RESPONSE TEXT: {response_text}")  # DEBUG LOG
-            raise ValueError(f"Could not parse JSON from response: {response_text[:200]}")
-            
-        except Exception as e:
-            print(f"⚠️ Generator error: {e}")
-            raise e
+    
+    # Try 3: Find JSON object pattern
+    match = re.search(r'\{[\s\S]*"question"[\s\S]*"options"[\s\S]*\}', response_text)
+    if match:
+        try:
+            return json.loads(match.group(0))
+        except json.JSONDecodeError:
+            pass
+    
+    # All parsing failed
+    print(f"⚠️ RAW RESPONSE TEXT: {response_text}")  # DEBUG LOG
+    raise ValueError(f"Could not parse JSON from response: {response_text[:200]}")
+
+
+def parse_question_list(response_text: str) -> List[Any]:
+    """
+    Parse a generated JSON array of questions, salvaging the complete items
+    of a malformed or truncated array (e.g. output cut off at the token limit).
+    A single object or {"questions": [...]} is accepted too.
+    """
+    response_text = response_text.strip()
+    match = re.search(r'```(?:json)?\s*([\s\S]*?)\s*(?:```|$)', response_text)
+    if match:
+        response_text = match.group(1)
+    try:
+        data = json.loads(response_text)
+        if isinstance(data, dict):
+            data = data.get("questions", [data])
+        return data if isinstance(data, list) else []
+    except json.JSONDecodeError:
+        pass
+
+    # Decode item by item; stop at the first one that does not parse
+    decoder = json.JSONDecoder()
+    start = response_text.find("[")
+    if start == -1:
+        return []
+    items = []
+    pos = start + 1
+    while pos < len(response_text):
+        while pos < len(response_text) and response_text[pos] in " \t\r\n,":
+            pos += 1
+        if pos >= len(response_text) or response_text[pos] == "]":
+            break
+        try:
+            item, pos = decoder.raw_decode(response_text, pos)
+        except json.JSONDecodeError:
+            break
+        items.append(item)
+    return items
+
+
+class GenerationUsage:
+    """Token and latency counters per generation mode ("single" / "multi")."""
+
+    def __init__(self):
+        self._modes: Dict[str, Dict[str, float]] = {}
+
+    def record(self, mode: str, questions: int, usage: Any, seconds: float):
+        totals = self._modes.setdefault(
+            mode, {"calls": 0, "questions": 0, "prompt_tokens": 0, "output_tokens": 0, "seconds": 0.0}
+        )
+        totals["calls"] += 1
+        totals["questions"] += questions
+        totals["seconds"] += seconds
+        if usage is not None:
+            totals["prompt_tokens"] += getattr(usage, "prompt_token_count", 0) or 0
+            totals["output_tokens"] += getattr(usage, "candidates_token_count", 0) or 0
+
+    def stats(self) -> Dict[str, Any]:
+        stats = {}
+        for mode, totals in self._modes.items():
+            questions = totals["questions"] or 1
+            stats[mode] = {
+                "calls": totals["calls"],
+                "questions": totals["questions"],
+                "prompt_tokens_per_question": round(totals["prompt_tokens"] / questions, 1),
+                "output_tokens_per_question": round(totals["output_tokens"] / questions, 1),
+                "seconds_per_question": round(totals["seconds"] / questions, 3),
+            }
+        return stats
+
+
+def validate_question(question: Any) -> bool:
+    """Whether a generated question is complete: text, 4 distinct options, an answer among them, an explanation."""
+    if not isinstance(question, dict):
+        return False
+    options = question.get("options")
+    return (
+        isinstance(question.get("question"), str) and bool(question["question"].strip())
+        and isinstance(options, list) and len(options) == 4
+        and all(isinstance(o, str) and o.strip() for o in options) and len(set(options)) == 4
+        and question.get("correct_answer") in options
+        and isinstance(question.get("explanation"), str) and bool(question["explanation"].strip())
+    )
 
 
 # =============================================================================
@@ -260,13 +430,32 @@ class FireCaptainQuizEngine:
     Uses injected interfaces - swap implementations without changing this class.
     """
 
-    def __init__(self, retriever: BaseRetriever, generator: BaseGenerator):
+    def __init__(self, retriever: BaseRetriever, generator: BaseGenerator, pool_enabled: bool = False):
         self.retriever = retriever
         self.generator = generator
+        self.pool = QuestionPool(self.generate_validated) if pool_enabled else None
+
+    async def _retrieve_context(self, topic: str) -> str:
+        # Blocking client, so off the event loop
+        context_chunks = await asyncio.to_thread(self.retriever.retrieve, topic)
+        return "\n\n".join(context_chunks)
+
+    async def generate_validated(self, topic: str) -> Dict[str, Any]:
+        """
+        Generate a question live with no mock fallback (used to fill the pool).
+
+        Raises:
+            ValueError: The generated question failed validate_question
+        """
+        question = await self.generator.generate(topic, await self._retrieve_context(topic))
+        if not validate_question(question):
+            raise ValueError(f"Invalid question: {str(question)[:200]}")
+        return question
 
     async def generate_quiz_question(self, topic: str) -> dict:
         """
         Generates a multiple-choice quiz question on the given topic.
+        Served from the pre-generated pool when it has one for the topic.
 
         Args:
             topic: The subject/topic for the quiz question
@@ -274,9 +463,12 @@ class FireCaptainQuizEngine:
         Returns:
             Dict with 'question', 'options', 'correct_answer', 'explanation'
         """
+        pooled = self.pool.pop(topic) if self.pool else None
+        if pooled is not None:
+            return pooled
+
         # Step 1: Retrieve context
-        context_chunks = self.retriever.retrieve(topic)
-        context_text = "\n\n".join(context_chunks)
+        context_text = await self._retrieve_context(topic)
 
         # Step 2: Generate question
         try:
@@ -288,6 +480,93 @@ class FireCaptainQuizEngine:
             print(f"⚠️ Generation failed: {e}")
             return await MockGenerator().generate(topic, context_text)
 
+    async def generate_quiz_question_stream(self, topic: str) -> AsyncIterator[str]:
+        """
+        Like generate_quiz_question, but yields the question's JSON text as
+        the model writes it. Falls back to the mock question if generation
+        fails before any output; later failures propagate.
+        """
+        pooled = self.pool.pop(topic) if self.pool else None
+        if pooled is not None:
+            yield json.dumps(pooled)
+            return
+
+        context_text = await self._retrieve_context(topic)
+
+        started = False
+        try:
+            async for chunk in self.generator.generate_stream(topic, context_text):
+                started = True
+                yield chunk
+        except Exception as e:
+            if started:
+                raise
+            print(f"⚠️ Generation failed: {e}")
+            yield json.dumps(await MockGenerator().generate(topic, context_text))
+
+    async def generate_quiz_questions(self, topic: str, n: int, max_rounds: int = 3) -> List[Dict[str, Any]]:
+        """
+        Generates up to n distinct, validated questions with one retrieval
+        and as few model calls as possible: pooled questions first, then one
+        multi-question call, then calls for only the shortfall.
+
+        Args:
+            topic: The subject/topic for the quiz questions
+            n: Questions wanted
+            max_rounds: Model calls allowed before giving up on the shortfall
+
+        Returns:
+            Up to n dicts with 'question', 'options', 'correct_answer', 'explanation'
+        """
+        questions: List[Dict[str, Any]] = []
+        while self.pool and len(questions) < n:
+            pooled = self.pool.pop(topic)
+            if pooled is None:
+                break
+            questions.append(pooled)
+        if len(questions) >= n:
+            return questions
+
+        context_text = await self._retrieve_context(topic)
+        seen = {q["question"] for q in questions}
+        for round_number in range(1, max_rounds + 1):
+            needed = n - len(questions)
+            if needed <= 0:
+                break
+            try:
+                items = await self.generator.generate_many(topic, context_text, needed)
+            except Exception as e:
+                print(f"⚠️ Multi-question generation round {round_number} failed: {e}")
+                continue
+            usable = 0
+            for item in items:
+                if len(questions) < n and validate_question(item) and item["question"] not in seen:
+                    seen.add(item["question"])
+                    questions.append(item)
+                    usable += 1
+            if usable < needed:
+                print(f"⚠️ Round {round_number}: {usable}/{needed} usable questions for {topic}")
+        return questions
+
+    def generation_stats(self) -> Optional[Dict[str, Any]]:
+        """Tokens and latency per question, when the generator tracks them."""
+        usage_stats = getattr(self.generator, "usage_stats", None)
+        return usage_stats() if usage_stats else None
+
+    def start_pool(self):
+        """Start refilling the question pool in the background (app startup hook)."""
+        if self.pool:
+            self.pool.start()
+
+    async def stop_pool(self):
+        """Stop refilling and persist the pool (app shutdown hook)."""
+        if self.pool:
+            await self.pool.stop()
+
+    def pool_stats(self) -> Optional[Dict[str, Any]]:
+        """Question pool metrics, or None when pooling is off."""
+        return self.pool.stats() if self.pool else None
+
 
 # =============================================================================
 # FACTORY
@@ -322,7 +601,7 @@ def create_quiz_engine(
             mode = "Cloud Run" if is_cloud_run else "local credentials"
             print(f"🔥 Fire Captain Quiz Engine initialized (production mode - {mode})")
             print(f"   Project: {project_id}, DataStore: {data_store_id}")
-            return FireCaptainQuizEngine(retriever, generator)
+            return FireCaptainQuizEngine(retriever, generator, pool_enabled=QUIZ_POOL_ENABLED)
         except Exception as e:
             print(f"⚠️ Failed to init Google backends, falling back to mocks: {e}")
 
@@ -10,7 +10,8 @@ Architecture:
 """
 
 import os
-from typing import Optional
+import asyncio
+from typing import AsyncIterator, Optional
 
 from app.features.base import BaseRetriever, BaseGenerator
 from app.features.quiz_engine import (
@@ -95,21 +96,12 @@ class FireCaptainTutor:
         self.retriever = retriever
         self.generator = generator
 
-    async def explain(self, subject: str, user_input: str) -> str:
-        """
-        Generate a tutoring response following the 4-step pedagogical flow.
-
-        Args:
-            subject: The topic area (e.g., "fractions", "hydraulics")
-            user_input: The user's specific question or expression of confusion
-
-        Returns:
-            str: The tutor's conversational response
-        """
+    async def _build_prompt(self, subject: str, user_input: str) -> str:
+        """Retrieve manual content for the subject and build the tutoring prompt."""
         # Step 1: Retrieve context filtered by topic
         # Build a retrieval query that prioritizes the subject area
         retrieval_query = f"{subject} fire service math hydraulics calculation"
-        context_chunks = self.retriever.retrieve(retrieval_query, top_k=3)
+        context_chunks = await asyncio.to_thread(self.retriever.retrieve, retrieval_query, top_k=3)
         context_text = "\n\n".join(context_chunks) if context_chunks else ""
 
         # Step 2: Build the tutoring prompt
@@ -123,6 +115,20 @@ RELEVANT MANUAL CONTENT:
 Using the 4-step method (Hook → Analogy → Practice → Verify), help them understand this concept.
 Remember to use the firehouse analogy mappings provided in your instructions.
 """
+        return prompt
+
+    async def explain(self, subject: str, user_input: str) -> str:
+        """
+        Generate a tutoring response following the 4-step pedagogical flow.
+
+        Args:
+            subject: The topic area (e.g., "fractions", "hydraulics")
+            user_input: The user's specific question or expression of confusion
+
+        Returns:
+            str: The tutor's conversational response
+        """
+        prompt = await self._build_prompt(subject, user_input)
 
         # Step 3: Generate response
         try:
@@ -139,6 +145,25 @@ Remember to use the firehouse analogy mappings provided in your instructions.
             print(f"⚠️ Tutor generation failed: {e}")
             return self._fallback_response(subject, user_input)
 
+    async def explain_stream(self, subject: str, user_input: str) -> AsyncIterator[str]:
+        """
+        Like explain, but yields the response text as the model writes it.
+        Falls back to the canned response if generation fails before any
+        output; later failures propagate.
+        """
+        prompt = await self._build_prompt(subject, user_input)
+
+        started = False
+        try:
+            async for chunk in self.generator.generate_stream(subject, prompt):
+                started = True
+                yield chunk
+        except Exception as e:
+            if started:
+                raise
+            print(f"⚠️ Tutor generation failed: {e}")
+            yield self._fallback_response(subject, user_input)
+
     def _fallback_response(self, subject: str, user_input: str) -> str:
         """Provide a helpful fallback when AI is unavailable."""
         return f"""
@@ -173,8 +198,8 @@ class TutorGenerator(BaseGenerator):
         )
         self._GenerationConfig = GenerationConfig
 
-    async def generate(self, topic: str, context: str) -> str:
-        """Generate a tutoring response (returns plain text, not JSON)."""
+    async def generate_stream(self, topic: str, context: str) -> AsyncIterator[str]:
+        """Stream a tutoring response chunk by chunk via the async Vertex API."""
         MAX_CONTEXT_CHARS = 15000
         if len(context) > MAX_CONTEXT_CHARS:
             print(f"⚠️ Context too long ({len(context)} chars). Trimming.")
@@ -185,19 +210,18 @@ class TutorGenerator(BaseGenerator):
             max_output_tokens=1024,
         )
 
-        try:
-            # Use streaming for faster perceived response
-            response_text = ""
-            response = self._model.generate_content(
-                context, 
-                generation_config=config,
-                stream=True
-            )
-            for chunk in response:
-                response_text += chunk.text
-            return response_text.strip()
-        except Exception as e:
-            raise e
+        response = await self._model.generate_content_async(
+            context, 
+            generation_config=config,
+            stream=True
+        )
+        async for chunk in response:
+            yield chunk.text
+
+    async def generate(self, topic: str, context: str) -> str:
+        """Generate a tutoring response (returns plain text, not JSON)."""
+        response_text = "".join([chunk async for chunk in self.generate_stream(topic, context)])
+        return response_text.strip()
 
 
 class MockTutorGenerator(BaseGenerator):
@@ -0,0 +1,218 @@
+"""
+Mechanical Diagram Matcher
+Picks a teaching diagram for a tutor question without touching the database.
+
+Architecture:
+- KeywordAutomaton is an Aho-Corasick automaton compiled once over every
+  hero and concept keyword; one pass over the question finds all keywords,
+  and only whole-word matches count ("ma" does not match "math"), allowing
+  a plural "s"/"es" ("pulleys", "meshes")
+- ImageMatcher keeps an in-memory concept -> image_path index built from
+  the question bank (via the full-text index) and rebuilds it on a
+  background thread when db.get_content_version() moves
+"""
+
+import random
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Optional, Set
+
+from app import db
+
+# CURATED HERO IMAGES - clean teaching diagrams generated with Imagen
+# These illustrate concepts clearly with labels, not confusing quiz diagrams
+HERO_IMAGES = {
+    # Lever concepts -> crowbar lifting rock with LOAD/EFFORT/FULCRUM labels
+    "lever": "/assets/teaching/lever.png",
+    "crowbar": "/assets/teaching/lever.png",
+    "halligan": "/assets/teaching/lever.png",
+    "fulcrum": "/assets/teaching/lever.png",
+    "pry": "/assets/teaching/lever.png",
+    "wheelbarrow": "/assets/teaching/lever.png",  # Also a lever (class 2)
+    # Pulley concepts -> single pulley with EFFORT/LOAD/GRAVITY labels
+    "pulley": "/assets/teaching/pulley.png",
+    "block and tackle": "/assets/teaching/pulley.png",
+    "hoist": "/assets/teaching/pulley.png",
+    "rope": "/assets/teaching/pulley.png",
+    # Gear concepts -> two meshing gears with DRIVER/DRIVEN labels
+    "gear": "/assets/teaching/gears.png",
+    "gears": "/assets/teaching/gears.png",
+    "teeth": "/assets/teaching/gears.png",
+    "bicycle": "/assets/teaching/gears.png",
+}
+
+# Fallback: question-bank diagrams for these concepts
+CONCEPT_KEYWORDS = {
+    "pulley": ["pulley", "block and tackle", "rope", "lift", "hoist"],
+    "lever": ["lever", "crowbar", "pry", "fulcrum", "halligan"],
+    "gear": ["gear", "teeth", "rotation", "clockwise", "counter-clockwise", "mesh"],
+    "wheel": ["wheelbarrow", "wheel", "axle"],
+    "incline": ["ramp", "incline", "slope", "wedge"],
+    "screw": ["screw", "thread", "jack"],
+    "force": ["force", "effort", "load", "mechanical advantage", "ma"],
+}
+
+
+PLURAL_SUFFIXES = ("", "s", "es")
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+
+def _ends_word(text: str, after: int) -> bool:
+    """Whether a word ends at `after`, optionally after a plural suffix."""
+    for suffix in PLURAL_SUFFIXES:
+        end = after + len(suffix)
+        if text.startswith(suffix, after) and (end == len(text) or not _is_word_char(text[end])):
+            return True
+    return False
+
+
+class KeywordAutomaton:
+    """Aho-Corasick automaton over lowercase keywords, reporting whole-word (or plural) matches only."""
+
+    def __init__(self, keywords: List[str]):
+        # Trie as parallel lists: goto[state][char] -> state, out[state] -> keywords ending here
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[str]] = [[]]
+        for keyword in keywords:
+            self._add(keyword.lower())
+        self._link()
+
+    def _add(self, keyword: str):
+        state = 0
+        for ch in keyword:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            state = nxt
+        if keyword not in self._out[state]:
+            self._out[state].append(keyword)
+
+    def _link(self):
+        # Breadth-first: a state's failure link is the longest proper suffix that is also a trie path
+        pending = deque(self._goto[0].values())
+        while pending:
+            state = pending.popleft()
+            for ch, nxt in self._goto[state].items():
+                pending.append(nxt)
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                link = self._goto[fallback].get(ch, 0)
+                self._fail[nxt] = link if link != nxt else 0
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def find(self, text: str) -> Set[str]:
+        """Keywords that occur in `text` as whole words or their plurals (case-insensitive)."""
+        text = text.lower()
+        found: Set[str] = set()
+        state = 0
+        for end, ch in enumerate(text):
+            while state and ch not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(ch, 0)
+            for keyword in self._out[state]:
+                start = end - len(keyword) + 1
+                if (start == 0 or not _is_word_char(text[start - 1])) and _ends_word(text, end + 1):
+                    found.add(keyword)
+        return found
+
+
+# Compiled once at import: keyword -> hero image priority, keyword -> concepts
+_HERO_PRIORITY = {keyword: rank for rank, keyword in enumerate(HERO_IMAGES)}
+_KEYWORD_CONCEPTS: Dict[str, List[str]] = {}
+for _concept, _keywords in CONCEPT_KEYWORDS.items():
+    for _keyword in _keywords:
+        _KEYWORD_CONCEPTS.setdefault(_keyword, []).append(_concept)
+_AUTOMATON = KeywordAutomaton(list(HERO_IMAGES) + list(_KEYWORD_CONCEPTS))
+
+
+class ImageMatcher:
+    """Matches tutor questions to diagrams from the hero set or the concept index."""
+
+    def __init__(self):
+        self._concept_images: Optional[Dict[str, List[str]]] = None
+        self._version: Optional[int] = None
+        self._load_lock = threading.Lock()
+        self._reloading = False
+        self._reloads = 0
+        self._last_load_seconds: Optional[float] = None
+
+    def load(self) -> Dict[str, List[str]]:
+        """Build the concept -> image_path index from the question bank."""
+        with self._load_lock:
+            started = time.perf_counter()
+            version = db.get_content_version()
+            concept_images = db.get_mechanical_images_by_concept(CONCEPT_KEYWORDS)
+            self._concept_images, self._version = concept_images, version
+            self._reloads += 1
+            self._last_load_seconds = time.perf_counter() - started
+        return concept_images
+
+    def _reload_in_background(self):
+        try:
+            self.load()
+        except Exception as e:
+            print(f"⚠️ Image index reload failed: {e}")
+        finally:
+            self._reloading = False
+
+    def _index(self) -> Dict[str, List[str]]:
+        concept_images = self._concept_images
+        if concept_images is None:
+            return self.load()
+        if self._version != db.get_content_version() and not self._reloading:
+            self._reloading = True
+            threading.Thread(target=self._reload_in_background, name="image-index-reload", daemon=True).start()
+        return concept_images
+
+    def match(self, query: str) -> Optional[str]:
+        """
+        Find a mechanical aptitude image that matches the user's query.
+        Curated hero images win; otherwise a random question-bank diagram
+        for any matched concept.
+
+        Returns:
+            image_path if found, None otherwise
+        """
+        found = _AUTOMATON.find(query)
+        if not found:
+            return None
+
+        heroes = [keyword for keyword in found if keyword in _HERO_PRIORITY]
+        if heroes:
+            return HERO_IMAGES[min(heroes, key=_HERO_PRIORITY.__getitem__)]
+
+        concept_images = self._index()
+        candidates: Set[str] = set()
+        for keyword in found:
+            for concept in _KEYWORD_CONCEPTS.get(keyword, ()):
+                candidates.update(concept_images.get(concept, ()))
+        return random.choice(sorted(candidates)) if candidates else None
+
+    def stats(self) -> Dict[str, object]:
+        concept_images = self._concept_images or {}
+        return {
+            "version": self._version,
+            "concepts": len(concept_images),
+            "images": len({path for paths in concept_images.values() for path in paths}),
+            "last_load_seconds": self._last_load_seconds,
+            "reloads": self._reloads,
+        }
+
+
+# Global image matcher
+image_matcher = ImageMatcher()
+
+
+def find_matching_mechanical_image(query: str) -> Optional[str]:
+    """Diagram for a tutor question (hero image, bank diagram, or None). No DB work once loaded."""
+    return image_matcher.match(query)
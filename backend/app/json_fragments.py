@@ -0,0 +1,185 @@
+"""
+Pre-encoded JSON Fragments
+Serialized JSON bytes for bank questions and flashcards, cached per row.
+
+Question and flashcard content only changes when the content version
+moves, so each row is encoded once per (shape, id, version) and list
+responses are assembled by joining the cached bytes. This skips building
+and validating a Pydantic model per row and re-encoding the same content
+on every request.
+
+Per-user fields (e.g. a deck entry's added_at) are appended to the cached
+fragment when the response is assembled.
+"""
+
+import os
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional
+
+from fastapi import Response
+
+FRAGMENT_CACHE_SIZE = int(os.environ.get("FRAGMENT_CACHE_SIZE", "50000"))
+
+
+def encode_json(value: Any) -> bytes:
+    """Encode exactly like Starlette's JSONResponse, so cached bytes match uncached responses."""
+    return json.dumps(value, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+
+# =============================================================================
+# ROW SHAPES
+# =============================================================================
+
+def _quiz_question(q: Dict[str, Any]) -> Dict[str, Any]:
+    # Field order of QuizResponse
+    return {
+        "id": q["id"],
+        "question": q["question"],
+        "options": q["options"],
+        "correct_answer": q["correct_answer"],
+        "explanation": q["explanation"],
+        "image_path": q.get("image_path"),
+    }
+
+
+def _deck_question(q: Dict[str, Any]) -> Dict[str, Any]:
+    # Field order of db.get_study_deck, minus added_at
+    return {
+        "id": q["id"],
+        "subject": q["subject"],
+        "question": q["question"],
+        "options": q["options"],
+        "correct_answer": q["correct_answer"],
+        "explanation": q["explanation"],
+    }
+
+
+def _deck_flashcard(c: Dict[str, Any]) -> Dict[str, Any]:
+    # Field order of db.get_flashcard_study_deck, minus added_at
+    return {
+        "id": c["id"],
+        "subject": c["subject"],
+        "card_type": c["card_type"],
+        "front_content": c["front_content"],
+        "back_content": c["back_content"],
+        "hint": c["hint"],
+        "source": c["source"],
+    }
+
+
+SHAPES: Dict[str, Callable[[Dict[str, Any]], Dict[str, Any]]] = {
+    "quiz_question": _quiz_question,
+    "deck_question": _deck_question,
+    "deck_flashcard": _deck_flashcard,
+}
+
+
+# =============================================================================
+# FRAGMENT CACHE
+# =============================================================================
+
+class FragmentCache:
+    """
+    Bounded LRU cache of encoded rows, keyed by (shape, id, content version).
+
+    Entries for an old version are never looked up again once the version
+    moves, so they age out through normal LRU eviction.
+    """
+
+    def __init__(self, max_size: int = FRAGMENT_CACHE_SIZE):
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[tuple[str, str, int], bytes]" = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+
+    def encode_rows(self, shape: str, version: int, rows: List[Dict[str, Any]]) -> List[bytes]:
+        """
+        Encoded JSON object for each row, from cache where possible.
+
+        Args:
+            shape: Key of SHAPES selecting the fields and their order
+            version: Content version the rows were read at
+            rows: Rows with at least the fields of the shape (and "id")
+
+        Returns:
+            One bytes fragment per row, in order
+        """
+        build = SHAPES[shape]
+        fragments: List[Optional[bytes]] = []
+        missing = []
+        with self._lock:
+            for i, row in enumerate(rows):
+                key = (shape, row["id"], version)
+                fragment = self._entries.get(key)
+                if fragment is None:
+                    missing.append(i)
+                else:
+                    self._entries.move_to_end(key)
+                fragments.append(fragment)
+            self._hits += len(rows) - len(missing)
+            self._misses += len(missing)
+
+        if missing:
+            encoded = [(i, encode_json(build(rows[i]))) for i in missing]
+            with self._lock:
+                for i, fragment in encoded:
+                    fragments[i] = fragment
+                    if self.max_size > 0:
+                        self._entries[(shape, rows[i]["id"], version)] = fragment
+                while len(self._entries) > self.max_size:
+                    self._entries.popitem(last=False)
+        return fragments
+
+    def clear(self):
+        """Drop every entry and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self._hits = self._misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for /api/metrics."""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": round(self._hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+# Global fragment cache
+fragment_cache = FragmentCache()
+
+
+def get_fragment_cache_stats() -> Dict[str, Any]:
+    """Fragment cache size and hit rate for /api/metrics."""
+    return fragment_cache.stats()
+
+
+# =============================================================================
+# RESPONSE ASSEMBLY
+# =============================================================================
+
+def with_field(fragment: bytes, name: str, value: Any) -> bytes:
+    """Append one field to an encoded JSON object."""
+    return b"%s,%s:%s}" % (fragment[:-1], encode_json(name), encode_json(value))
+
+
+def list_response(field: str, fragments: List[bytes], count: bool = False) -> Response:
+    """
+    JSON response {field: [...]} (plus "count" when asked) built from fragments.
+
+    Args:
+        field: Name of the list field
+        fragments: Encoded JSON objects
+        count: Whether to add "count": len(fragments) after the list
+    """
+    body = b'{"%s":[%s]' % (field.encode(), b",".join(fragments))
+    if count:
+        body += b',"count":%d' % len(fragments)
+    return Response(content=body + b"}", media_type="application/json")
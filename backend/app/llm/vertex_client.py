@@ -4,7 +4,7 @@ Handles communication with Google Vertex AI (Gemini).
 """
 
 import os
-from typing import Optional
+from typing import AsyncIterator, Optional
 
 import vertexai
 from vertexai.generative_models import GenerativeModel, GenerationConfig
@@ -56,7 +56,8 @@ class VertexAIClient:
                 max_output_tokens=max_tokens,
             )
             
-            response = self.model.generate_content(
+            # Async API: concurrent reviews overlap instead of blocking the event loop
+            response = await self.model.generate_content_async(
                 prompt,
                 generation_config=config,
             )
@@ -66,6 +67,46 @@ class VertexAIClient:
             print(f"⚠️ Vertex AI error: {e}")
             return self._mock_response(prompt)
     
+    async def generate_stream(
+        self,
+        prompt: str,
+        temperature: float = 0.3,
+        max_tokens: int = 2048,
+    ) -> AsyncIterator[str]:
+        """
+        Stream a response from the model as text chunks.
+        Falls back to the mock response if the call fails before any output.
+        
+        Args:
+            prompt: The input prompt
+            temperature: Sampling temperature (0-1)
+            max_tokens: Maximum tokens in response
+        """
+        if not self._initialized:
+            yield self._mock_response(prompt)
+            return
+        
+        started = False
+        try:
+            config = GenerationConfig(
+                temperature=temperature,
+                max_output_tokens=max_tokens,
+            )
+            
+            response = await self.model.generate_content_async(
+                prompt,
+                generation_config=config,
+                stream=True,
+            )
+            async for chunk in response:
+                started = True
+                yield chunk.text
+        except Exception as e:
+            print(f"⚠️ Vertex AI error: {e}")
+            if started:
+                raise
+            yield self._mock_response(prompt)
+    
     def _mock_response(self, prompt: str) -> str:
         """
         Generate a mock response when Vertex AI is not configured.
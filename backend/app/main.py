@@ -4,13 +4,21 @@ Main application entry point with CORS and API routes.
 """
 
 import os
+import io
+import time
+import random
+import asyncio
+import csv
+import json
 import uuid
+import hashlib
 from pathlib import Path
 from typing import List
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI, UploadFile, File, HTTPException, Request
+from fastapi import FastAPI, UploadFile, File, HTTPException, Request, Depends, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from dotenv import load_dotenv
 from slowapi.errors import RateLimitExceeded
@@ -20,12 +28,19 @@ from app.rate_limit import limiter, RateLimits, get_rate_limit_exceeded_handler
 from app.ingestion import PDFIngestionPipeline
 from app.rag_engine import RAGEngine
 from app.features.captains_review import CaptainsReviewFeature
-from app.features.quiz_engine import create_quiz_engine, FireCaptainQuizEngine
+from app.features.quiz_engine import create_quiz_engine, FireCaptainQuizEngine, parse_question_json
 from app.features.tutor import create_tutor_engine, FireCaptainTutor
 from app import db
+from app import db_async as adb
+from app.content_bank import content_bank, recent_questions, prefer_fresh, CONTENT_BANK_ENABLED, get_content_bank_stats
+from app.image_matcher import image_matcher, find_matching_mechanical_image
+from app.maintenance import start_maintenance, stop_maintenance, get_maintenance_stats
+from app.streaming import sse_event, sse_response, stream_fields, stream_text
+from app.json_fragments import fragment_cache, get_fragment_cache_stats, list_response, with_field
 from app.auth import (
-    hash_password, verify_password, create_session, 
-    get_user_from_token, invalidate_session
+    hash_password, verify_password, acreate_session,
+    aget_user_from_token, ainvalidate_session, get_session_cache_stats,
+    load_revocations, get_revocation_stats
 )
 
 # Load environment variables based on NODE_ENV
@@ -83,8 +98,26 @@ async def lifespan(app: FastAPI):
     rag_engine = RAGEngine(chroma_dir=str(chroma_dir))
     captains_review = CaptainsReviewFeature(rag_engine=rag_engine)
     
+    # Signed-token logouts are checked against an in-memory filter
+    load_revocations()
+    
+    # Load the question/flashcard bank into memory before the first request
+    if CONTENT_BANK_ENABLED:
+        content_bank.load()
+    
+    # Compile the diagram index so tutor requests match images without DB work
+    image_matcher.load()
+    
+    # Pick up newly published content bank generations without a restart
+    db.start_content_watcher()
+    
+    # Expired-session purges, planner stats, vacuum and checkpoints run off the request path
+    start_maintenance()
+    
     # Initialize Fire Captain Quiz Engine (gracefully handles missing creds)
     quiz_engine = create_quiz_engine()
+    # Pre-generate questions for in-demand topics in the background
+    quiz_engine.start_pool()
     
     # Initialize Fire Captain Tutor Engine
     tutor_engine = create_tutor_engine()
@@ -92,6 +125,10 @@ async def lifespan(app: FastAPI):
     print("🔥 Firefighter Exam Prep backend initialized!")
     yield
     print("👋 Shutting down...")
+    stop_maintenance()
+    await quiz_engine.stop_pool()
+    adb.shutdown()
+    db.close_db()
 
 
 app = FastAPI(
@@ -164,6 +201,7 @@ class QuizResponse(BaseModel):
     options: List[str]
     correct_answer: str
     explanation: str
+    image_path: str | None = None  # Diagram for mechanical aptitude questions
 
 
 class ReportRequest(BaseModel):
@@ -241,6 +279,20 @@ class QuestionBankResponse(BaseModel):
 
 # ============== API Endpoints ==============
 
+# Routes that touch SQLite share one pooled connection per request
+DB_CONN = [Depends(db.request_connection)]
+
+
+def etag_json_response(request: Request, payload: dict) -> Response:
+    """JSON response with a content ETag; answers 304 when the client's copy is current."""
+    body = json.dumps(payload, separators=(",", ":")).encode()
+    etag = f'"{hashlib.sha1(body).hexdigest()[:16]}"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
 @app.get("/")
 async def root():
     return {"message": "🔥 Firefighter Exam Prep API", "status": "operational"}
@@ -248,10 +300,32 @@ async def root():
 
 @app.get("/api/health")
 async def health_check():
+    content = db.get_content_snapshot_info()
     return {
         "status": "healthy", 
         "rag_ready": rag_engine is not None,
-        "cloud_logging_enabled": cloud_logging_enabled
+        "cloud_logging_enabled": cloud_logging_enabled,
+        "content_version": content["generation"],
+        "content_loaded_at": content["loaded_at"],
+    }
+
+
+@app.get("/api/metrics")
+async def metrics():
+    """Operational metrics for dashboards and alerting."""
+    return {
+        "db_sync": db.get_sync_metrics(),
+        "db_executor": adb.get_executor_metrics(),
+        "db_writes": db.get_write_metrics(),
+        "content_snapshot": db.get_content_snapshot_info(),
+        "content_bank": get_content_bank_stats(),
+        "json_fragments": get_fragment_cache_stats(),
+        "image_matcher": image_matcher.stats(),
+        "session_cache": get_session_cache_stats(),
+        "token_revocations": get_revocation_stats(),
+        "maintenance": get_maintenance_stats(),
+        "quiz_pool": quiz_engine.pool_stats() if quiz_engine else None,
+        "quiz_generation": quiz_engine.generation_stats() if quiz_engine else None,
     }
 
 
@@ -277,7 +351,7 @@ async def error_test():
 
 # ============== AUTH ENDPOINTS ==============
 
-@app.post("/api/auth/register", response_model=AuthResponse)
+@app.post("/api/auth/register", response_model=AuthResponse, dependencies=DB_CONN)
 async def register(request: RegisterRequest):
     """Register a new user account."""
     if not request.email or not request.password:
@@ -287,45 +361,45 @@ async def register(request: RegisterRequest):
         raise HTTPException(status_code=400, detail="Password must be at least 6 characters")
     
     # Check if user already exists
-    existing = db.get_user_by_email(request.email)
+    existing = await adb.get_user_by_email(request.email)
     if existing:
         raise HTTPException(status_code=409, detail="Email already registered")
     
     try:
         password_hash = hash_password(request.password)
-        user_id = db.create_user(request.email, password_hash)
-        token = create_session(user_id, request.email)
+        user_id = await adb.create_user(request.email, password_hash)
+        token = await acreate_session(user_id, request.email)
         
         return AuthResponse(token=token, user_id=user_id, email=request.email)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Registration failed: {str(e)}")
 
 
-@app.post("/api/auth/login", response_model=AuthResponse)
+@app.post("/api/auth/login", response_model=AuthResponse, dependencies=DB_CONN)
 async def login(request: LoginRequest):
     """Login with email and password."""
-    user = db.get_user_by_email(request.email)
+    user = await adb.get_user_by_email(request.email)
     if not user:
         raise HTTPException(status_code=401, detail="Invalid credentials")
     
     if not verify_password(request.password, user["password_hash"]):
         raise HTTPException(status_code=401, detail="Invalid credentials")
     
-    token = create_session(user["id"], user["email"])
+    token = await acreate_session(user["id"], user["email"])
     return AuthResponse(token=token, user_id=user["id"], email=user["email"])
 
 
-@app.post("/api/auth/logout")
+@app.post("/api/auth/logout", dependencies=DB_CONN)
 async def logout(token: str):
     """Logout and invalidate session."""
-    invalidate_session(token)
+    await ainvalidate_session(token)
     return {"status": "logged_out"}
 
 
-@app.get("/api/auth/me", response_model=UserResponse)
+@app.get("/api/auth/me", response_model=UserResponse, dependencies=DB_CONN)
 async def get_current_user(token: str):
     """Get current user from token."""
-    user = get_user_from_token(token)
+    user = await aget_user_from_token(token)
     if not user:
         raise HTTPException(status_code=401, detail="Invalid or expired token")
     return UserResponse(user_id=user["user_id"], email=user["email"])
@@ -333,7 +407,7 @@ async def get_current_user(token: str):
 
 # ============== EMAIL LEADS ENDPOINTS ==============
 
-@app.post("/api/leads")
+@app.post("/api/leads", dependencies=DB_CONN)
 async def create_lead(request: EmailLeadRequest):
     """
     Capture email lead from welcome modal.
@@ -343,7 +417,7 @@ async def create_lead(request: EmailLeadRequest):
         raise HTTPException(status_code=400, detail="Valid email required")
     
     try:
-        lead_id = db.create_email_lead(request.email)
+        lead_id = await adb.create_email_lead(request.email)
         print(f"📧 [LEAD] Email captured: {request.email}")
         return {"status": "captured", "lead_id": lead_id}
     except Exception as e:
@@ -352,46 +426,50 @@ async def create_lead(request: EmailLeadRequest):
 
 # ============== QUESTION BANK ENDPOINTS ==============
 
-@app.post("/api/quiz/bank", response_model=QuestionBankResponse)
+@app.post("/api/quiz/bank", response_model=QuestionBankResponse, dependencies=DB_CONN)
 async def get_questions_from_bank(request: QuestionBankRequest, token: str = ""):
     """
     Fetch quiz questions from pre-generated bank.
     Optionally mix in questions from user's study deck.
+    Deck and bank questions are drawn together: no duplicates, subjects
+    honored for both, and questions this user was just served are avoided.
+    Rows are served as cached JSON fragments (QuizResponse shape).
     """
-    questions = []
+    user = await aget_user_from_token(token) if token else None
+    recent = recent_questions.get(user["user_id"]) if user else set()
     
     # Calculate how many from study deck vs bank
     study_deck_count = 0
-    bank_count = request.count
+    if user and request.study_deck_ratio > 0:
+        study_deck_count = int(request.count * request.study_deck_ratio)
     
-    if request.study_deck_ratio > 0 and token:
-        user = get_user_from_token(token)
-        if user:
-            study_deck_count = int(request.count * request.study_deck_ratio)
-            bank_count = request.count - study_deck_count
-            
-            # Get questions from study deck
-            deck_questions = db.get_study_deck_questions(user["user_id"], study_deck_count)
-            for q in deck_questions:
-                questions.append(QuizResponse(
-                    id=q["id"],
-                    question=q["question"],
-                    options=q["options"],
-                    correct_answer=q["correct_answer"],
-                    explanation=q["explanation"]
-                ))
-    
-    # Get remaining questions from bank
-    if bank_count > 0:
-        bank_questions = db.get_random_questions(request.subjects, bank_count)
-        for q in bank_questions:
-            questions.append(QuizResponse(
-                id=q["id"],
-                question=q["question"],
-                options=q["options"],
-                correct_answer=q["correct_answer"],
-                explanation=q["explanation"]
-            ))
+    if CONTENT_BANK_ENABLED:
+        deck_ids = await adb.get_study_deck_ids(user["user_id"]) if study_deck_count else []
+        version, rows = content_bank.assemble_quiz(
+            request.subjects, request.count, deck_ids, study_deck_count, recent
+        )
+    else:
+        version = db.get_content_version()
+        rows = []
+        if study_deck_count:
+            # Same rules as assemble_quiz: subjects filtered before sampling, recent ids avoided
+            deck_ids = await adb.get_study_deck_ids(user["user_id"], request.subjects)
+            shuffled = random.sample(deck_ids, len(deck_ids))
+            chosen = prefer_fresh(shuffled, min(study_deck_count, request.count), set(), recent)
+            rows = await adb.get_questions_by_ids(chosen)
+        bank_count = request.count - len(rows)
+        if bank_count > 0:
+            # Over-fetch so repeats can be dropped without a second query
+            bank_questions = await adb.get_random_questions(
+                request.subjects, bank_count + min(len(recent), bank_count)
+            )
+            by_id = {q["id"]: q for q in bank_questions}
+            ids = prefer_fresh(list(by_id), bank_count, {q["id"] for q in rows}, recent)
+            rows += [by_id[i] for i in ids]
+    
+    if user and rows:
+        recent_questions.add(user["user_id"], [q["id"] for q in rows])
+    questions = fragment_cache.encode_rows("quiz_question", version, rows)
     
     # If bank is empty, fall back to live generation
     if not questions:
@@ -400,55 +478,115 @@ async def get_questions_from_bank(request: QuestionBankRequest, token: str = "")
             detail="Question bank is empty. Please wait for questions to be generated."
         )
     
-    return QuestionBankResponse(questions=questions)
+    return list_response("questions", questions)
 
 
-@app.get("/api/quiz/bank/stats")
-async def get_bank_stats():
+@app.get("/api/quiz/bank/stats", dependencies=DB_CONN)
+async def get_bank_stats(request: Request):
     """Get question bank statistics."""
     subjects = ["human-relations", "mechanical-aptitude", "fire-terms", "math"]
+    counters = await adb.get_stats_counters()
     stats = {}
     for subject in subjects:
-        stats[subject] = db.get_question_count(subject)
-    stats["total"] = db.get_question_count()
-    return stats
+        stats[subject] = counters.get(f"questions/subject/{subject}", 0)
+    stats["total"] = counters.get("questions", 0)
+    return etag_json_response(request, stats)
+
+
+# ============== SEARCH ENDPOINTS ==============
+
+SEARCH_KINDS = ("questions", "flashcards", "all")
+
+
+@app.get("/api/search")
+@limiter.limit(RateLimits.STANDARD)
+async def search_bank(request: Request, q: str, subjects: str = "", kind: str = "questions", limit: int = 20):
+    """
+    Full-text search over the question and flashcard bank.
+    The last word matches as a prefix, so this can back search-as-you-type.
+    
+    Args:
+        q: Search text
+        subjects: Comma-separated subjects to filter by (default: all)
+        kind: "questions", "flashcards" or "all"
+        limit: Maximum results per kind (1-50)
+    """
+    if kind not in SEARCH_KINDS:
+        raise HTTPException(status_code=400, detail=f"kind must be one of: {', '.join(SEARCH_KINDS)}")
+    subject_list = [s.strip() for s in subjects.split(",") if s.strip()] or None
+    limit = min(max(limit, 1), 50)
+    
+    results = {"query": q}
+    if kind in ("questions", "all"):
+        results["questions"] = await adb.search_questions(q, subject_list, limit)
+    if kind in ("flashcards", "all"):
+        results["flashcards"] = await adb.search_flashcards(q, subject_list, limit)
+    return results
 
 
 # ============== STUDY DECK ENDPOINTS ==============
 
-@app.get("/api/study-deck")
+@app.get("/api/study-deck", dependencies=DB_CONN)
 async def get_study_deck(token: str):
     """Get all questions in user's study deck."""
-    user = get_user_from_token(token)
+    user = await aget_user_from_token(token)
     if not user:
         raise HTTPException(status_code=401, detail="Invalid or expired token")
     
-    questions = db.get_study_deck(user["user_id"])
-    return {"questions": questions, "count": len(questions)}
+    version = db.get_content_version()
+    questions = await adb.get_study_deck(user["user_id"])
+    fragments = fragment_cache.encode_rows("deck_question", version, questions)
+    return list_response(
+        "questions",
+        [with_field(f, "added_at", q["added_at"]) for f, q in zip(fragments, questions)],
+        count=True
+    )
 
 
-@app.post("/api/study-deck/add")
+@app.post("/api/study-deck/add", dependencies=DB_CONN)
 async def add_to_study_deck(request: StudyDeckAddRequest, token: str):
     """Add a question to user's study deck."""
-    user = get_user_from_token(token)
+    user = await aget_user_from_token(token)
     if not user:
         raise HTTPException(status_code=401, detail="Invalid or expired token")
     
     try:
-        entry_id = db.add_to_study_deck(user["user_id"], request.question_id)
+        entry_id = await adb.add_to_study_deck(user["user_id"], request.question_id)
         return {"status": "added", "entry_id": entry_id}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to add to deck: {str(e)}")
 
 
-@app.delete("/api/study-deck/{question_id}")
+class DeckBatchRequest(BaseModel):
+    add: List[str] = []
+    remove: List[str] = []
+
+
+@app.post("/api/study-deck/batch", dependencies=DB_CONN)
+async def batch_update_study_deck(request: DeckBatchRequest, token: str):
+    """
+    Add and remove many questions in one transaction.
+    Lets the frontend sync a whole review session in one round-trip.
+    """
+    user = await aget_user_from_token(token)
+    if not user:
+        raise HTTPException(status_code=401, detail="Invalid or expired token")
+    
+    try:
+        result = await adb.apply_study_deck_changes(user["user_id"], request.add, request.remove)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"status": "applied", **result}
+
+
+@app.delete("/api/study-deck/{question_id}", dependencies=DB_CONN)
 async def remove_from_study_deck(question_id: str, token: str):
     """Remove a question from user's study deck."""
-    user = get_user_from_token(token)
+    user = await aget_user_from_token(token)
     if not user:
         raise HTTPException(status_code=401, detail="Invalid or expired token")
     
-    removed = db.remove_from_study_deck(user["user_id"], question_id)
+    removed = await adb.remove_from_study_deck(user["user_id"], question_id)
     if removed:
         return {"status": "removed"}
     return {"status": "not_found"}
@@ -460,39 +598,59 @@ class FlashcardStudyDeckAddRequest(BaseModel):
     flashcard_id: str
 
 
-@app.get("/api/flashcard-study-deck")
+@app.get("/api/flashcard-study-deck", dependencies=DB_CONN)
 async def get_flashcard_study_deck(token: str):
     """Get all flashcards in user's flashcard study deck."""
-    user = get_user_from_token(token)
+    user = await aget_user_from_token(token)
     if not user:
         raise HTTPException(status_code=401, detail="Invalid or expired token")
     
-    flashcards = db.get_flashcard_study_deck(user["user_id"])
-    return {"flashcards": flashcards, "count": len(flashcards)}
+    version = db.get_content_version()
+    flashcards = await adb.get_flashcard_study_deck(user["user_id"])
+    fragments = fragment_cache.encode_rows("deck_flashcard", version, flashcards)
+    return list_response(
+        "flashcards",
+        [with_field(f, "added_at", c["added_at"]) for f, c in zip(fragments, flashcards)],
+        count=True
+    )
 
 
-@app.post("/api/flashcard-study-deck/add")
+@app.post("/api/flashcard-study-deck/add", dependencies=DB_CONN)
 async def add_to_flashcard_study_deck(request: FlashcardStudyDeckAddRequest, token: str):
     """Add a flashcard to user's flashcard study deck."""
-    user = get_user_from_token(token)
+    user = await aget_user_from_token(token)
     if not user:
         raise HTTPException(status_code=401, detail="Invalid or expired token")
     
     try:
-        entry_id = db.add_to_flashcard_study_deck(user["user_id"], request.flashcard_id)
+        entry_id = await adb.add_to_flashcard_study_deck(user["user_id"], request.flashcard_id)
         return {"status": "added", "entry_id": entry_id}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to add to deck: {str(e)}")
 
 
-@app.delete("/api/flashcard-study-deck/{flashcard_id}")
+@app.post("/api/flashcard-study-deck/batch", dependencies=DB_CONN)
+async def batch_update_flashcard_study_deck(request: DeckBatchRequest, token: str):
+    """Add and remove many flashcards in one transaction."""
+    user = await aget_user_from_token(token)
+    if not user:
+        raise HTTPException(status_code=401, detail="Invalid or expired token")
+    
+    try:
+        result = await adb.apply_flashcard_study_deck_changes(user["user_id"], request.add, request.remove)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"status": "applied", **result}
+
+
+@app.delete("/api/flashcard-study-deck/{flashcard_id}", dependencies=DB_CONN)
 async def remove_from_flashcard_study_deck(flashcard_id: str, token: str):
     """Remove a flashcard from user's flashcard study deck."""
-    user = get_user_from_token(token)
+    user = await aget_user_from_token(token)
     if not user:
         raise HTTPException(status_code=401, detail="Invalid or expired token")
     
-    removed = db.remove_from_flashcard_study_deck(user["user_id"], flashcard_id)
+    removed = await adb.remove_from_flashcard_study_deck(user["user_id"], flashcard_id)
     if removed:
         return {"status": "removed"}
     return {"status": "not_found"}
@@ -600,14 +758,14 @@ async def generate_quiz_question(request: Request, quiz_request: QuizRequest):
         raise HTTPException(status_code=500, detail=f"Quiz generation failed: {error_msg}")
 
 
-@app.post("/api/quiz/report")
+@app.post("/api/quiz/report", dependencies=DB_CONN)
 async def report_question(request: ReportRequest):
     """
     Log a flagged question for manual review.
     Saves to database for admin review.
     """
     try:
-        report_id = db.report_question(
+        report_id = await adb.report_question(
             question_id=request.question_id,
             reason=request.reason
         )
@@ -617,7 +775,7 @@ async def report_question(request: ReportRequest):
         raise HTTPException(status_code=500, detail=f"Reporting failed: {str(e)}")
 
 
-@app.post("/api/feedback")
+@app.post("/api/feedback", dependencies=DB_CONN)
 async def submit_feedback(request: FeedbackRequest):
     """
     Submit general user feedback/ideas for improvement.
@@ -627,7 +785,7 @@ async def submit_feedback(request: FeedbackRequest):
         raise HTTPException(status_code=400, detail="Feedback message is required")
     
     try:
-        feedback_id = db.submit_feedback(
+        feedback_id = await adb.submit_feedback(
             study_mode=request.study_mode,
             message=request.message.strip()
         )
@@ -651,7 +809,7 @@ async def get_tutoring(request: Request, tutor_request: TutorRequest):
     
     # If mechanical aptitude is selected, find a diagram matching the user's question
     if "mechanical-aptitude" in tutor_request.subjects:
-        matched_image = db.find_matching_mechanical_image(tutor_request.user_input)
+        matched_image = find_matching_mechanical_image(tutor_request.user_input)
         if matched_image:
             image_url = matched_image
     
@@ -671,6 +829,90 @@ async def get_tutoring(request: Request, tutor_request: TutorRequest):
         raise HTTPException(status_code=500, detail=f"Tutoring failed: {error_msg}")
 
 
+# ============== STREAMING (SSE) ENDPOINTS ==============
+# Opt-in variants of the endpoints above; see app/streaming.py for the event protocol
+
+QUIZ_FIELDS = ("question", "options", "correct_answer", "explanation")
+REVIEW_FIELDS = ("grade", "feedback", "textbook_answer")
+
+
+@app.post("/api/quiz/generate/stream")
+@limiter.limit(RateLimits.AI_GENERATE)
+async def stream_quiz_question(request: Request, quiz_request: QuizRequest):
+    """
+    SSE variant of /api/quiz/generate: a `field` event per question field
+    as soon as it is complete, then `done` with the full question and timing.
+    """
+    started = time.perf_counter()
+    if not quiz_request.topic.strip():
+        raise HTTPException(status_code=400, detail="Topic is required")
+    
+    def finish(text: str) -> dict:
+        result = parse_question_json(text)
+        return QuizResponse(**{field: result[field] for field in QUIZ_FIELDS}).model_dump()
+    
+    return sse_response(stream_fields(
+        quiz_engine.generate_quiz_question_stream(quiz_request.topic), QUIZ_FIELDS, finish, started
+    ))
+
+
+@app.post("/api/review/stream")
+@limiter.limit(RateLimits.AI_GENERATE)
+async def stream_review(request: Request, review_request: ReviewRequest):
+    """
+    SSE variant of /api/review: `field` events for grade, feedback and
+    textbook_answer as each is complete, then `done` with citations and timing.
+    """
+    started = time.perf_counter()
+    if not review_request.question.strip() or not review_request.answer.strip():
+        raise HTTPException(status_code=400, detail="Question and answer are required")
+    
+    citations, chunks = await captains_review.review_stream(
+        question=review_request.question,
+        user_answer=review_request.answer,
+        document_ids=review_request.document_ids,
+    )
+    
+    def finish(text: str) -> dict:
+        result = captains_review.parse_response(text)
+        return ReviewResponse(
+            grade=result["grade"],
+            feedback=result["feedback"],
+            textbook_answer=result["textbook_answer"],
+            citations=[
+                Citation(source=c["source"], page=c.get("page"), excerpt=c["excerpt"])
+                for c in citations
+            ],
+        ).model_dump()
+    
+    return sse_response(stream_fields(chunks, REVIEW_FIELDS, finish, started))
+
+
+@app.post("/api/tutor/explain/stream")
+@limiter.limit(RateLimits.AI_GENERATE)
+async def stream_tutoring(request: Request, tutor_request: TutorRequest):
+    """
+    SSE variant of /api/tutor/explain: `meta` with the diagram first,
+    `token` events as the explanation is written, then `done`.
+    """
+    started = time.perf_counter()
+    if not tutor_request.subject.strip():
+        raise HTTPException(status_code=400, detail="Subject is required")
+    
+    image_url = None
+    if "mechanical-aptitude" in tutor_request.subjects:
+        image_url = find_matching_mechanical_image(tutor_request.user_input)
+    
+    def finish(text: str) -> dict:
+        return TutorResponse(explanation=text.strip(), image_url=image_url).model_dump()
+    
+    chunks = tutor_engine.explain_stream(
+        subject=tutor_request.subject,
+        user_input=tutor_request.user_input or "Help me understand this"
+    )
+    return sse_response(stream_text(chunks, finish, started, first=[sse_event("meta", {"image_url": image_url})]))
+
+
 
 # ============== BATCH QUIZ ENDPOINT ==============
 
@@ -683,6 +925,89 @@ class BatchQuizResponse(BaseModel):
     questions: List[QuizResponse]
 
 
+# Seconds a batch waits on generation before filling empty slots from the bank
+QUIZ_BATCH_DEADLINE_SECONDS = float(os.environ.get("QUIZ_BATCH_DEADLINE_SECONDS", "25"))
+
+# Questions requested per model call in a batch (one retrieval + one prompt each)
+QUIZ_BATCH_CALL_SIZE = max(int(os.environ.get("QUIZ_BATCH_CALL_SIZE", "5")), 1)
+
+# Bank subjects used for deadline fallback when no requested topic names one
+BANK_SUBJECTS = ("human-relations", "mechanical-aptitude", "reading-ability", "fire-terms", "math")
+
+
+async def bank_questions(topics: List[str], count: int) -> List[QuizResponse]:
+    """Random bank questions for the topics (as subject slugs), or any subject if none match."""
+    subjects = [t.strip().lower().replace(" ", "-") for t in topics]
+    if not any(subject in BANK_SUBJECTS for subject in subjects):
+        subjects = list(BANK_SUBJECTS)
+    if CONTENT_BANK_ENABLED:
+        rows = content_bank.get_random_questions(subjects, count)
+    else:
+        rows = await adb.get_random_questions(subjects, count)
+    return [
+        QuizResponse(
+            id=q["id"],
+            question=q["question"],
+            options=q["options"],
+            correct_answer=q["correct_answer"],
+            explanation=q["explanation"],
+            image_path=q.get("image_path"),
+        )
+        for q in rows
+    ]
+
+
+async def generate_batch(topics: List[str], count: int):
+    """
+    Yield (QuizResponse, source) pairs in completion order until `count` exist.
+    
+    Slots are spread across the topics and generated in multi-question calls
+    of up to QUIZ_BATCH_CALL_SIZE (each call re-requests only its own
+    shortfall). Stops as soon as `count` questions are valid and cancels the
+    remaining calls; slots still empty at the deadline are filled from the
+    bank (source "bank" instead of "generated").
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + QUIZ_BATCH_DEADLINE_SECONDS
+    per_topic = [count // len(topics) + (1 if i < count % len(topics) else 0) for i in range(len(topics))]
+    pending = set()
+    for topic, slots in zip(topics, per_topic):
+        for start in range(0, slots, QUIZ_BATCH_CALL_SIZE):
+            size = min(QUIZ_BATCH_CALL_SIZE, slots - start)
+            pending.add(asyncio.ensure_future(quiz_engine.generate_quiz_questions(topic, size)))
+    
+    delivered = 0
+    try:
+        while pending and delivered < count:
+            done, pending = await asyncio.wait(pending, timeout=max(deadline - loop.time(), 0), return_when=asyncio.FIRST_COMPLETED)
+            if not done:
+                print(f"⏱️ Quiz batch deadline reached with {delivered}/{count} generated")
+                break
+            for task in done:
+                try:
+                    results = task.result()
+                except Exception as e:
+                    print(f"⚠️ Batch generation call failed: {e}")
+                    continue
+                for result in results:
+                    if delivered >= count:
+                        break
+                    delivered += 1
+                    yield QuizResponse(
+                        question=result["question"],
+                        options=result["options"],
+                        correct_answer=result["correct_answer"],
+                        explanation=result["explanation"],
+                    ), "generated"
+    finally:
+        for task in pending:
+            task.cancel()
+    
+    if delivered < count:
+        for question in await bank_questions(topics, count - delivered):
+            yield question, "bank"
+
+
 @app.post("/api/quiz/batch", response_model=BatchQuizResponse)
 @limiter.limit(RateLimits.AI_BATCH)
 async def generate_batch_quiz(request: Request, batch_request: BatchQuizRequest):
@@ -693,58 +1018,50 @@ async def generate_batch_quiz(request: Request, batch_request: BatchQuizRequest)
     if not quiz_engine:
         raise HTTPException(status_code=503, detail="Quiz engine not initialized")
     
-    import asyncio
-    
-    questions = []
-    
     # Distribute questions across topics
     topics = batch_request.topics if batch_request.topics else ["General Fire Service"]
-    
-    async def generate_one(topic: str, attempt: int = 1):
-        try:
-            result = await quiz_engine.generate_quiz_question(topic)
-            return QuizResponse(
-                question=result["question"],
-                options=result["options"],
-                correct_answer=result["correct_answer"],
-                explanation=result["explanation"],
-            )
-        except Exception as e:
-            print(f"⚠️ Generation attempt {attempt} failed for {topic}: {e}")
-            return None
-    
-    # Initial batch - generate requested count + buffer for failures
-    buffer_count = min(batch_request.count, 3)  # Extra attempts to account for failures
-    tasks = []
-    topic_cycle = (topics * ((batch_request.count + buffer_count) // len(topics) + 1))[:batch_request.count + buffer_count]
-    
-    for topic in topic_cycle:
-        tasks.append(generate_one(topic))
-    
-    # Run all in parallel
-    results = await asyncio.gather(*tasks)
-    questions = [q for q in results if q is not None]
-    
-    # If we still need more, do targeted retries
-    max_retries = 2
-    retry_count = 0
-    while len(questions) < batch_request.count and retry_count < max_retries:
-        retry_count += 1
-        needed = batch_request.count - len(questions)
-        retry_tasks = [generate_one(topics[i % len(topics)], retry_count + 1) for i in range(needed)]
-        retry_results = await asyncio.gather(*retry_tasks)
-        questions.extend([q for q in retry_results if q is not None])
+    questions = [question async for question, _ in generate_batch(topics, batch_request.count)]
     
     if not questions:
         raise HTTPException(status_code=503, detail="Failed to generate any questions")
     
-    # Return exactly the requested count (or all we got if fewer)
-    return BatchQuizResponse(questions=questions[:batch_request.count])
+    return BatchQuizResponse(questions=questions)
 
 
-# ============== FLASHCARD BANK ENDPOINTS ==============
+@app.post("/api/quiz/batch/stream")
+@limiter.limit(RateLimits.AI_BATCH)
+async def stream_batch_quiz(request: Request, batch_request: BatchQuizRequest):
+    """
+    SSE variant of /api/quiz/batch: a `question` event per question as soon
+    as it is ready (with "source": "generated" or "bank"), then `done` with
+    counts and timing.
+    """
+    started = time.perf_counter()
+    if not quiz_engine:
+        raise HTTPException(status_code=503, detail="Quiz engine not initialized")
+    topics = batch_request.topics if batch_request.topics else ["General Fire Service"]
+    
+    async def events():
+        sources = {"generated": 0, "bank": 0}
+        first_question = None
+        async for question, source in generate_batch(topics, batch_request.count):
+            if first_question is None:
+                first_question = time.perf_counter() - started
+            sources[source] += 1
+            yield sse_event("question", {**question.model_dump(), "source": source})
+        yield sse_event("done", {
+            "count": sum(sources.values()),
+            **sources,
+            "timing": {
+                "first_question_ms": round(first_question * 1000) if first_question is not None else None,
+                "total_ms": round((time.perf_counter() - started) * 1000),
+            },
+        })
+    
+    return sse_response(events())
 
-import random
+
+# ============== FLASHCARD BANK ENDPOINTS ==============
 
 # Subject-specific flashcard prompts (for AI fallback)
 FLASHCARD_PROMPTS = {
@@ -755,24 +1072,25 @@ FLASHCARD_PROMPTS = {
 }
 
 
-@app.get("/api/flashcards/bank/stats")
-async def get_flashcard_stats():
+@app.get("/api/flashcards/bank/stats", dependencies=DB_CONN)
+async def get_flashcard_stats(request: Request):
     """Get flashcard bank statistics."""
     subjects = ["human-relations", "mechanical-aptitude", "fire-terms", "math"]
     card_types = ["term_definition", "scenario_action", "fill_blank"]
     
-    stats = {"by_subject": {}, "by_type": {}, "total": db.get_flashcard_count()}
+    counters = await adb.get_stats_counters()
+    stats = {"by_subject": {}, "by_type": {}, "total": counters.get("flashcards", 0)}
     
     for subject in subjects:
-        stats["by_subject"][subject] = db.get_flashcard_count(subject=subject)
+        stats["by_subject"][subject] = counters.get(f"flashcards/subject/{subject}", 0)
     
     for card_type in card_types:
-        stats["by_type"][card_type] = db.get_flashcard_count(card_type=card_type)
+        stats["by_type"][card_type] = counters.get(f"flashcards/type/{card_type}", 0)
     
-    return stats
+    return etag_json_response(request, stats)
 
 
-@app.get("/api/quiz/flashcards", response_model=FlashcardResponse)
+@app.get("/api/quiz/flashcards", response_model=FlashcardResponse, dependencies=DB_CONN)
 async def get_flashcard(subjects: str = ""):
     """
     Get a flashcard from the pre-generated bank.
@@ -785,7 +1103,10 @@ async def get_flashcard(subjects: str = ""):
             subject_list = ["human-relations", "mechanical-aptitude", "fire-terms", "math"]
         
         # Try to get from database first
-        flashcards = db.get_random_flashcards(subjects=subject_list, count=1)
+        if CONTENT_BANK_ENABLED:
+            flashcards = content_bank.get_random_flashcards(subjects=subject_list, count=1)
+        else:
+            flashcards = await adb.get_random_flashcards(subjects=subject_list, count=1)
         
         if flashcards:
             card = flashcards[0]
@@ -870,11 +1191,11 @@ class AdminStatsResponse(BaseModel):
     pending_feedback: int
 
 
-def get_admin_user(token: str = None, admin_email: str = None):
+async def get_admin_user(token: str = None, admin_email: str = None):
     """Verify token or email and check if user is an admin."""
     # First try token-based auth
     if token:
-        user = get_user_from_token(token)
+        user = await aget_user_from_token(token)
         if user and user["email"] in ADMIN_EMAILS:
             return user
     
@@ -885,62 +1206,115 @@ def get_admin_user(token: str = None, admin_email: str = None):
     raise HTTPException(status_code=401, detail="Not authenticated")
 
 
-@app.get("/api/admin/verify")
+@app.get("/api/admin/verify", dependencies=DB_CONN)
 async def verify_admin(token: str = None, admin_email: str = None):
     """Verify if current user is an admin."""
-    user = get_admin_user(token, admin_email)
+    user = await get_admin_user(token, admin_email)
     return {"status": "authenticated", "email": user["email"]}
 
 
-@app.get("/api/admin/email-leads")
-async def get_admin_email_leads(token: str = None, admin_email: str = None):
-    """Get all email leads (admin only)."""
-    get_admin_user(token, admin_email)  # Verify admin
-    
-    leads = db.get_all_email_leads()
-    return {"leads": leads, "count": len(leads)}
+async def admin_page(field: str, listing: str, limit: int, cursor: str | None) -> dict:
+    """One keyset page of an admin listing as {field: [...], "count", "next_cursor"}."""
+    try:
+        page = await adb.list_admin_page(listing, limit, cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {field: page["items"], "count": len(page["items"]), "next_cursor": page["next_cursor"]}
 
 
-@app.get("/api/admin/stats")
-async def get_admin_stats(token: str = None, admin_email: str = None):
-    """Get dashboard statistics (admin only)."""
-    get_admin_user(token, admin_email)  # Verify admin
-    
-    return AdminStatsResponse(
-        email_leads=db.get_email_leads_count(),
-        total_users=db.get_users_count(),
-        total_questions=db.get_question_count(),
-        total_flashcards=db.get_flashcard_count(),
-        pending_reports=len(db.get_pending_reports()),
-        pending_feedback=len(db.get_pending_feedback())
-    )
+@app.get("/api/admin/email-leads", dependencies=DB_CONN)
+async def get_admin_email_leads(token: str = None, admin_email: str = None, limit: int = 100, cursor: str = None):
+    """Get email leads, newest first (admin only). Pass next_cursor back as cursor for the next page."""
+    await get_admin_user(token, admin_email)  # Verify admin
+    return await admin_page("leads", "email_leads", limit, cursor)
 
 
-@app.get("/api/admin/reports")
-async def get_admin_reports(token: str = None, admin_email: str = None):
-    """Get all pending question reports (admin only)."""
-    get_admin_user(token, admin_email)  # Verify admin
+@app.get("/api/admin/stats", response_model=AdminStatsResponse, dependencies=DB_CONN)
+async def get_admin_stats(request: Request, token: str = None, admin_email: str = None):
+    """Get dashboard statistics (admin only)."""
+    await get_admin_user(token, admin_email)  # Verify admin
     
-    reports = db.get_pending_reports()
-    return {"reports": reports, "count": len(reports)}
-
-
-@app.get("/api/admin/feedback")
-async def get_admin_feedback(token: str = None, admin_email: str = None):
-    """Get all pending user feedback (admin only)."""
-    get_admin_user(token, admin_email)  # Verify admin
+    counters = await adb.get_stats_counters()
+    stats = AdminStatsResponse(
+        email_leads=counters.get("email_leads", 0),
+        total_users=counters.get("users", 0),
+        total_questions=counters.get("questions", 0),
+        total_flashcards=counters.get("flashcards", 0),
+        pending_reports=counters.get("reports/pending", 0),
+        pending_feedback=counters.get("feedback/pending", 0)
+    )
+    return etag_json_response(request, stats.model_dump())
+
+
+@app.get("/api/admin/reports", dependencies=DB_CONN)
+async def get_admin_reports(token: str = None, admin_email: str = None, limit: int = 100, cursor: str = None):
+    """Get pending question reports, newest first (admin only)."""
+    await get_admin_user(token, admin_email)  # Verify admin
+    return await admin_page("reports", "pending_reports", limit, cursor)
+
+
+@app.get("/api/admin/feedback", dependencies=DB_CONN)
+async def get_admin_feedback(token: str = None, admin_email: str = None, limit: int = 100, cursor: str = None):
+    """Get pending user feedback, newest first (admin only)."""
+    await get_admin_user(token, admin_email)  # Verify admin
+    return await admin_page("feedback", "pending_feedback", limit, cursor)
+
+
+@app.get("/api/admin/users", dependencies=DB_CONN)
+async def get_admin_users(token: str = None, admin_email: str = None, limit: int = 100, cursor: str = None):
+    """Get registered users, newest first (admin only)."""
+    await get_admin_user(token, admin_email)  # Verify admin
+    return await admin_page("users", "users", limit, cursor)
+
+
+EXPORT_FORMATS = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+EXPORT_BATCH_SIZE = 500
+
+
+async def export_rows(listing: str, format: str):
+    """Encode an admin listing batch by batch; memory stays at one batch however long the listing is."""
+    cursor = None
+    header = format == "csv"
+    while True:
+        page = await adb.list_admin_page(listing, EXPORT_BATCH_SIZE, cursor)
+        rows = page["items"]
+        if format == "ndjson":
+            yield "".join(json.dumps(row, default=str) + "\n" for row in rows)
+        else:
+            # Columns come from the query, so even an empty listing gets its header row
+            buffer = io.StringIO()
+            writer = csv.DictWriter(buffer, fieldnames=page["columns"], extrasaction="ignore")
+            if header:
+                writer.writeheader()
+                header = False
+            writer.writerows(rows)
+            yield buffer.getvalue()
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return
+
+
+@app.get("/api/admin/export/{listing}")
+async def export_admin_listing(listing: str, format: str = "ndjson", token: str = None, admin_email: str = None):
+    """
+    Stream a whole admin listing as NDJSON or CSV (admin only).
     
-    feedback = db.get_pending_feedback()
-    return {"feedback": feedback, "count": len(feedback)}
-
-
-@app.get("/api/admin/users")
-async def get_admin_users(token: str = None, admin_email: str = None):
-    """Get all registered users (admin only)."""
-    get_admin_user(token, admin_email)  # Verify admin
+    Args:
+        listing: "users", "email_leads", "pending_reports" or "pending_feedback"
+        format: "ndjson" or "csv"
+    """
+    await get_admin_user(token, admin_email)  # Verify admin
+    if listing not in db.ADMIN_LISTINGS:
+        raise HTTPException(status_code=404, detail=f"Unknown listing: {listing}")
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"format must be one of: {', '.join(EXPORT_FORMATS)}")
     
-    users = db.get_all_users()
-    return {"users": users, "count": len(users)}
+    filename = f"{listing}.{format}"
+    return StreamingResponse(
+        export_rows(listing, format),
+        media_type=EXPORT_FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
 
 
 if __name__ == "__main__":
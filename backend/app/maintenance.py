@@ -0,0 +1,178 @@
+"""
+Background Maintenance Scheduler
+Runs database housekeeping on a daemon thread, off the request path.
+
+Jobs:
+- expired_sessions: batched deletes of expired sessions and token revocations
+- optimize: PRAGMA optimize (ANALYZE on the first run) for the query planner
+- incremental_vacuum: returns free pages so user.db uploads stay small
+- wal_checkpoint: PASSIVE checkpoint so the WAL stays short
+
+Each job runs every `interval_seconds` +/- `jitter` (a fraction of the
+interval), so replicas started together do not all write and upload at once.
+An interval of 0 disables a job.
+"""
+
+import os
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from app import db
+
+MAINTENANCE_ENABLED = os.environ.get("MAINTENANCE_ENABLED", "true").lower() == "true"
+MAINTENANCE_JITTER = float(os.environ.get("MAINTENANCE_JITTER", "0.1"))
+
+SESSION_CLEANUP_INTERVAL_SECONDS = float(os.environ.get("SESSION_CLEANUP_INTERVAL_SECONDS", "900"))
+DB_OPTIMIZE_INTERVAL_SECONDS = float(os.environ.get("DB_OPTIMIZE_INTERVAL_SECONDS", "21600"))
+DB_VACUUM_INTERVAL_SECONDS = float(os.environ.get("DB_VACUUM_INTERVAL_SECONDS", "3600"))
+DB_CHECKPOINT_INTERVAL_SECONDS = float(os.environ.get("DB_CHECKPOINT_INTERVAL_SECONDS", "300"))
+
+
+@dataclass
+class Job:
+    """A periodic job and its run-time metrics."""
+    name: str
+    func: Callable[[], Any]
+    interval_seconds: float
+    next_run: float = 0.0
+    runs: int = 0
+    failures: int = 0
+    total_seconds: float = 0.0
+    last_seconds: Optional[float] = None
+    last_run_at: Optional[float] = None
+    last_result: Any = None
+    last_error: Optional[str] = field(default=None)
+
+
+class MaintenanceScheduler:
+    """
+    Single daemon thread that runs registered jobs when they come due.
+
+    Jobs run one at a time, so housekeeping never competes with itself for
+    the writer. A failing job is logged and retried at its next slot.
+    """
+
+    def __init__(self, jitter: float = MAINTENANCE_JITTER):
+        self.jitter = jitter
+        self._jobs: List[Job] = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _delay(self, interval_seconds: float) -> float:
+        return interval_seconds * (1 + random.uniform(-self.jitter, self.jitter))
+
+    def add_job(self, name: str, func: Callable[[], Any], interval_seconds: float):
+        """
+        Register a job. Its first run is one (jittered) interval after start.
+
+        Args:
+            name: Job name in metrics
+            func: Called with no arguments on the scheduler thread
+            interval_seconds: Seconds between runs (0 = disabled)
+        """
+        if interval_seconds <= 0:
+            return
+        with self._lock:
+            self._jobs.append(Job(name, func, interval_seconds, next_run=time.monotonic() + self._delay(interval_seconds)))
+
+    def start(self):
+        """Start the scheduler thread (no-op if running or nothing is registered)."""
+        if self._thread is not None or not self._jobs:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="maintenance", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the scheduler, letting a running job finish."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=30)
+            self._thread = None
+
+    def run_job(self, job: Job):
+        """Run one job now and record its timing."""
+        started = time.perf_counter()
+        try:
+            result = job.func()
+            error = None
+        except Exception as e:
+            result, error = None, str(e)
+            print(f"⚠️ Maintenance job {job.name} failed: {e}")
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            job.runs += 1
+            job.failures += error is not None
+            job.total_seconds += elapsed
+            job.last_seconds = elapsed
+            job.last_run_at = time.time()
+            job.last_result = result
+            job.last_error = error
+            job.next_run = time.monotonic() + self._delay(job.interval_seconds)
+
+    def _run(self):
+        while not self._stop.is_set():
+            with self._lock:
+                job = min(self._jobs, key=lambda j: j.next_run)
+            wait = job.next_run - time.monotonic()
+            if wait > 0:
+                self._stop.wait(wait)
+                continue
+            self.run_job(job)
+
+    def metrics(self) -> Dict[str, Any]:
+        """Per-job run counts and timings for /api/metrics."""
+        now = time.monotonic()
+        with self._lock:
+            return {
+                "running": self._thread is not None,
+                "jobs": {
+                    job.name: {
+                        "interval_seconds": job.interval_seconds,
+                        "runs": job.runs,
+                        "failures": job.failures,
+                        "last_seconds": round(job.last_seconds, 4) if job.last_seconds is not None else None,
+                        "avg_seconds": round(job.total_seconds / job.runs, 4) if job.runs else None,
+                        "last_run_at": job.last_run_at,
+                        "last_result": job.last_result,
+                        "last_error": job.last_error,
+                        "next_run_in_seconds": round(max(job.next_run - now, 0.0), 1),
+                    }
+                    for job in self._jobs
+                },
+            }
+
+
+def _expire_sessions() -> Dict[str, int]:
+    return {
+        "sessions": db.cleanup_expired_sessions(),
+        "revocations": db.cleanup_expired_revocations(),
+    }
+
+
+# Global scheduler
+scheduler = MaintenanceScheduler()
+scheduler.add_job("expired_sessions", _expire_sessions, SESSION_CLEANUP_INTERVAL_SECONDS)
+scheduler.add_job("optimize", db.optimize_db, DB_OPTIMIZE_INTERVAL_SECONDS)
+scheduler.add_job("incremental_vacuum", db.incremental_vacuum, DB_VACUUM_INTERVAL_SECONDS)
+scheduler.add_job("wal_checkpoint", db.checkpoint_wal, DB_CHECKPOINT_INTERVAL_SECONDS)
+
+
+def start_maintenance():
+    """Start background maintenance (app startup hook)."""
+    if MAINTENANCE_ENABLED:
+        scheduler.start()
+
+
+def stop_maintenance():
+    """Stop background maintenance (app shutdown hook)."""
+    scheduler.stop()
+
+
+def get_maintenance_stats() -> Dict[str, Any]:
+    """Scheduler state and per-job metrics for /api/metrics."""
+    return scheduler.metrics()
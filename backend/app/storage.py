@@ -0,0 +1,535 @@
+"""
+Object Storage & Background Sync
+Persists the SQLite database to an object store without blocking requests.
+
+Architecture:
+- ObjectStore is the storage interface (GCS in production, a local
+  directory as a stand-in for tests and offline development)
+- BackgroundSyncer coalesces bursts of writes into one upload of a
+  consistent snapshot taken with SQLite's online backup API
+- Large objects are downloaded as parallel byte ranges, and a local
+  `.generation` marker records which object version a file came from so
+  unchanged files are not downloaded again
+- GenerationWatcher polls an object's generation number and reports new
+  versions, so readers can pick up a new snapshot without a restart
+"""
+
+import os
+import base64
+import hashlib
+import shutil
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional, Dict, Any, Callable
+
+# Objects larger than two chunks are fetched as parallel byte ranges
+DOWNLOAD_CHUNK_BYTES = int(float(os.environ.get("DB_DOWNLOAD_CHUNK_MB", "8")) * 1024 * 1024)
+DOWNLOAD_WORKERS = int(os.environ.get("DB_DOWNLOAD_WORKERS", "8"))
+
+
+# =============================================================================
+# LOCAL FILE HELPERS
+# =============================================================================
+
+def _marker_path(local_path: Path) -> Path:
+    return Path(local_path).with_name(Path(local_path).name + ".generation")
+
+
+def read_generation_marker(local_path: Path) -> Optional[int]:
+    """Generation of the object a local file was downloaded from (or last uploaded as)."""
+    try:
+        return int(_marker_path(local_path).read_text())
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def write_generation_marker(local_path: Path, generation: Optional[int]) -> None:
+    """Record (or clear, for None) the object generation a local file matches."""
+    marker = _marker_path(local_path)
+    if generation is None:
+        marker.unlink(missing_ok=True)
+        return
+    partial = marker.with_name(marker.name + ".partial")
+    partial.write_text(str(generation))
+    os.replace(partial, marker)
+
+
+def file_checksum(path: Path) -> str:
+    """Base64 MD5 of a file, in the format GCS reports for objects."""
+    digest = hashlib.md5()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return base64.b64encode(digest.digest()).decode()
+
+
+def download_ranges(
+    size: int,
+    fetch: Callable[[int, int], bytes],
+    local_path: Path,
+    chunk_bytes: int = DOWNLOAD_CHUNK_BYTES,
+    workers: int = DOWNLOAD_WORKERS,
+) -> None:
+    """
+    Fetch an object as byte ranges on a thread pool, writing each range at
+    its offset in a preallocated file.
+
+    Args:
+        size: Object size in bytes
+        fetch: fetch(start, end) returns bytes [start, end) of the object
+        local_path: File to write
+        chunk_bytes: Range size
+        workers: Ranges fetched at once
+    """
+    local_path.parent.mkdir(parents=True, exist_ok=True)
+    ranges = [(start, min(start + chunk_bytes, size)) for start in range(0, size, chunk_bytes)]
+    with open(local_path, "wb") as f:
+        f.truncate(size)
+        fd = f.fileno()
+
+        def fetch_range(bounds):
+            start, end = bounds
+            data = fetch(start, end)
+            if len(data) != end - start:
+                raise IOError(f"short read for bytes {start}-{end}: got {len(data)}")
+            os.pwrite(fd, data, start)
+
+        with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="download") as pool:
+            list(pool.map(fetch_range, ranges))
+
+
+# =============================================================================
+# OBJECT STORES
+# =============================================================================
+
+class ObjectStore(ABC):
+    """Abstract base class for a flat blob store."""
+
+    @abstractmethod
+    def download(self, name: str, local_path: Path, generation: Optional[int] = None) -> bool:
+        """
+        Download an object to a local file.
+
+        Args:
+            name: Object name
+            local_path: File to write
+            generation: Specific generation to fetch (default: the latest)
+
+        Returns:
+            True if the object existed and was downloaded, False otherwise
+        """
+        pass
+
+    @abstractmethod
+    def upload(self, local_path: Path, name: str) -> Optional[int]:
+        """
+        Upload a local file, replacing the object if it exists.
+
+        Returns:
+            Generation number of the new object version
+        """
+        pass
+
+    @abstractmethod
+    def generation(self, name: str) -> Optional[int]:
+        """
+        Current generation number of an object. Every upload creates a new,
+        immutable version of the object with a higher generation.
+
+        Returns:
+            Generation number, or None if the object does not exist
+        """
+        pass
+
+    @abstractmethod
+    def checksum(self, name: str) -> Optional[str]:
+        """Base64 MD5 of an object (see file_checksum), or None if unknown."""
+        pass
+
+    @abstractmethod
+    def describe(self) -> str:
+        """Human-readable location used in log lines."""
+        pass
+
+
+class GCSObjectStore(ObjectStore):
+    """Object store backed by a Google Cloud Storage bucket."""
+
+    def __init__(self, bucket_name: str):
+        self.bucket_name = bucket_name
+        self._bucket = None
+
+    def _get_bucket(self):
+        if self._bucket is None:
+            from google.cloud import storage
+            self._bucket = storage.Client().bucket(self.bucket_name)
+        return self._bucket
+
+    def download(self, name: str, local_path: Path, generation: Optional[int] = None) -> bool:
+        # The blob carries its generation, so every range reads the same version
+        blob = self._get_bucket().get_blob(name, generation=generation)
+        if blob is None:
+            return False
+        local_path.parent.mkdir(parents=True, exist_ok=True)
+        if DOWNLOAD_WORKERS > 1 and blob.size >= 2 * DOWNLOAD_CHUNK_BYTES:
+            download_ranges(
+                blob.size,
+                lambda start, end: blob.download_as_bytes(start=start, end=end - 1, checksum=None),
+                local_path,
+            )
+        else:
+            blob.download_to_filename(str(local_path))
+        return True
+
+    def upload(self, local_path: Path, name: str) -> Optional[int]:
+        blob = self._get_bucket().blob(name)
+        blob.upload_from_filename(str(local_path))
+        return blob.generation
+
+    def generation(self, name: str) -> Optional[int]:
+        # Metadata-only request; no object data is transferred
+        blob = self._get_bucket().get_blob(name)
+        return blob.generation if blob is not None else None
+
+    def checksum(self, name: str) -> Optional[str]:
+        blob = self._get_bucket().get_blob(name)
+        return blob.md5_hash if blob is not None else None
+
+    def describe(self) -> str:
+        return f"gs://{self.bucket_name}"
+
+
+class LocalObjectStore(ObjectStore):
+    """
+    Object store backed by a local directory (stand-in for GCS in tests).
+    Generation numbers live in a `.generations/` sidecar per object.
+    """
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._generations = self.root / ".generations"
+        self._generations.mkdir(exist_ok=True)
+
+    def download(self, name: str, local_path: Path, generation: Optional[int] = None) -> bool:
+        # Only the latest generation is kept, so `generation` is advisory here.
+        # A local copy is bound by disk, not latency, so ranges would not help.
+        source = self.root / name
+        if not source.exists():
+            return False
+        local_path.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(source, local_path)
+        return True
+
+    def upload(self, local_path: Path, name: str) -> Optional[int]:
+        # Copy then rename so readers never see a partially written object
+        target = self.root / name
+        partial = target.with_name(target.name + ".partial")
+        shutil.copyfile(local_path, partial)
+        os.replace(partial, target)
+
+        # Bump the generation after the data, so a reader that sees the new
+        # generation always downloads at least that version
+        generation = max(time.time_ns() // 1000, (self.generation(name) or 0) + 1)
+        marker = self._generations / name
+        partial = marker.with_name(marker.name + ".partial")
+        partial.write_text(str(generation))
+        os.replace(partial, marker)
+        return generation
+
+    def generation(self, name: str) -> Optional[int]:
+        try:
+            return int((self._generations / name).read_text())
+        except FileNotFoundError:
+            # Objects copied in by hand have no sidecar yet
+            source = self.root / name
+            return source.stat().st_mtime_ns // 1000 if source.exists() else None
+
+    def checksum(self, name: str) -> Optional[str]:
+        source = self.root / name
+        return file_checksum(source) if source.exists() else None
+
+    def describe(self) -> str:
+        return f"file://{self.root}"
+
+
+def create_object_store(bucket_name: Optional[str] = None) -> ObjectStore:
+    """
+    Factory function for the database object store.
+    Uses DB_LOCAL_STORE_DIR when set (tests/offline), otherwise GCS.
+    """
+    local_dir = os.environ.get("DB_LOCAL_STORE_DIR")
+    if local_dir:
+        return LocalObjectStore(Path(local_dir))
+    return GCSObjectStore(bucket_name or os.environ.get("GCS_DB_BUCKET", "firefighter-exam-prep-db"))
+
+
+# =============================================================================
+# BACKGROUND SYNC
+# =============================================================================
+
+def snapshot_sqlite(db_path: Path, snapshot_path: Path) -> None:
+    """
+    Copy a live SQLite database into a standalone file using the online
+    backup API, so the copy is transactionally consistent even while
+    other connections keep writing.
+    """
+    source = sqlite3.connect(str(db_path))
+    target = sqlite3.connect(str(snapshot_path))
+    try:
+        source.backup(target)
+    finally:
+        target.close()
+        source.close()
+
+
+class BackgroundSyncer:
+    """
+    Write-behind uploader for a SQLite file.
+
+    Writers call mark_dirty() and return immediately. A daemon thread uploads
+    once writes have been quiet for `idle_seconds`, or `max_delay_seconds`
+    after the first unsynced write, whichever comes first, so a burst of
+    writes costs one upload. flush() uploads synchronously (shutdown).
+    """
+
+    RETRY_BACKOFF_SECONDS = 30.0
+
+    def __init__(
+        self,
+        db_path: Path,
+        store: ObjectStore,
+        name: str,
+        idle_seconds: float = 2.0,
+        max_delay_seconds: float = 15.0,
+    ):
+        self.db_path = Path(db_path)
+        self.store = store
+        self.name = name
+        self.idle_seconds = idle_seconds
+        self.max_delay_seconds = max_delay_seconds
+
+        self._cond = threading.Condition()
+        self._upload_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+        self._dirty_since: Optional[float] = None  # monotonic time of first unsynced write
+        self._last_write: Optional[float] = None
+        self._retry_after = 0.0
+
+        # Metrics
+        self._uploads = 0
+        self._failures = 0
+        self._last_sync_at: Optional[float] = None  # wall clock
+        self._last_sync_lag: Optional[float] = None
+        self._last_sync_duration: Optional[float] = None
+        self._last_generation: Optional[int] = None
+
+    @property
+    def pending(self) -> bool:
+        """True while there are writes that have not been uploaded yet."""
+        with self._cond:
+            return self._dirty_since is not None
+
+    @property
+    def last_generation(self) -> Optional[int]:
+        """Generation of the object created by this syncer's last upload."""
+        with self._cond:
+            return self._last_generation
+
+    def mark_dirty(self) -> None:
+        """Record that the database changed; schedules a background upload."""
+        with self._cond:
+            now = time.monotonic()
+            if self._dirty_since is None:
+                self._dirty_since = now
+            self._last_write = now
+            if self._thread is None and not self._stopping:
+                self._thread = threading.Thread(target=self._run, name="db-sync", daemon=True)
+                self._thread.start()
+            self._cond.notify()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while self._dirty_since is None and not self._stopping:
+                    self._cond.wait()
+                # Coalesce: wait for the writes to go quiet (or hit the max delay)
+                while not self._stopping and self._dirty_since is not None:
+                    deadline = max(
+                        min(self._last_write + self.idle_seconds,
+                            self._dirty_since + self.max_delay_seconds),
+                        self._retry_after,
+                    )
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                if self._stopping:
+                    return
+            self.sync_now()
+
+    def sync_now(self) -> bool:
+        """Upload a snapshot if there are unsynced writes. Returns True on success."""
+        with self._upload_lock:
+            with self._cond:
+                dirty_since = self._dirty_since
+                if dirty_since is None:
+                    return True
+                # Writes that land during the upload mark the file dirty again
+                self._dirty_since = None
+
+            started = time.monotonic()
+            snapshot_path = self.db_path.with_name(self.db_path.name + ".sync")
+            try:
+                snapshot_sqlite(self.db_path, snapshot_path)
+                generation = self.store.upload(snapshot_path, self.name)
+            except Exception as e:
+                print(f"⚠️ Could not upload to {self.store.describe()}: {e}")
+                with self._cond:
+                    self._failures += 1
+                    self._retry_after = time.monotonic() + self.RETRY_BACKOFF_SECONDS
+                    if self._dirty_since is None or dirty_since < self._dirty_since:
+                        self._dirty_since = dirty_since
+                return False
+            finally:
+                snapshot_path.unlink(missing_ok=True)
+
+            finished = time.monotonic()
+            with self._cond:
+                self._uploads += 1
+                self._retry_after = 0.0
+                self._last_sync_at = time.time()
+                self._last_sync_lag = finished - dirty_since
+                self._last_sync_duration = finished - started
+                self._last_generation = generation
+            # The local file now matches (at least) this generation; skip it on next start
+            write_generation_marker(self.db_path, generation)
+            print(f"📤 Uploaded database to {self.store.describe()}/{self.name}")
+            return True
+
+    def flush(self) -> bool:
+        """Synchronously upload any pending writes."""
+        return self.sync_now()
+
+    def stop(self) -> None:
+        """Stop the background thread and flush pending writes."""
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+            thread = self._thread
+        if thread is not None:
+            thread.join(timeout=10)
+        self.flush()
+
+    def metrics(self) -> Dict[str, Any]:
+        """Sync health for /api/metrics."""
+        with self._cond:
+            now = time.monotonic()
+            return {
+                "pending": self._dirty_since is not None,
+                "pending_seconds": round(now - self._dirty_since, 3) if self._dirty_since is not None else 0.0,
+                "last_sync_at": self._last_sync_at,
+                "last_sync_lag_seconds": self._last_sync_lag,
+                "last_sync_duration_seconds": self._last_sync_duration,
+                "uploads": self._uploads,
+                "failures": self._failures,
+            }
+
+
+# =============================================================================
+# GENERATION WATCH
+# =============================================================================
+
+class GenerationWatcher:
+    """
+    Polls an object's generation number on a daemon thread and calls
+    `on_change(generation)` whenever it differs from the last one seen.
+
+    `on_change` returns True once the generation is handled; a falsy return
+    (e.g. a failed download, or local writes still pending) leaves it unseen
+    so it is offered again on the next tick. Polling is a metadata request,
+    so it is cheap enough to run every few seconds. A failing poll or
+    callback is logged and retried on the next tick.
+    """
+
+    def __init__(
+        self,
+        store: ObjectStore,
+        name: str,
+        on_change: Callable[[int], bool],
+        interval_seconds: float = 30.0,
+        initial_generation: Optional[int] = None,
+    ):
+        self.store = store
+        self.name = name
+        self.on_change = on_change
+        self.interval_seconds = interval_seconds
+
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._seen = initial_generation
+
+        # Metrics
+        self._polls = 0
+        self._changes = 0
+        self._deferred = 0
+        self._failures = 0
+        self._last_poll_at: Optional[float] = None
+
+    def start(self) -> None:
+        """Start polling (no-op if already running)."""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name=f"watch-{self.name}", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop polling and wait for an in-progress callback to finish."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=30)
+            self._thread = None
+
+    def poll(self) -> bool:
+        """Check once. Returns True if a new generation was handled by on_change."""
+        try:
+            generation = self.store.generation(self.name)
+            self._polls += 1
+            self._last_poll_at = time.time()
+            if generation is None or generation == self._seen:
+                return False
+            handled = self.on_change(generation)
+        except Exception as e:
+            self._failures += 1
+            print(f"⚠️ Could not check {self.store.describe()}/{self.name} for a new version: {e}")
+            return False
+        if not handled:
+            # Not marked seen, so the same generation is retried next tick
+            self._deferred += 1
+            return False
+        self._seen = generation
+        self._changes += 1
+        return True
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval_seconds):
+            self.poll()
+
+    def metrics(self) -> Dict[str, Any]:
+        """Watcher state for /api/metrics."""
+        return {
+            "running": self._thread is not None,
+            "interval_seconds": self.interval_seconds,
+            "generation_seen": self._seen,
+            "polls": self._polls,
+            "changes": self._changes,
+            "deferred": self._deferred,
+            "failures": self._failures,
+            "last_poll_at": self._last_poll_at,
+        }
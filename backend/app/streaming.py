@@ -0,0 +1,229 @@
+"""
+Server-Sent Events Streaming
+Helpers for the opt-in SSE variants of the LLM endpoints.
+
+Event protocol (each `data:` line is JSON):
+- token:  {"text": ...} raw text as the model writes it (free-text endpoints)
+- field:  {"name": ..., "value": ...} one top-level field of a structured
+          answer, sent as soon as its value is complete (JSON endpoints)
+- done:   the full response, plus "citations" and "timing"
+- error:  {"detail": ...} generation failed after the stream started
+"""
+
+import json
+import time
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, List, Optional, Tuple
+
+from fastapi.responses import StreamingResponse
+
+
+def sse_event(event: str, data: Any) -> str:
+    """Format one SSE event with a JSON payload."""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+def sse_response(events: AsyncIterator[str]) -> StreamingResponse:
+    """Stream SSE events without proxy buffering."""
+    return StreamingResponse(
+        events,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+# =============================================================================
+# INCREMENTAL JSON
+# =============================================================================
+
+class JSONFieldStream:
+    """
+    Incremental parser for a streamed JSON object.
+
+    feed() takes text chunks as they arrive and returns the top-level
+    (key, value) pairs that became complete. Anything before the first "{"
+    (e.g. a ```json fence) is skipped. Each character is scanned once.
+    """
+
+    def __init__(self):
+        self.fields: Dict[str, Any] = {}
+        self._text = ""
+        self._pos = 0
+        self._state = "start"
+        self._escape = False
+        self._in_string = False
+        self._nesting = 0
+        self._kind = ""
+        self._start = 0
+        self._key: Optional[str] = None
+
+    @property
+    def done(self) -> bool:
+        """Whether the closing brace of the object has been seen."""
+        return self._state == "done"
+
+    def _emit(self, raw: str, completed: List[Tuple[str, Any]]):
+        try:
+            value = json.loads(raw)
+        except json.JSONDecodeError:
+            return
+        self.fields[self._key] = value
+        completed.append((self._key, value))
+
+    def _after_value(self, ch: str):
+        if ch == ",":
+            self._state = "key"
+        elif ch == "}":
+            self._state = "done"
+
+    def feed(self, chunk: str) -> List[Tuple[str, Any]]:
+        """Add a chunk. Returns the fields completed by it, in order."""
+        completed: List[Tuple[str, Any]] = []
+        self._text += chunk
+        text = self._text
+        for i in range(self._pos, len(text)):
+            ch = text[i]
+            state = self._state
+            if state == "done":
+                break
+            if state == "start":
+                if ch == "{":
+                    self._state = "key"
+            elif state == "key":
+                if ch == '"':
+                    self._start, self._state = i, "in_key"
+                elif ch == "}":
+                    self._state = "done"
+            elif state == "in_key":
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._key = json.loads(text[self._start:i + 1])
+                    self._state = "colon"
+            elif state == "colon":
+                if ch == ":":
+                    self._state = "value"
+            elif state == "value":
+                if ch.isspace():
+                    continue
+                self._start, self._state = i, "in_value"
+                self._in_string = ch == '"'
+                self._nesting = 1 if ch in "[{" else 0
+                self._kind = "string" if ch == '"' else "container" if ch in "[{" else "scalar"
+            elif state == "in_value":
+                if self._in_string:
+                    if self._escape:
+                        self._escape = False
+                    elif ch == "\\":
+                        self._escape = True
+                    elif ch == '"':
+                        self._in_string = False
+                        if self._kind == "string":
+                            self._emit(text[self._start:i + 1], completed)
+                            self._state = "after"
+                elif self._kind == "scalar":
+                    if ch in ",}" or ch.isspace():
+                        self._emit(text[self._start:i], completed)
+                        self._state = "after"
+                        self._after_value(ch)
+                elif ch == '"':
+                    self._in_string = True
+                elif ch in "[{":
+                    self._nesting += 1
+                elif ch in "]}":
+                    self._nesting -= 1
+                    if self._nesting == 0:
+                        self._emit(text[self._start:i + 1], completed)
+                        self._state = "after"
+            elif state == "after":
+                self._after_value(ch)
+        self._pos = len(text)
+        return completed
+
+
+# =============================================================================
+# EVENT STREAMS
+# =============================================================================
+
+def _ms(seconds: Optional[float]) -> Optional[int]:
+    return round(seconds * 1000) if seconds is not None else None
+
+
+async def stream_text(
+    chunks: AsyncIterator[str],
+    finish: Callable[[str], Dict[str, Any]],
+    started: float,
+    first: Iterable[str] = (),
+) -> AsyncIterator[str]:
+    """
+    SSE events for a free-text answer: `token` per chunk, then `done`.
+
+    Args:
+        chunks: Model output as it arrives
+        finish: Builds the done payload from the full text
+        started: perf_counter() when the request arrived
+        first: Events to send before generation starts
+    """
+    for event in first:
+        yield event
+    first_token = None
+    text = []
+    try:
+        async for chunk in chunks:
+            if first_token is None:
+                first_token = time.perf_counter() - started
+            text.append(chunk)
+            yield sse_event("token", {"text": chunk})
+        payload = finish("".join(text))
+    except Exception as e:
+        print(f"⚠️ Stream failed: {e}")
+        yield sse_event("error", {"detail": str(e)})
+        return
+    payload.setdefault("citations", [])
+    payload["timing"] = {"first_token_ms": _ms(first_token), "total_ms": _ms(time.perf_counter() - started)}
+    yield sse_event("done", payload)
+
+
+async def stream_fields(
+    chunks: AsyncIterator[str],
+    fields: Iterable[str],
+    finish: Callable[[str], Dict[str, Any]],
+    started: float,
+) -> AsyncIterator[str]:
+    """
+    SSE events for a JSON answer: `field` per completed top-level field
+    listed in `fields`, then `done`.
+
+    Args:
+        chunks: Model output (JSON text) as it arrives
+        fields: Field names to forward early
+        finish: Builds (and validates) the done payload from the full text
+        started: perf_counter() when the request arrived
+    """
+    fields = set(fields)
+    parser = JSONFieldStream()
+    first_token = first_field = None
+    text = []
+    try:
+        async for chunk in chunks:
+            if first_token is None:
+                first_token = time.perf_counter() - started
+            text.append(chunk)
+            for name, value in parser.feed(chunk):
+                if name in fields:
+                    if first_field is None:
+                        first_field = time.perf_counter() - started
+                    yield sse_event("field", {"name": name, "value": value})
+        payload = finish("".join(text))
+    except Exception as e:
+        print(f"⚠️ Stream failed: {e}")
+        yield sse_event("error", {"detail": str(e)})
+        return
+    payload.setdefault("citations", [])
+    payload["timing"] = {
+        "first_token_ms": _ms(first_token),
+        "first_field_ms": _ms(first_field),
+        "total_ms": _ms(time.perf_counter() - started),
+    }
+    yield sse_event("done", payload)
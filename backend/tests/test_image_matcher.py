@@ -0,0 +1,58 @@
+"""
+Image matcher keyword tests: whole-word matching must still catch plurals.
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Keep app.db away from the real data directory
+_tmp = tempfile.mkdtemp(prefix="image-matcher-test-")
+os.environ.setdefault("DB_DATA_DIR", _tmp)
+os.environ.setdefault("DB_LOCAL_STORE_DIR", _tmp)
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+import pytest
+
+from app import db
+from app import image_matcher
+from app.image_matcher import CONCEPT_KEYWORDS, HERO_IMAGES, KeywordAutomaton, find_matching_mechanical_image
+
+ALL_KEYWORDS = sorted(set(HERO_IMAGES) | {k for keywords in CONCEPT_KEYWORDS.values() for k in keywords})
+
+
+def plural(keyword: str) -> str:
+    return keyword + ("es" if keyword.endswith(("s", "sh", "ch", "x", "z")) else "s")
+
+
+@pytest.fixture
+def concept_index(monkeypatch):
+    """A loaded concept index so matching never touches the database."""
+    index = {concept: [f"/assets/{concept}.png"] for concept in CONCEPT_KEYWORDS}
+    monkeypatch.setattr(image_matcher.image_matcher, "_concept_images", index)
+    monkeypatch.setattr(image_matcher.image_matcher, "_version", db.get_content_version())
+    return index
+
+
+@pytest.mark.parametrize("keyword", ALL_KEYWORDS)
+def test_automaton_matches_plural(keyword):
+    automaton = KeywordAutomaton(ALL_KEYWORDS)
+    assert keyword in automaton.find(f"How do {plural(keyword)} work?")
+    assert keyword in automaton.find(plural(keyword).upper())
+
+
+@pytest.mark.parametrize("keyword", ALL_KEYWORDS)
+def test_plural_finds_image(keyword, concept_index):
+    assert find_matching_mechanical_image(f"Explain {plural(keyword)}, please") is not None
+
+
+@pytest.mark.parametrize("query", ["How do pulleys work?", "Two levers are used", "wheels and axles", "screws", "gears"])
+def test_reported_plurals(query, concept_index):
+    assert find_matching_mechanical_image(query) is not None
+
+
+@pytest.mark.parametrize("query", ["What is the math?", "Explain the mast", "levered buyout", "gearbox"])
+def test_partial_words_do_not_match(query):
+    found = KeywordAutomaton(ALL_KEYWORDS).find(query)
+    assert not found & {"ma", "lever", "gear"}
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Async Generation Benchmark
+Runs a batch of quiz generations with asyncio.gather (as /api/quiz/batch
+and generate_question_bank.py do) against a fake Gemini model that injects
+latency, and compares:
+
+- blocking: the old path, generate_content(stream=True) iterated
+  synchronously inside the coroutine, which freezes the event loop
+- async:    VertexAIGenerator as shipped, generate_content_async(stream=True)
+
+With blocking calls the batch takes ~N x one call; with async calls it
+should take ~1 x one call. No credentials or network needed.
+
+Usage:
+    python execution/benchmark_async_generation.py --batch 10 --latency 0.5
+"""
+
+import sys
+import time
+import json
+import asyncio
+import argparse
+from pathlib import Path
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+from app.features.quiz_engine import VertexAIGenerator, GenerationUsage, parse_question_json
+
+ANSWER = json.dumps({
+    "question": "A pump discharges at 150 PSI. What is 10% of that pressure?",
+    "options": ["5 PSI", "10 PSI", "15 PSI", "20 PSI"],
+    "correct_answer": "15 PSI",
+    "explanation": "10% of 150 is 15.",
+})
+
+
+class FakeChunk:
+    def __init__(self, text: str):
+        self.text = text
+
+
+class FakeModel:
+    """Gemini stand-in: time-to-first-token, then the answer in a few chunks."""
+
+    def __init__(self, latency: float, chunks: int = 8):
+        self.latency = latency
+        self.chunks = chunks
+
+    def _pieces(self):
+        size = -(-len(ANSWER) // self.chunks)
+        return [ANSWER[i:i + size] for i in range(0, len(ANSWER), size)]
+
+    def generate_content(self, prompt, generation_config=None, stream=False):
+        def stream_chunks():
+            time.sleep(self.latency / 2)
+            for piece in self._pieces():
+                time.sleep(self.latency / 2 / self.chunks)
+                yield FakeChunk(piece)
+        return stream_chunks()
+
+    async def generate_content_async(self, prompt, generation_config=None, stream=False):
+        async def stream_chunks():
+            await asyncio.sleep(self.latency / 2)
+            for piece in self._pieces():
+                await asyncio.sleep(self.latency / 2 / self.chunks)
+                yield FakeChunk(piece)
+        return stream_chunks()
+
+
+def fake_generator(latency: float) -> VertexAIGenerator:
+    """A VertexAIGenerator wired to the fake model (skips vertexai.init)."""
+    generator = VertexAIGenerator.__new__(VertexAIGenerator)
+    generator._model = generator._hr_model = FakeModel(latency)
+    generator._GenerationConfig = dict
+    generator._usage = GenerationUsage()
+    return generator
+
+
+class BlockingGenerator:
+    """The pre-async implementation: sync streaming inside an async def."""
+
+    def __init__(self, generator: VertexAIGenerator):
+        self.generator = generator
+
+    async def generate(self, topic: str, context: str) -> dict:
+        model, prompt = self.generator._request(topic, context)
+        response_text = ""
+        for chunk in model.generate_content(prompt, generation_config={}, stream=True):
+            response_text += chunk.text
+        return parse_question_json(response_text)
+
+
+async def run_batch(generator, batch: int) -> float:
+    started = time.perf_counter()
+    results = await asyncio.gather(*(generator.generate("Math", "manual text") for _ in range(batch)))
+    elapsed = time.perf_counter() - started
+    assert all(r["correct_answer"] == "15 PSI" for r in results)
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark blocking vs async Vertex generation in a gathered batch")
+    parser.add_argument("--batch", type=int, default=10, help="Generations per batch")
+    parser.add_argument("--latency", type=float, default=0.5, help="Seconds per fake model call")
+    args = parser.parse_args()
+
+    generator = fake_generator(args.latency)
+    single = asyncio.run(run_batch(generator, 1))
+    print(f"⏱️  Single call: {single:.2f}s")
+
+    for name, impl in (("blocking", BlockingGenerator(generator)), ("async", generator)):
+        elapsed = asyncio.run(run_batch(impl, args.batch))
+        print(f"📊 {name:>8}: batch of {args.batch} in {elapsed:.2f}s ({elapsed / single:.1f}x a single call)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Cold Start Benchmark
+Times `import app.db` in fresh processes and breaks startup down by phase
+(download of each file, schema init), for:
+
+- cold:     empty data directory, everything is downloaded
+- cold/1:   same, with ranged parallel download disabled (DB_DOWNLOAD_WORKERS=1);
+            only differs from cold against Cloud Storage (--bucket), since
+            the local store always copies the file in one go
+- warm:     data directory from a previous start; generations match, so
+            downloads and schema init are skipped
+
+Uses a local object store seeded with a generated bank by default; pass
+--bucket to run against a real Cloud Storage bucket instead.
+
+Usage:
+    python execution/benchmark_cold_start.py --questions 50000 --runs 3
+"""
+
+import os
+import sys
+import json
+import shutil
+import argparse
+import tempfile
+import subprocess
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).parent.parent / "backend"
+
+SEED_SCRIPT = """
+import sys
+from app import db
+count = int(sys.argv[1])
+db.add_questions_bulk([
+    {
+        "subject": ("human-relations", "mechanical-aptitude", "fire-terms", "math")[i % 4],
+        "question": f"Seed question {i}? " + "x" * 400,
+        "options": ["Option A", "Option B", "Option C", "Option D"],
+        "correct_answer": "Option A",
+        "explanation": "Because. " + "y" * 600,
+    }
+    for i in range(count)
+])
+db.flush_db_sync()
+"""
+
+STARTUP_SCRIPT = """
+import json, time
+started = time.perf_counter()
+from app import db
+total = time.perf_counter() - started
+print("STARTUP " + json.dumps({"total": total, **db.get_startup_timings()}))
+"""
+
+
+def run_python(script: str, env: dict, *args) -> str:
+    result = subprocess.run(
+        [sys.executable, "-c", script, *args],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True, timeout=600,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr)
+    return result.stdout
+
+
+def startup(env: dict) -> dict:
+    for line in run_python(STARTUP_SCRIPT, env).splitlines():
+        if line.startswith("STARTUP "):
+            return json.loads(line[len("STARTUP "):])
+    raise RuntimeError("startup timings not reported")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark db module cold start by phase")
+    parser.add_argument("--questions", type=int, default=50000, help="Questions to seed the local store with")
+    parser.add_argument("--runs", type=int, default=3, help="Starts per scenario (best is reported)")
+    parser.add_argument("--bucket", help="Use this Cloud Storage bucket instead of a seeded local store")
+    args = parser.parse_args()
+
+    workdir = Path(tempfile.mkdtemp(prefix="cold-start-bench-"))
+    env = dict(os.environ, DB_SYNC_IDLE_SECONDS="0.1")
+    env.pop("DB_DATA_DIR", None)
+    if args.bucket:
+        env.pop("DB_LOCAL_STORE_DIR", None)
+        env["GCS_DB_BUCKET"] = args.bucket
+    else:
+        env["DB_LOCAL_STORE_DIR"] = str(workdir / "store")
+        print(f"🌱 Seeding local store with {args.questions} questions...")
+        run_python(SEED_SCRIPT, dict(env, DB_DATA_DIR=str(workdir / "seed")), str(args.questions))
+        size = (workdir / "store" / "content.db").stat().st_size
+        print(f"   content.db is {size / 1024 / 1024:.1f} MB")
+
+    scenarios = {}
+    for name, extra in (("cold", {}), ("cold/1", {"DB_DOWNLOAD_WORKERS": "1"})):
+        best = None
+        for run in range(args.runs):
+            data_dir = workdir / f"data-{name.replace('/', '-')}-{run}"
+            timings = startup(dict(env, DB_DATA_DIR=str(data_dir), **extra))
+            if best is None or timings["total"] < best["total"]:
+                best = timings
+            if run < args.runs - 1:
+                shutil.rmtree(data_dir, ignore_errors=True)
+        scenarios[name] = best
+
+    # Warm: restart on the data directory the last cold run left behind
+    warm_dir = workdir / f"data-cold-{args.runs - 1}"
+    best = None
+    for _ in range(args.runs):
+        timings = startup(dict(env, DB_DATA_DIR=str(warm_dir)))
+        if best is None or timings["total"] < best["total"]:
+            best = timings
+    scenarios["warm"] = best
+
+    phases = sorted({phase for timings in scenarios.values() for phase in timings if phase != "total"})
+    print(f"\n⏱️  Best of {args.runs} starts, milliseconds\n")
+    print(f"{'phase':<28}" + "".join(f"{name:>10}" for name in scenarios))
+    for phase in phases + ["total"]:
+        row = "".join(f"{scenarios[name].get(phase, 0) * 1000:>10.1f}" for name in scenarios)
+        print(f"{phase:<28}{row}")
+
+    shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
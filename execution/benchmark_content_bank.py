@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Content Bank Benchmark
+Compares random question/flashcard sampling from the in-memory content bank
+against the SQL path (db.get_random_questions / db.get_random_flashcards).
+
+Runs against a throwaway database so the real bank is never touched.
+
+Usage:
+    python execution/benchmark_content_bank.py --questions 20000 --flashcards 20000
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+from pathlib import Path
+
+# Isolate the benchmark from the real database and Cloud Storage
+_workdir = tempfile.mkdtemp(prefix="content-bank-bench-")
+os.environ["DB_DATA_DIR"] = os.path.join(_workdir, "data")
+os.environ["DB_LOCAL_STORE_DIR"] = os.path.join(_workdir, "store")
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+from app import db
+from app.content_bank import content_bank
+
+SUBJECTS = ["human-relations", "mechanical-aptitude", "fire-terms", "math"]
+CARD_TYPES = ["term_definition", "scenario_action", "fill_blank", "pattern_recognition"]
+
+
+def seed(questions: int, flashcards: int):
+    print(f"🌱 Seeding {questions} questions and {flashcards} flashcards...")
+    db.add_questions_bulk([
+        {
+            "subject": SUBJECTS[i % len(SUBJECTS)],
+            "question": f"Benchmark question {i}? " + "x" * 200,
+            "options": ["Option A", "Option B", "Option C", "Option D"],
+            "correct_answer": "Option A",
+            "explanation": "Because. " + "y" * 300,
+        }
+        for i in range(questions)
+    ])
+    db.add_flashcards_bulk([
+        {
+            "subject": SUBJECTS[i % len(SUBJECTS)],
+            "card_type": CARD_TYPES[(i // 4) % len(CARD_TYPES)],
+            "front_content": f"Front {i} " + "x" * 100,
+            "back_content": "Back " + "y" * 200,
+            "hint": "Hint",
+        }
+        for i in range(flashcards)
+    ])
+
+
+def timeit(fn, iterations: int) -> float:
+    """Median microseconds per call."""
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    samples.sort()
+    return samples[len(samples) // 2] * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark in-memory vs SQL content sampling")
+    parser.add_argument("--questions", type=int, default=20000, help="Questions in the bank")
+    parser.add_argument("--flashcards", type=int, default=20000, help="Flashcards in the bank")
+    parser.add_argument("--iterations", type=int, default=500, help="Calls per case")
+    args = parser.parse_args()
+
+    db.init_db()
+    seed(args.questions, args.flashcards)
+    content_bank.load()
+
+    cases = [
+        ("10 questions, 1 subject", lambda: db.get_random_questions(["math"], 10),
+         lambda: content_bank.get_random_questions(["math"], 10)),
+        ("50 questions, 4 subjects", lambda: db.get_random_questions(SUBJECTS, 50),
+         lambda: content_bank.get_random_questions(SUBJECTS, 50)),
+        ("1 flashcard, 4 subjects", lambda: db.get_random_flashcards(SUBJECTS, 1),
+         lambda: content_bank.get_random_flashcards(SUBJECTS, 1)),
+        ("20 flashcards, 2 subj/1 type", lambda: db.get_random_flashcards(["math", "fire-terms"], 20, ["fill_blank"]),
+         lambda: content_bank.get_random_flashcards(["math", "fire-terms"], 20, ["fill_blank"])),
+    ]
+
+    print(f"\n⏱️  Median latency over {args.iterations} calls\n")
+    print(f"{'case':<30} {'SQL':>10} {'memory':>10} {'speedup':>8}")
+    for name, sql_fn, memory_fn in cases:
+        random.seed(0)
+        sql_us = timeit(sql_fn, args.iterations)
+        memory_us = timeit(memory_fn, args.iterations)
+        print(f"{name:<30} {sql_us:>8.1f}µs {memory_us:>8.1f}µs {sql_us / memory_us:>7.1f}x")
+
+    stats = content_bank.stats()
+    print(f"\n📚 Snapshot load: {stats['last_load_seconds'] * 1000:.0f}ms "
+          f"for {stats['questions']} questions + {stats['flashcards']} flashcards")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Event Loop Lag Benchmark
+Replays concurrent mixed traffic (bank reads, study deck reads/writes and
+simulated LLM requests awaiting a stream) on one asyncio loop, calling the
+db helpers either directly (blocking) or through app.db_async, and reports
+how late a 10ms ticker task wakes up.
+
+Runs against a throwaway database so the real bank is never touched.
+
+Usage:
+    python execution/benchmark_event_loop_lag.py --concurrency 50 --requests 3000
+"""
+
+import os
+import sys
+import time
+import random
+import asyncio
+import argparse
+import tempfile
+from pathlib import Path
+
+# Isolate the benchmark from the real database and Cloud Storage
+_workdir = tempfile.mkdtemp(prefix="loop-lag-bench-")
+os.environ["DB_DATA_DIR"] = os.path.join(_workdir, "data")
+os.environ["DB_LOCAL_STORE_DIR"] = os.path.join(_workdir, "store")
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+from app import db, db_async
+
+TICK_SECONDS = 0.010
+SUBJECTS = ["human-relations", "mechanical-aptitude", "reading-ability", "math"]
+
+
+def seed(questions: int, users: int) -> list:
+    """Fill the bank and create users with study decks. Returns user ids."""
+    print(f"🌱 Seeding {questions} questions and {users} users...")
+    with db.get_content_db_write() as conn:
+        conn.executemany(
+            """INSERT INTO questions (id, subject, question, options, correct_answer, explanation)
+               VALUES (?, ?, ?, ?, ?, ?)""",
+            [
+                (f"q{i}", SUBJECTS[i % 4], f"Benchmark question {i}? " + "x" * 200,
+                 '["A", "B", "C", "D"]', "A", "Because. " + "y" * 300)
+                for i in range(questions)
+            ]
+        )
+    user_ids = [db.create_user(f"bench{i}@example.com", "hash") for i in range(users)]
+    for user_id in user_ids:
+        for i in random.sample(range(questions), 40):
+            db.add_to_study_deck(user_id, f"q{i}")
+    return user_ids
+
+
+async def request(call, user_ids: list):
+    """One request from the mix; `call(fn, *args)` invokes a db helper."""
+    roll = random.random()
+    user_id = random.choice(user_ids)
+    if roll < 0.20:
+        # Tutor/quiz generation: mostly awaiting the model
+        await asyncio.sleep(random.uniform(0.05, 0.2))
+    elif roll < 0.55:
+        await call(db.get_random_questions, SUBJECTS, 20)
+    elif roll < 0.85:
+        await call(db.get_study_deck, user_id)
+    elif roll < 0.95:
+        await call(db.add_to_study_deck, user_id, f"q{random.randrange(1000)}")
+    else:
+        await call(db.get_pending_reports)
+
+
+async def run_mode(mode: str, user_ids: list, concurrency: int, requests: int) -> dict:
+    async def blocking(fn, *args):
+        return fn(*args)
+
+    call = blocking if mode == "blocking" else db_async.run
+    lags = []
+    stop = asyncio.Event()
+
+    async def ticker():
+        while not stop.is_set():
+            start = time.perf_counter()
+            await asyncio.sleep(TICK_SECONDS)
+            lags.append(time.perf_counter() - start - TICK_SECONDS)
+
+    remaining = requests
+
+    async def worker():
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            await request(call, user_ids)
+
+    ticker_task = asyncio.create_task(ticker())
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await ticker_task
+
+    lags.sort()
+    pct = lambda p: lags[min(len(lags) - 1, int(len(lags) * p))] * 1000
+    return {
+        "lag_p50_ms": pct(0.50),
+        "lag_p99_ms": pct(0.99),
+        "lag_max_ms": lags[-1] * 1000,
+        "throughput_rps": requests / elapsed,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark event loop lag with blocking vs async db access")
+    parser.add_argument("--questions", type=int, default=20000, help="Questions in the bank")
+    parser.add_argument("--users", type=int, default=200, help="Users with study decks")
+    parser.add_argument("--concurrency", type=int, default=50, help="Concurrent in-flight requests")
+    parser.add_argument("--requests", type=int, default=3000, help="Requests per mode")
+    args = parser.parse_args()
+
+    db.init_db()
+    user_ids = seed(args.questions, args.users)
+
+    print(f"\n⏱️  Event loop lag ({args.concurrency} concurrent, {args.requests} requests, {TICK_SECONDS * 1000:.0f}ms ticker)\n")
+    print(f"{'mode':<10} {'lag p50':>9} {'lag p99':>9} {'lag max':>9} {'req/s':>9}")
+    for mode in ("blocking", "executor"):
+        r = asyncio.run(run_mode(mode, user_ids, args.concurrency, args.requests))
+        print(f"{mode:<10} {r['lag_p50_ms']:>7.2f}ms {r['lag_p99_ms']:>7.2f}ms "
+              f"{r['lag_max_ms']:>7.2f}ms {r['throughput_rps']:>9.0f}")
+    db_async.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Group Commit Benchmark
+Bursts of small user-state writes (feedback, sessions, study deck adds)
+from many concurrent callers, committed one transaction per write
+(the old per-write commit path) vs through the group-commit writer.
+
+Runs against a throwaway database so the real one is never touched.
+
+Usage:
+    python execution/benchmark_group_commit.py --writers 64 --writes 20000
+"""
+
+import os
+import sys
+import time
+import uuid
+import sqlite3
+import asyncio
+import argparse
+import tempfile
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Isolate the benchmark from the real database and Cloud Storage
+_workdir = tempfile.mkdtemp(prefix="group-commit-bench-")
+os.environ["DB_DATA_DIR"] = os.path.join(_workdir, "data")
+os.environ["DB_LOCAL_STORE_DIR"] = os.path.join(_workdir, "store")
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+from app import db, db_async
+
+
+def per_transaction(i: int):
+    """One write, one transaction, on its own pooled connection (baseline, bypasses the writer)."""
+    with db._checkout() as conn:
+        try:
+            conn.execute(
+                "INSERT INTO user_feedback (id, study_mode, message) VALUES (?, ?, ?)",
+                (str(uuid.uuid4()), "quiz", f"feedback {i}")
+            )
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+    db._user_syncer.mark_dirty()
+
+
+def run_threads(fn, writers: int, writes: int) -> dict:
+    errors = 0
+    counter = iter(range(writes))
+    lock = threading.Lock()
+
+    def worker():
+        nonlocal errors
+        while True:
+            with lock:
+                i = next(counter, None)
+            if i is None:
+                return
+            try:
+                fn(i)
+            except sqlite3.OperationalError:
+                with lock:
+                    errors += 1
+
+    threads = [threading.Thread(target=worker) for _ in range(writers)]
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return {"elapsed": time.perf_counter() - started, "errors": errors}
+
+
+async def run_async(writers: int, writes: int, user_ids: list) -> dict:
+    """Async routes awaiting queued writes (the production path)."""
+    errors = 0
+    remaining = writes
+    expires_at = datetime.now() + timedelta(hours=1)
+
+    async def worker():
+        nonlocal remaining, errors
+        while remaining > 0:
+            remaining -= 1
+            user_id = user_ids[remaining % len(user_ids)]
+            try:
+                kind = remaining % 3
+                if kind == 0:
+                    await db_async.submit_feedback("quiz", f"feedback {remaining}")
+                elif kind == 1:
+                    await db_async.create_session(str(uuid.uuid4()), user_id, "bench@example.com", expires_at)
+                else:
+                    await db_async.add_to_study_deck(user_id, f"q{remaining}")
+            except sqlite3.OperationalError:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(writers)))
+    return {"elapsed": time.perf_counter() - started, "errors": errors}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark group-commit writes")
+    parser.add_argument("--writers", type=int, default=64, help="Concurrent writers")
+    parser.add_argument("--writes", type=int, default=20000, help="Writes per mode")
+    args = parser.parse_args()
+
+    db.init_db()
+    user_ids = [db.create_user(f"bench{i}@example.com", "hash") for i in range(500)]
+
+    print(f"\n⏱️  {args.writes} small writes from {args.writers} concurrent writers\n")
+    print(f"{'mode':<24} {'writes/s':>10} {'errors':>8} {'avg batch':>10}")
+
+    r = run_threads(per_transaction, args.writers, args.writes)
+    print(f"{'transaction per write':<24} {args.writes / r['elapsed']:>10.0f} {r['errors']:>8} {'1':>10}")
+
+    before = db.get_write_metrics()
+    r = run_threads(lambda i: db.submit_feedback("quiz", f"feedback {i}"), args.writers, args.writes)
+    after = db.get_write_metrics()
+    batches = after["batches"] - before["batches"]
+    avg = (after["writes"] - before["writes"]) / max(batches, 1)
+    print(f"{'group commit (threads)':<24} {args.writes / r['elapsed']:>10.0f} {r['errors']:>8} {avg:>10.1f}")
+
+    before = db.get_write_metrics()
+    r = asyncio.run(run_async(args.writers, args.writes, user_ids))
+    after = db.get_write_metrics()
+    batches = after["batches"] - before["batches"]
+    avg = (after["writes"] - before["writes"]) / max(batches, 1)
+    print(f"{'group commit (async)':<24} {args.writes / r['elapsed']:>10.0f} {r['errors']:>8} {avg:>10.1f}")
+    db_async.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+JSON Fragment Benchmark
+Measures request throughput for 50-question responses built the old way
+(a Pydantic QuizResponse per row, serialized through response_model) against
+responses assembled from cached per-row JSON fragments.
+
+Both routes sample from the same in-memory content bank and are driven
+in-process through the ASGI interface, so the difference is serialization.
+
+Usage:
+    python execution/benchmark_json_fragments.py --count 50 --requests 3000
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import tempfile
+from pathlib import Path
+from typing import List
+
+# Isolate the benchmark from the real database and Cloud Storage
+_workdir = tempfile.mkdtemp(prefix="json-fragments-bench-")
+os.environ["DB_DATA_DIR"] = os.path.join(_workdir, "data")
+os.environ["DB_LOCAL_STORE_DIR"] = os.path.join(_workdir, "store")
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+from fastapi import FastAPI
+from pydantic import BaseModel
+from app import db
+from app.content_bank import content_bank
+from app.json_fragments import fragment_cache, list_response, with_field
+
+SUBJECTS = ["human-relations", "mechanical-aptitude", "fire-terms", "math"]
+
+
+# Same models as app.main (importing main pulls in the RAG stack)
+class QuizResponse(BaseModel):
+    id: str | None = None
+    question: str
+    options: List[str]
+    correct_answer: str
+    explanation: str
+    image_path: str | None = None
+
+
+class QuestionBankResponse(BaseModel):
+    questions: List[QuizResponse]
+
+
+def build_app(count: int, deck: List[dict]) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/bank/models", response_model=QuestionBankResponse)
+    async def bank_models():
+        rows = content_bank.get_random_questions(SUBJECTS, count)
+        return QuestionBankResponse(questions=[
+            QuizResponse(
+                id=q["id"],
+                question=q["question"],
+                options=q["options"],
+                correct_answer=q["correct_answer"],
+                explanation=q["explanation"],
+                image_path=q["image_path"]
+            )
+            for q in rows
+        ])
+
+    @app.get("/bank/fragments")
+    async def bank_fragments():
+        version, rows = content_bank.sample_questions(SUBJECTS, count)
+        return list_response("questions", fragment_cache.encode_rows("quiz_question", version, rows))
+
+    @app.get("/deck/dicts")
+    async def deck_dicts():
+        return {"questions": deck, "count": len(deck)}
+
+    @app.get("/deck/fragments")
+    async def deck_fragments():
+        fragments = fragment_cache.encode_rows("deck_question", db.get_content_version(), deck)
+        return list_response(
+            "questions",
+            [with_field(f, "added_at", q["added_at"]) for f, q in zip(fragments, deck)],
+            count=True
+        )
+
+    return app
+
+
+async def call(app: FastAPI, path: str) -> bytes:
+    """Drive one GET through the ASGI interface and return the body."""
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": path, "raw_path": path.encode(), "query_string": b"",
+        "root_path": "", "headers": [], "client": ("127.0.0.1", 1), "server": ("test", 80),
+    }
+    body = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.body":
+            body.append(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return b"".join(body)
+
+
+async def throughput(app: FastAPI, path: str, requests: int) -> float:
+    for _ in range(50):
+        await call(app, path)
+    start = time.perf_counter()
+    for _ in range(requests):
+        await call(app, path)
+    return requests / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark pre-encoded JSON fragments")
+    parser.add_argument("--questions", type=int, default=5000, help="Questions in the bank")
+    parser.add_argument("--count", type=int, default=50, help="Questions per response")
+    parser.add_argument("--requests", type=int, default=3000, help="Requests per route")
+    args = parser.parse_args()
+
+    print(f"🌱 Seeding {args.questions} questions...")
+    db.add_questions_bulk([
+        {
+            "subject": SUBJECTS[i % len(SUBJECTS)],
+            "question": f"Benchmark question {i}? Which tool is used for forcible entry — " + "x" * 150,
+            "options": ["Halligan bar", "Pike pole", "Hydrant wrench", "Spanner"],
+            "correct_answer": "Halligan bar",
+            "explanation": "The Halligan bar is a forcible entry tool. " + "y" * 250,
+        }
+        for i in range(args.questions)
+    ])
+    content_bank.load()
+    # Same fields as db.get_study_deck rows
+    deck = [
+        {**{k: v for k, v in q.items() if k != "image_path"}, "added_at": "2026-01-01T00:00:00"}
+        for q in db.get_all_questions()[:args.count]
+    ]
+    app = build_app(args.count, deck)
+
+    async def run():
+        # Fragment responses must decode to the same document as the old ones
+        old = json.loads(await call(app, "/deck/dicts"))
+        new = json.loads(await call(app, "/deck/fragments"))
+        assert old == new, "deck responses differ"
+        bank = json.loads(await call(app, "/bank/fragments"))
+        assert len(bank["questions"]) == args.count
+        assert set(bank["questions"][0]) == set(QuizResponse.model_fields)
+
+        print(f"\n⏱️  {args.requests} requests of {args.count} questions each\n")
+        print(f"{'route':<28} {'req/s':>10}")
+        results = {}
+        for path in ["/bank/models", "/bank/fragments", "/deck/dicts", "/deck/fragments"]:
+            results[path] = await throughput(app, path, args.requests)
+            print(f"{path:<28} {results[path]:>10.0f}")
+        print(f"\n🚀 Quiz bank speedup: {results['/bank/fragments'] / results['/bank/models']:.1f}x")
+        print(f"🚀 Study deck speedup: {results['/deck/fragments'] / results['/deck/dicts']:.1f}x")
+        print(f"📦 Fragment cache: {fragment_cache.stats()}")
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Multi-Question Generation Benchmark
+Compares N single-question generations (one retrieval + one prompt each,
+run concurrently as /api/quiz/batch used to) with
+FireCaptainQuizEngine.generate_quiz_questions (one retrieval, one
+multi-question call, shortfall re-requested).
+
+Uses a fake Gemini model that charges prompt tokens for the system
+instruction + prompt (~4 chars per token), emits real question JSON, and
+takes time-to-first-token plus per-output-token latency. Every
+--truncate-every'th multi-question call is cut off mid-array to exercise
+salvage of the complete items and the shortfall request.
+
+Usage:
+    python execution/benchmark_multi_question.py --questions 10 --topic "Human Relations"
+"""
+
+import re
+import sys
+import time
+import json
+import asyncio
+import argparse
+from pathlib import Path
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+from app.features.base import BaseRetriever
+from app.features.quiz_engine import (
+    FireCaptainQuizEngine, VertexAIGenerator, GenerationUsage, SYSTEM_INSTRUCTION, HR_SYSTEM_INSTRUCTION,
+)
+
+CHARS_PER_TOKEN = 4
+MANUAL_SNIPPET = (
+    "Firefighters should resolve interpersonal issues at the lowest level. "
+    "Pump operators calculate friction loss per 100 feet of hose. "
+) * 30
+
+
+class FakeUsage:
+    def __init__(self, prompt_tokens: int, output_tokens: int):
+        self.prompt_token_count = prompt_tokens
+        self.candidates_token_count = output_tokens
+
+
+class FakeResponse:
+    def __init__(self, text: str, usage: FakeUsage = None):
+        self.text = text
+        self.usage_metadata = usage
+
+
+class FakeModel:
+    """Gemini stand-in with a token and latency model."""
+
+    def __init__(self, system_instruction: str, ttft: float, per_token: float, truncate_every: int):
+        self.system_instruction = system_instruction
+        self.ttft = ttft
+        self.per_token = per_token
+        self.truncate_every = truncate_every
+        self.multi_calls = 0
+        self.serial = 0
+
+    def _question(self) -> dict:
+        self.serial += 1
+        n = self.serial
+        return {
+            "question": f"Scenario {n}: a crew member on your shift repeatedly arrives late to roll call. What should you do first?",
+            "options": [f"Talk privately ({n})", f"Report to the captain ({n})", f"Ignore it ({n})", f"Confront at roll call ({n})"],
+            "correct_answer": f"Talk privately ({n})",
+            "explanation": "Resolve issues at the lowest level first: a private, respectful conversation usually fixes it.",
+        }
+
+    def _answer(self, prompt: str) -> str:
+        match = re.search(r"generate (\d+) challenging", prompt)
+        if not match:
+            return json.dumps(self._question())
+        self.multi_calls += 1
+        text = json.dumps([self._question() for _ in range(int(match.group(1)))])
+        if self.truncate_every and self.multi_calls % self.truncate_every == 0:
+            text = text[:int(len(text) * 0.7)]
+        return text
+
+    async def generate_content_async(self, prompt, generation_config=None, stream=False):
+        text = self._answer(prompt)
+        usage = FakeUsage((len(self.system_instruction) + len(prompt)) // CHARS_PER_TOKEN, len(text) // CHARS_PER_TOKEN)
+        latency = self.ttft + usage.candidates_token_count * self.per_token
+        if not stream:
+            await asyncio.sleep(latency)
+            return FakeResponse(text, usage)
+
+        async def chunks():
+            await asyncio.sleep(self.ttft)
+            await asyncio.sleep(latency - self.ttft)
+            yield FakeResponse(text, usage)
+        return chunks()
+
+
+class FakeRetriever(BaseRetriever):
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.calls = 0
+
+    def retrieve(self, query: str, top_k: int = 1):
+        self.calls += 1
+        time.sleep(self.latency)
+        return [MANUAL_SNIPPET]
+
+
+def build_engine(args) -> tuple:
+    generator = VertexAIGenerator.__new__(VertexAIGenerator)
+    generator._model = FakeModel(SYSTEM_INSTRUCTION, args.ttft, args.per_token, args.truncate_every)
+    generator._hr_model = FakeModel(HR_SYSTEM_INSTRUCTION, args.ttft, args.per_token, args.truncate_every)
+    generator._GenerationConfig = dict
+    generator._usage = GenerationUsage()
+    retriever = FakeRetriever(args.retrieval_latency)
+    return FireCaptainQuizEngine(retriever, generator), generator, retriever
+
+
+async def run(args, mode: str) -> dict:
+    engine, generator, retriever = build_engine(args)
+    started = time.perf_counter()
+    if mode == "single":
+        questions = await asyncio.gather(*(engine.generate_quiz_question(args.topic) for _ in range(args.questions)))
+    else:
+        questions = await engine.generate_quiz_questions(args.topic, args.questions)
+    wall = time.perf_counter() - started
+    usage = generator.usage_stats()[mode]
+    return {
+        "questions": len(questions),
+        "model_calls": usage["calls"],
+        "retrievals": retriever.calls,
+        "prompt_tokens_per_question": usage["prompt_tokens_per_question"],
+        "output_tokens_per_question": usage["output_tokens_per_question"],
+        "call_seconds_per_question": usage["seconds_per_question"],
+        "wall_seconds": round(wall, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark single- vs multi-question generation")
+    parser.add_argument("--questions", type=int, default=10, help="Questions per batch")
+    parser.add_argument("--topic", default="Human Relations", help="Topic (Human Relations adds few-shot examples)")
+    parser.add_argument("--ttft", type=float, default=0.4, help="Fake time to first token (s)")
+    parser.add_argument("--per-token", type=float, default=0.004, help="Fake seconds per output token")
+    parser.add_argument("--retrieval-latency", type=float, default=0.2, help="Fake retrieval latency (s)")
+    parser.add_argument("--truncate-every", type=int, default=1, help="Truncate every Nth multi-question call (0 = never)")
+    args = parser.parse_args()
+
+    print(f"🧪 {args.questions} questions on '{args.topic}'")
+    results = {mode: asyncio.run(run(args, mode)) for mode in ("single", "multi")}
+    for key in results["single"]:
+        single, multi = results["single"][key], results["multi"][key]
+        print(f"  {key:<28} single={single:<8} multi={multi}")
+    single, multi = results["single"], results["multi"]
+    print(f"📊 Prompt tokens/question: {single['prompt_tokens_per_question'] / multi['prompt_tokens_per_question']:.1f}x fewer")
+    print(f"📊 Call-seconds/question:  {single['call_seconds_per_question'] / multi['call_seconds_per_question']:.1f}x less")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Session Cache Benchmark
+Measures get_user_from_token latency with and without the in-process
+session cache on a deck-heavy workload (auth + study deck read per request).
+
+Runs against a throwaway database so the real bank is never touched.
+
+Usage:
+    python execution/benchmark_session_cache.py --users 200 --requests 20000
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+from pathlib import Path
+
+# Isolate the benchmark from the real database and Cloud Storage
+_workdir = tempfile.mkdtemp(prefix="session-bench-")
+os.environ["DB_DATA_DIR"] = os.path.join(_workdir, "data")
+os.environ["DB_LOCAL_STORE_DIR"] = os.path.join(_workdir, "store")
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+from app import db, auth
+
+
+def seed(users: int, deck_size: int) -> list:
+    """Create users with sessions and study decks. Returns session tokens."""
+    for i in range(deck_size * 4):
+        db.add_question("math", f"Benchmark question {i}?", ["1", "2", "3", "4"], "1", "Because.")
+    question_ids = [q["id"] for q in db.get_random_questions(["math"], deck_size * 4)]
+
+    tokens = []
+    for i in range(users):
+        user_id = db.create_user(f"bench{i}@example.com", auth.hash_password("pw"))
+        for question_id in random.sample(question_ids, deck_size):
+            db.add_to_study_deck(user_id, question_id)
+        tokens.append(auth.create_session(user_id, f"bench{i}@example.com"))
+    return tokens
+
+
+def run(tokens: list, requests: int, cached: bool) -> dict:
+    """Replay `requests` deck reads; returns auth and total latency percentiles."""
+    auth._session_cache.clear()
+    auth._session_cache.max_size = auth.SESSION_CACHE_SIZE if cached else 0
+
+    auth_times, total_times = [], []
+    for _ in range(requests):
+        token = random.choice(tokens)
+        start = time.perf_counter()
+        user = auth.get_user_from_token(token)
+        authed = time.perf_counter()
+        db.get_study_deck(user["user_id"])
+        done = time.perf_counter()
+        auth_times.append(authed - start)
+        total_times.append(done - start)
+
+    def pct(values, p):
+        values = sorted(values)
+        return values[min(len(values) - 1, int(len(values) * p))] * 1e6
+
+    return {
+        "auth_p50_us": pct(auth_times, 0.50),
+        "auth_p99_us": pct(auth_times, 0.99),
+        "request_p50_us": pct(total_times, 0.50),
+        "request_p99_us": pct(total_times, 0.99),
+        "stats": auth.get_session_cache_stats(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the session cache")
+    parser.add_argument("--users", type=int, default=200, help="Number of logged-in users")
+    parser.add_argument("--deck-size", type=int, default=25, help="Questions per study deck")
+    parser.add_argument("--requests", type=int, default=20000, help="Requests to replay")
+    args = parser.parse_args()
+
+    print(f"\n⏱️  Session cache benchmark ({args.users} users, {args.requests} requests)\n")
+    db.init_db()
+    tokens = seed(args.users, args.deck_size)
+
+    results = {"uncached": run(tokens, args.requests, cached=False),
+               "cached": run(tokens, args.requests, cached=True)}
+
+    print(f"{'mode':<10} {'auth p50':>10} {'auth p99':>10} {'req p50':>10} {'req p99':>10}")
+    for mode, r in results.items():
+        print(f"{mode:<10} {r['auth_p50_us']:>8.1f}µs {r['auth_p99_us']:>8.1f}µs "
+              f"{r['request_p50_us']:>8.1f}µs {r['request_p99_us']:>8.1f}µs")
+
+    stats = results["cached"]["stats"]
+    print(f"\n📊 Cache: {stats['hits']} hits, {stats['misses']} misses (hit rate {stats['hit_rate']:.1%})")
+    speedup = results["uncached"]["auth_p50_us"] / max(results["cached"]["auth_p50_us"], 1e-9)
+    print(f"✅ Auth lookup p50 is {speedup:.1f}x faster with the cache")
+
+
+if __name__ == "__main__":
+    main()
@@ -353,6 +353,8 @@ async def generate_flashcards(
                 
                 print(f"\n🔄 Batch {batch_num + 1}/{batches} ({current_batch_size} cards)")
                 
+                passed_in_batch = []
+                
                 # Generate one at a time to avoid overwhelming the API
                 for i in range(current_batch_size):
                     try:
@@ -382,18 +384,7 @@ async def generate_flashcards(
                         
                         if passed:
                             print(f"  ✅ Card {batch_start + i + 1}: PASS - {card['front_content'][:40]}...")
-                            
-                            if not dry_run:
-                                flashcard_id = db.add_flashcard(
-                                    subject=subject,
-                                    card_type=card_type,
-                                    front_content=card["front_content"],
-                                    back_content=card["back_content"],
-                                    source=card.get("source"),
-                                    is_approved=True
-                                )
-                                card["id"] = flashcard_id
-                            
+                            passed_in_batch.append(card)
                             generated.append(card)
                             stats["total_passed"] += 1
                         else:
@@ -408,6 +399,22 @@ async def generate_flashcards(
                     # Small delay between cards
                     await asyncio.sleep(0.5)
                 
+                if passed_in_batch and not dry_run:
+                    # Save the batch to the database in one transaction
+                    flashcard_ids = db.add_flashcards_bulk([
+                        {
+                            "subject": subject,
+                            "card_type": card_type,
+                            "front_content": card["front_content"],
+                            "back_content": card["back_content"],
+                            "source": card.get("source"),
+                            "is_approved": True,
+                        }
+                        for card in passed_in_batch
+                    ])
+                    for card, flashcard_id in zip(passed_in_batch, flashcard_ids):
+                        card["id"] = flashcard_id
+                
                 # Delay between batches
                 if batch_num < batches - 1:
                     await asyncio.sleep(2)
@@ -354,6 +354,28 @@ the LOGIC behind the answer, not just the answer itself."""]
     used_topics = set()
     attempts = 0
     max_attempts = count * 2  # Allow retries for failed cards
+    pending = []  # Passed cards not yet saved
+    
+    def save_pending():
+        """Save passed cards in one transaction."""
+        if dry_run or not pending:
+            pending.clear()
+            return
+        flashcard_ids = db.add_flashcards_bulk([
+            {
+                "subject": subject,
+                "card_type": "pattern_recognition",
+                "front_content": card["front_content"],
+                "back_content": card["back_content"],
+                "hint": card.get("hint"),
+                "source": "pattern_recognition_generator",
+                "is_approved": True,
+            }
+            for card in pending
+        ])
+        for card, flashcard_id in zip(pending, flashcard_ids):
+            card["id"] = flashcard_id
+        pending.clear()
     
     while stats["passed"] < count and attempts < max_attempts:
         attempts += 1
@@ -397,17 +419,9 @@ the LOGIC behind the answer, not just the answer itself."""]
             if passed:
                 print(f"  ✅ #{stats['passed']+1}/{count}: {card['front_content'][:50]}...")
                 
-                if not dry_run:
-                    flashcard_id = db.add_flashcard(
-                        subject=subject,
-                        card_type="pattern_recognition",
-                        front_content=card["front_content"],
-                        back_content=card["back_content"],
-                        hint=card.get("hint"),
-                        source="pattern_recognition_generator",
-                        is_approved=True
-                    )
-                    card["id"] = flashcard_id
+                pending.append(card)
+                if len(pending) >= batch_size:
+                    save_pending()
                 
                 generated_fronts.add(card["front_content"])
                 stats["passed"] += 1
@@ -424,6 +438,7 @@ the LOGIC behind the answer, not just the answer itself."""]
             stats["failed"] += 1
             await asyncio.sleep(1)
     
+    save_pending()
     return stats
 
 
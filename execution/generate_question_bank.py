@@ -138,21 +138,20 @@ async def generate_questions(
             
             print(f"\n🔄 Batch {batch_num + 1}/{batches} ({current_batch_size} questions)")
             
-            # Generate in parallel
-            tasks = [quiz_engine.generate_quiz_question(subject) for _ in range(current_batch_size)]
-            
+            # One retrieval + multi-question call; only the shortfall is re-requested
             try:
-                results = await asyncio.gather(*tasks, return_exceptions=True)
+                results = await quiz_engine.generate_quiz_questions(subject, current_batch_size)
             except Exception as e:
                 print(f"  ❌ Batch failed: {e}")
                 continue
             
+            if len(results) < current_batch_size:
+                missing = current_batch_size - len(results)
+                print(f"  ⚠️ {missing} question(s) could not be generated")
+                stats["total_failed"] += missing
+            
+            passed_in_batch = []
             for i, result in enumerate(results):
-                if isinstance(result, Exception):
-                    print(f"  ⚠️ Question {batch_start + i + 1} failed to generate: {result}")
-                    stats["total_failed"] += 1
-                    continue
-                
                 stats["total_generated"] += 1
                 
                 # Run QA checks
@@ -160,19 +159,7 @@ async def generate_questions(
                 
                 if passed:
                     print(f"  ✅ Q{batch_start + i + 1}: PASS")
-                    
-                    if not dry_run:
-                        # Save to database
-                        question_id = db.add_question(
-                            subject=subject,
-                            question=result["question"],
-                            options=result["options"],
-                            correct_answer=result["correct_answer"],
-                            explanation=result["explanation"],
-                            is_approved=True
-                        )
-                        result["id"] = question_id
-                    
+                    passed_in_batch.append(result)
                     generated.append(result)
                     stats["total_passed"] += 1
                 else:
@@ -183,6 +170,22 @@ async def generate_questions(
                     })
                     stats["total_failed"] += 1
             
+            if passed_in_batch and not dry_run:
+                # Save the batch to the database in one transaction
+                question_ids = db.add_questions_bulk([
+                    {
+                        "subject": subject,
+                        "question": q["question"],
+                        "options": q["options"],
+                        "correct_answer": q["correct_answer"],
+                        "explanation": q["explanation"],
+                        "is_approved": True,
+                    }
+                    for q in passed_in_batch
+                ])
+                for q, question_id in zip(passed_in_batch, question_ids):
+                    q["id"] = question_id
+            
             # Small delay between batches to avoid rate limiting
             if batch_num < batches - 1:
                 await asyncio.sleep(2)
@@ -28,13 +28,17 @@ def check_duplicate(new_front: str, existing_fronts: set, threshold: float = 0.9
     return False, ""
 
 
-def import_flashcards(cards: list, subject: str, dry_run: bool = False) -> dict:
-    """Import flashcards with duplicate detection."""
-    # Load existing
-    existing = db.get_random_flashcards([subject], 1000, approved_only=False)
+def import_flashcards(cards: list, subject: str, dry_run: bool = False, replace: bool = False) -> dict:
+    """
+    Import flashcards with duplicate detection, in one transaction.
+    With replace=True the subject's existing cards are deleted in the same transaction.
+    """
+    # Load existing (nothing to compare against when replacing)
+    existing = [] if replace else db.get_random_flashcards([subject], 1000, approved_only=False)
     existing_fronts = {c["front_content"] for c in existing}
     
     stats = {"imported": 0, "duplicates": 0, "errors": 0}
+    to_import = []
     
     for card in cards:
         is_dup, match = check_duplicate(card["front_content"], existing_fronts)
@@ -43,22 +47,27 @@ def import_flashcards(cards: list, subject: str, dry_run: bool = False) -> dict:
             stats["duplicates"] += 1
             continue
         
-        try:
-            if not dry_run:
-                db.add_flashcard(
-                    subject=subject,
-                    card_type="pattern_recognition",
-                    front_content=card["front_content"],
-                    back_content=card["back_content"],
-                    hint=card.get("hint"),
-                    source="manual_pattern_recognition",
-                    is_approved=True
-                )
-            existing_fronts.add(card["front_content"])
-            stats["imported"] += 1
-        except Exception as e:
-            print(f"  ❌ Error: {e}")
-            stats["errors"] += 1
+        to_import.append({
+            "subject": subject,
+            "card_type": "pattern_recognition",
+            "front_content": card["front_content"],
+            "back_content": card["back_content"],
+            "hint": card.get("hint"),
+            "source": "manual_pattern_recognition",
+            "is_approved": True,
+        })
+        existing_fronts.add(card["front_content"])
+    
+    try:
+        if not dry_run:
+            if replace:
+                db.replace_flashcards([subject], to_import)
+            else:
+                db.add_flashcards_bulk(to_import)
+        stats["imported"] = len(to_import)
+    except Exception as e:
+        print(f"  ❌ Error: {e}")
+        stats["errors"] = len(to_import)
     
     return stats
 
@@ -185,15 +194,9 @@ if __name__ == "__main__":
     print("📇 IMPORTING PATTERN RECOGNITION FLASHCARDS")
     print("=" * 60)
     
-    # Delete old math flashcards first
-    print("\n🗑️ Removing old math flashcards...")
-    with db.get_db() as conn:
-        result = conn.execute("DELETE FROM flashcards WHERE subject = 'math'")
-        print(f"   Deleted existing math flashcards")
-    
-    # Import new math cards
-    print(f"\n📝 Importing {len(MATH_CARDS)} Math flashcards...")
-    stats = import_flashcards(MATH_CARDS, "math")
+    # Replace old math flashcards with the new set (one transaction)
+    print(f"\n📝 Replacing Math flashcards with {len(MATH_CARDS)} new cards...")
+    stats = import_flashcards(MATH_CARDS, "math", replace=True)
     print(f"   ✅ Imported: {stats['imported']}")
     print(f"   ⚠️ Duplicates: {stats['duplicates']}")
     print(f"   ❌ Errors: {stats['errors']}")
@@ -21,10 +21,11 @@ def check_duplicate(new_front: str, existing_fronts: set, threshold: float = 0.9
     return False, ""
 
 
-def import_flashcards(cards: list, subject: str) -> dict:
-    existing = db.get_random_flashcards([subject], 1000, approved_only=False)
+def import_flashcards(cards: list, subject: str, replace: bool = False) -> dict:
+    existing = [] if replace else db.get_random_flashcards([subject], 1000, approved_only=False)
     existing_fronts = {c["front_content"] for c in existing}
     stats = {"imported": 0, "duplicates": 0, "errors": 0}
+    to_import = []
     
     for card in cards:
         is_dup, match = check_duplicate(card["front_content"], existing_fronts)
@@ -32,21 +33,26 @@ def import_flashcards(cards: list, subject: str) -> dict:
             print(f"  ⚠️ Duplicate: '{card['front_content'][:40]}...'")
             stats["duplicates"] += 1
             continue
-        try:
-            db.add_flashcard(
-                subject=subject,
-                card_type="pattern_recognition",
-                front_content=card["front_content"],
-                back_content=card["back_content"],
-                hint=card.get("hint"),
-                source="manual_pattern_recognition",
-                is_approved=True
-            )
-            existing_fronts.add(card["front_content"])
-            stats["imported"] += 1
-        except Exception as e:
-            print(f"  ❌ Error: {e}")
-            stats["errors"] += 1
+        to_import.append({
+            "subject": subject,
+            "card_type": "pattern_recognition",
+            "front_content": card["front_content"],
+            "back_content": card["back_content"],
+            "hint": card.get("hint"),
+            "source": "manual_pattern_recognition",
+            "is_approved": True,
+        })
+        existing_fronts.add(card["front_content"])
+    
+    try:
+        if replace:
+            db.replace_flashcards([subject], to_import)
+        else:
+            db.add_flashcards_bulk(to_import)
+        stats["imported"] = len(to_import)
+    except Exception as e:
+        print(f"  ❌ Error: {e}")
+        stats["errors"] = len(to_import)
     return stats
 
 
@@ -133,15 +139,9 @@ if __name__ == "__main__":
     print("📇 IMPORTING MECHANICAL APTITUDE FLASHCARDS")
     print("=" * 60)
     
-    # Delete old mechanical flashcards
-    print("\n🗑️ Removing old mechanical-aptitude flashcards...")
-    with db.get_db() as conn:
-        conn.execute("DELETE FROM flashcards WHERE subject = 'mechanical-aptitude'")
-        print("   Deleted existing mechanical-aptitude flashcards")
-    
-    # Import new cards
-    print(f"\n📝 Importing {len(MECHANICAL_CARDS)} Mechanical Aptitude flashcards...")
-    stats = import_flashcards(MECHANICAL_CARDS, "mechanical-aptitude")
+    # Replace old mechanical flashcards with the new set (one transaction)
+    print(f"\n📝 Replacing Mechanical Aptitude flashcards with {len(MECHANICAL_CARDS)} new cards...")
+    stats = import_flashcards(MECHANICAL_CARDS, "mechanical-aptitude", replace=True)
     print(f"   ✅ Imported: {stats['imported']}")
     print(f"   ⚠️ Duplicates: {stats['duplicates']}")
     print(f"   ❌ Errors: {stats['errors']}")
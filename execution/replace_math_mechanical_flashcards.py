@@ -15,8 +15,8 @@ import argparse
 from pathlib import Path
 
 # Add backend to path
-sys.path.insert(0, str(Path(__file__).parent.parent / "backend" / "app"))
-import db
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+from app import db
 
 # New pattern-recognition flashcards
 NEW_FLASHCARDS = [
@@ -255,14 +255,6 @@ def replace_flashcards(dry_run: bool = False):
     if dry_run:
         print("🔍 DRY RUN MODE - No changes will be made\n")
     
-    # Delete existing
-    if not dry_run:
-        with db.get_db() as conn:
-            conn.execute("DELETE FROM flashcards WHERE subject IN ('math', 'mechanical-aptitude')")
-        print(f"🗑️  Deleted {math_count + mech_count} old flashcards")
-    else:
-        print(f"🗑️  Would delete {math_count + mech_count} old flashcards")
-    
     # Count new cards by subject
     new_math = [c for c in NEW_FLASHCARDS if c["subject"] == "math"]
     new_mech = [c for c in NEW_FLASHCARDS if c["subject"] == "mechanical-aptitude"]
@@ -272,20 +264,27 @@ def replace_flashcards(dry_run: bool = False):
     print(f"   - mechanical-aptitude: {len(new_mech)} pattern-recognition cards")
     print()
     
-    # Insert new cards
+    # Delete existing and insert new cards in one transaction
     if not dry_run:
-        for card in NEW_FLASHCARDS:
-            db.add_flashcard(
-                subject=card["subject"],
-                card_type=card["card_type"],
-                front_content=card["front_content"],
-                back_content=card["back_content"],
-                hint=card.get("hint"),
-                source="pattern_recognition_revamp",
-                is_approved=True
-            )
+        db.replace_flashcards(
+            ["math", "mechanical-aptitude"],
+            [
+                {
+                    "subject": card["subject"],
+                    "card_type": card["card_type"],
+                    "front_content": card["front_content"],
+                    "back_content": card["back_content"],
+                    "hint": card.get("hint"),
+                    "source": "pattern_recognition_revamp",
+                    "is_approved": True,
+                }
+                for card in NEW_FLASHCARDS
+            ]
+        )
+        print(f"🗑️  Deleted {math_count + mech_count} old flashcards")
         print(f"✅ Inserted {len(NEW_FLASHCARDS)} new pattern-recognition flashcards")
     else:
+        print(f"🗑️  Would delete {math_count + mech_count} old flashcards")
         print(f"✅ Would insert {len(NEW_FLASHCARDS)} new pattern-recognition flashcards")
         print("\n--- Sample cards preview ---\n")
         for card in NEW_FLASHCARDS[:3]:
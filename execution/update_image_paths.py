@@ -9,6 +9,7 @@ from pathlib import Path
 
 # Database paths - try local first, then backend
 DB_PATHS = [
+    Path("backend/data/content.db"),
     Path("backend/data/questions.db"),
     Path("data/firefighter_prep.db"),
 ]
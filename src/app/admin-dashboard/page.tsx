@@ -43,6 +43,16 @@ interface User {
     created_at: string;
 }
 
+// List endpoints return one keyset page; next_cursor fetches the next one
+type Listing = 'emails' | 'users' | 'reports' | 'feedback';
+
+const LISTING_ENDPOINTS: Record<Listing, { path: string; field: string }> = {
+    emails: { path: 'email-leads', field: 'leads' },
+    users: { path: 'users', field: 'users' },
+    reports: { path: 'reports', field: 'reports' },
+    feedback: { path: 'feedback', field: 'feedback' },
+};
+
 export default function AdminDashboard() {
     const [token, setToken] = useState('');
     const [isAuthenticated, setIsAuthenticated] = useState(false);
@@ -55,7 +65,39 @@ export default function AdminDashboard() {
     const [users, setUsers] = useState<User[]>([]);
     const [reports, setReports] = useState<Report[]>([]);
     const [feedback, setFeedback] = useState<Feedback[]>([]);
-    const [activeTab, setActiveTab] = useState<'emails' | 'users' | 'reports' | 'feedback'>('emails');
+    const [activeTab, setActiveTab] = useState<Listing>('emails');
+    const [cursors, setCursors] = useState<Record<Listing, string | null>>({
+        emails: null, users: null, reports: null, feedback: null,
+    });
+    const [loadingMore, setLoadingMore] = useState<Listing | null>(null);
+
+    // Fetch one page of a listing; appends to what is loaded when a cursor is given
+    const loadPage = async (listing: Listing, cursor: string | null = null) => {
+        const adminEmail = localStorage.getItem('user_email') || '';
+        const { path, field } = LISTING_ENDPOINTS[listing];
+        const cursorParam = cursor ? `&cursor=${encodeURIComponent(cursor)}` : '';
+        const res = await fetch(`${API_URL}/api/admin/${path}?token=${token}&admin_email=${encodeURIComponent(adminEmail)}${cursorParam}`);
+        if (!res.ok) return;
+        const data = await res.json();
+        const page = data[field];
+        const merge = <T,>(rows: T[]): T[] => (cursor ? [...rows, ...page] : page);
+        if (listing === 'emails') setEmailLeads(merge);
+        else if (listing === 'users') setUsers(merge);
+        else if (listing === 'reports') setReports(merge);
+        else setFeedback(merge);
+        setCursors((prev) => ({ ...prev, [listing]: data.next_cursor ?? null }));
+    };
+
+    const loadMore = async (listing: Listing) => {
+        setLoadingMore(listing);
+        try {
+            await loadPage(listing, cursors[listing]);
+        } catch (err) {
+            console.error(`Failed to load more ${listing}:`, err);
+        } finally {
+            setLoadingMore(null);
+        }
+    };
 
     // Check for existing auth token on mount
     useEffect(() => {
@@ -120,33 +162,8 @@ export default function AdminDashboard() {
                     setStats(await statsRes.json());
                 }
 
-                // Load email leads
-                const leadsRes = await fetch(`${API_URL}/api/admin/email-leads?token=${token}&admin_email=${encodeURIComponent(adminEmail)}`);
-                if (leadsRes.ok) {
-                    const data = await leadsRes.json();
-                    setEmailLeads(data.leads);
-                }
-
-                // Load users
-                const usersRes = await fetch(`${API_URL}/api/admin/users?token=${token}&admin_email=${encodeURIComponent(adminEmail)}`);
-                if (usersRes.ok) {
-                    const data = await usersRes.json();
-                    setUsers(data.users);
-                }
-
-                // Load reports
-                const reportsRes = await fetch(`${API_URL}/api/admin/reports?token=${token}&admin_email=${encodeURIComponent(adminEmail)}`);
-                if (reportsRes.ok) {
-                    const data = await reportsRes.json();
-                    setReports(data.reports);
-                }
-
-                // Load feedback
-                const feedbackRes = await fetch(`${API_URL}/api/admin/feedback?token=${token}&admin_email=${encodeURIComponent(adminEmail)}`);
-                if (feedbackRes.ok) {
-                    const data = await feedbackRes.json();
-                    setFeedback(data.feedback);
-                }
+                // Load the first page of email leads, users, reports and feedback
+                await Promise.all((Object.keys(LISTING_ENDPOINTS) as Listing[]).map((listing) => loadPage(listing)));
             } catch (err) {
                 console.error('Failed to load admin data:', err);
             }
@@ -162,18 +179,10 @@ export default function AdminDashboard() {
     };
 
     const exportToCSV = () => {
-        const headers = ['Email', 'Signed Up', 'Converted'];
-        const rows = emailLeads.map(lead => [
-            lead.email,
-            new Date(lead.created_at).toLocaleString(),
-            lead.converted ? 'Yes' : 'No'
-        ]);
-
-        const csv = [headers, ...rows].map(row => row.join(',')).join('\n');
-        const blob = new Blob([csv], { type: 'text/csv' });
-        const url = URL.createObjectURL(blob);
+        // Streamed by the server, so the file covers every lead, not just the loaded page
+        const adminEmail = localStorage.getItem('user_email') || '';
         const a = document.createElement('a');
-        a.href = url;
+        a.href = `${API_URL}/api/admin/export/email_leads?format=csv&token=${token}&admin_email=${encodeURIComponent(adminEmail)}`;
         a.download = `email-leads-${new Date().toISOString().split('T')[0]}.csv`;
         a.click();
     };
@@ -259,28 +268,28 @@ export default function AdminDashboard() {
                 <TabButton
                     active={activeTab === 'emails'}
                     onClick={() => setActiveTab('emails')}
-                    count={emailLeads.length}
+                    count={stats?.email_leads ?? emailLeads.length}
                 >
                     📧 Email Leads
                 </TabButton>
                 <TabButton
                     active={activeTab === 'users'}
                     onClick={() => setActiveTab('users')}
-                    count={users.length}
+                    count={stats?.total_users ?? users.length}
                 >
                     👥 Users
                 </TabButton>
                 <TabButton
                     active={activeTab === 'reports'}
                     onClick={() => setActiveTab('reports')}
-                    count={reports.length}
+                    count={stats?.pending_reports ?? reports.length}
                 >
                     ⚠️ Reports
                 </TabButton>
                 <TabButton
                     active={activeTab === 'feedback'}
                     onClick={() => setActiveTab('feedback')}
-                    count={feedback.length}
+                    count={stats?.pending_feedback ?? feedback.length}
                 >
                     💬 Feedback
                 </TabButton>
@@ -338,6 +347,7 @@ export default function AdminDashboard() {
                                 </tbody>
                             </table>
                         </div>
+                        <LoadMoreButton listing="emails" cursor={cursors.emails} loading={loadingMore === 'emails'} onLoadMore={loadMore} />
                     </>
                 )}
 
@@ -376,6 +386,7 @@ export default function AdminDashboard() {
                                 </tbody>
                             </table>
                         </div>
+                        <LoadMoreButton listing="users" cursor={cursors.users} loading={loadingMore === 'users'} onLoadMore={loadMore} />
                     </>
                 )}
 
@@ -410,6 +421,7 @@ export default function AdminDashboard() {
                                 ))
                             )}
                         </div>
+                        <LoadMoreButton listing="reports" cursor={cursors.reports} loading={loadingMore === 'reports'} onLoadMore={loadMore} />
                     </>
                 )}
 
@@ -439,6 +451,7 @@ export default function AdminDashboard() {
                                 ))
                             )}
                         </div>
+                        <LoadMoreButton listing="feedback" cursor={cursors.feedback} loading={loadingMore === 'feedback'} onLoadMore={loadMore} />
                     </>
                 )}
             </div>
@@ -471,6 +484,27 @@ function StatCard({ label, value, icon, color }: {
     );
 }
 
+// Load More Button Component - shown while the listing has another page
+function LoadMoreButton({ listing, cursor, loading, onLoadMore }: {
+    listing: Listing;
+    cursor: string | null;
+    loading: boolean;
+    onLoadMore: (listing: Listing) => void;
+}) {
+    if (!cursor) return null;
+    return (
+        <div className="p-4 border-t border-slate-700/50 text-center">
+            <button
+                onClick={() => onLoadMore(listing)}
+                disabled={loading}
+                className="px-4 py-2 bg-slate-700 text-slate-300 rounded-lg hover:bg-slate-600 transition-colors text-sm font-medium disabled:opacity-50"
+            >
+                {loading ? 'Loading...' : 'Load more'}
+            </button>
+        </div>
+    );
+}
+
 // Tab Button Component
 function TabButton({ active, onClick, count, children }: {
     active: boolean;